@@ -0,0 +1,135 @@
+# dependencies
+import http.client
+import json
+import logging
+import shutil
+import threading
+import time
+import urllib.parse
+from werkzeug.serving import make_server
+import microservice.connectors.MongoDB as mongodb_module
+from microservice.lib.request_handler import RiLoggingRequestHandler
+from microservice.lib.routing import RiLoggingRoutingTable
+from microservice.lib.write_buffer import RiLoggingWriteBuffer
+from benchmarks.measure import BenchmarkMeasure
+from benchmarks.stubs import BenchmarkMySQLServer, install_mongomock
+from benchmarks.synthetic import BenchmarkSynthetic
+
+
+# end-to-end load generator, which sends the events over http to /log or /log/batch and measures every request
+class BenchmarkLoad:
+
+    @staticmethod
+    # runs the load against an in-process server with local stand-ins of the databases, or against the given url
+    def run(server_type: str, events: int, concurrency: int, batch: int = 1, buffer: bool = False, url: str = None, configuration: dict = None) -> dict:
+        name = "load." + server_type + (".batch" if batch > 1 else ".log") + (".buffer" if buffer is True else "")
+        if configuration is None:
+            configuration = BenchmarkSynthetic.create_configuration(server_type=server_type)
+        requests = BenchmarkSynthetic.create_events(configuration, events)
+
+        server = None
+        mysql_server = None
+        if url is None:
+            mysql_server = BenchmarkLoad.create_backend(configuration, server_type, buffer)
+            server, url = BenchmarkLoad.create_server()
+        else:
+            name = "load.remote" + (".batch" if batch > 1 else ".log")
+
+        try:
+            result = BenchmarkLoad.send(name, url, requests, concurrency, batch)
+        finally:
+            if server is not None:
+                RiLoggingWriteBuffer.stop()
+                server.shutdown()
+
+        result.__setitem__("concurrency", concurrency)
+        result.__setitem__("batch", batch)
+        if mysql_server is not None:
+            result.__setitem__("stored", mysql_server.rows)
+        elif server is not None and server_type == RiLoggingRequestHandler.server_type_file:
+            result.__setitem__("stored", sum(len(list(RiLoggingRequestHandler.storage.read(route))) for route in RiLoggingRoutingTable.get_routes()))
+            RiLoggingRequestHandler.storage.close()
+        elif server is not None:
+            database = mongodb_module.MongoDBConnection.connection[configuration.get("connection").get("server").get("database").get("name")]
+            result.__setitem__("stored", sum(database[collection].count_documents({}) for collection in database.list_collection_names()))
+
+        return result
+
+    @staticmethod
+    # configures the handler like on start of the microservice, but against the stand-ins of the databases
+    def create_backend(configuration: dict, server_type: str, buffer: bool) -> BenchmarkMySQLServer:
+        mysql_server = None
+        if server_type == RiLoggingRequestHandler.server_type_mysql:
+            mysql_server = BenchmarkMySQLServer()
+            mysql_server.install()
+        elif server_type == RiLoggingRequestHandler.server_type_file:
+            # every run starts with empty segments
+            shutil.rmtree(configuration.get("connection").get("server").get("directory"), ignore_errors=True)
+        else:
+            install_mongomock()
+
+        configuration.get("logging").get("backend").__setitem__("buffer", {"enabled": buffer})
+        RiLoggingRequestHandler.configuration = configuration
+        RiLoggingRequestHandler.create_routes()
+        RiLoggingRequestHandler.create_connections()
+        RiLoggingRequestHandler.create_buffer()
+
+        return mysql_server
+
+    @staticmethod
+    # starts the flask application with a threaded server on a free local port
+    def create_server():
+        import microservice.lib.endpoints
+        # the access log of every request would measure the terminal instead of the microservice
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        server = make_server("127.0.0.1", 0, microservice.lib.endpoints.logging_handler, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        return server, "http://127.0.0.1:" + str(server.server_port)
+
+    @staticmethod
+    # sends all events with the given amount of concurrent clients and keeps the latency of every request
+    def send(name: str, url: str, requests: list, concurrency: int, batch: int) -> dict:
+        address = urllib.parse.urlparse(url)
+        path = (address.path.rstrip("/") + "/log") + ("/batch" if batch > 1 else "")
+        bodies = [json.dumps(requests[index:index + batch] if batch > 1 else requests[index]).encode() for index in range(0, len(requests), batch)]
+        latencies = []
+        failures = []
+        lock = threading.Lock()
+
+        def client(offset: int):
+            connection = http.client.HTTPConnection(address.hostname, address.port)
+            client_latencies = []
+            client_failures = 0
+            for body in bodies[offset::concurrency]:
+                started = time.perf_counter()
+                try:
+                    connection.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status != RiLoggingRequestHandler.response_status_ok:
+                        client_failures += 1
+                except (http.client.HTTPException, OSError):
+                    # the server closed the kept alive connection, the next request opens a new one
+                    connection.close()
+                    connection = http.client.HTTPConnection(address.hostname, address.port)
+                    client_failures += 1
+                client_latencies.append(time.perf_counter() - started)
+            connection.close()
+            with lock:
+                latencies.extend(client_latencies)
+                failures.append(client_failures)
+
+        clients = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+        started = time.perf_counter()
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        duration = time.perf_counter() - started
+
+        result = BenchmarkMeasure.summarize(name, latencies, duration, events=len(requests))
+        result.__setitem__("requests", len(bodies))
+        result.__setitem__("failed_requests", sum(failures))
+
+        return result
@@ -0,0 +1,47 @@
+# dependencies
+import time
+
+
+# timing helpers, which turn the latencies of single calls into the reported figures
+class BenchmarkMeasure:
+
+    @staticmethod
+    # returns the value at the given percentile of the sorted latencies, with nearest rank
+    def percentile(latencies: list, percentile: float) -> float:
+        if len(latencies) == 0:
+            return 0.0
+        rank = int(round(percentile / 100.0 * len(latencies) + 0.5)) - 1
+
+        return latencies[min(max(rank, 0), len(latencies) - 1)]
+
+    @staticmethod
+    # summarizes the latencies in seconds of single events and the wall clock duration of the whole run
+    def summarize(name: str, latencies: list, duration: float, events: int = None) -> dict:
+        latencies = sorted(latencies)
+        events = events if events is not None else len(latencies)
+
+        return {
+            "name": name,
+            "events": events,
+            "seconds": round(duration, 6),
+            "events_per_second": round(events / duration, 1) if duration > 0 else 0.0,
+            "latency_p50_us": round(BenchmarkMeasure.percentile(latencies, 50) * 1000000, 2),
+            "latency_p99_us": round(BenchmarkMeasure.percentile(latencies, 99) * 1000000, 2)
+        }
+
+    @staticmethod
+    # calls the function once per input and measures every call, after a warm up on the first inputs
+    def run(name: str, function, inputs: list, warmup: int = 100) -> dict:
+        for value in inputs[:warmup]:
+            function(value)
+
+        latencies = []
+        clock = time.perf_counter
+        started = clock()
+        for value in inputs:
+            call_started = clock()
+            function(value)
+            latencies.append(clock() - call_started)
+        duration = clock() - started
+
+        return BenchmarkMeasure.summarize(name, latencies, duration)
@@ -0,0 +1,87 @@
+# dependencies
+from microservice.lib.configuration_validator import RiLoggingConfigurationValidator
+from microservice.lib.mysql_query_generator import RiLoggingMySqlQueryCreator
+from microservice.lib.request_handler import RiLoggingRequestHandler
+from microservice.lib.routing import RiLoggingRoutingTable
+from benchmarks.measure import BenchmarkMeasure
+from benchmarks.stubs import BenchmarkMySQLServer
+from benchmarks.synthetic import BenchmarkSynthetic
+
+
+# micro benchmarks of the single steps of the ingestion, without any network involved
+class BenchmarkMicro:
+
+    @staticmethod
+    # runs all micro benchmarks and returns their results
+    def run(events: int, informations: int, targets: int, fields: int) -> list:
+        configuration = BenchmarkSynthetic.create_configuration(server_type="mysql", informations=informations, targets=targets, fields=fields)
+        requests = BenchmarkSynthetic.create_events(configuration, events)
+        RiLoggingRequestHandler.configuration = configuration
+        RiLoggingRequestHandler.create_routes()
+
+        results = []
+        results.extend(BenchmarkMicro.run_query_creator(requests))
+        results.append(BenchmarkMicro.run_routing(requests))
+        results.append(BenchmarkMicro.run_create_log(requests))
+        results.append(BenchmarkMicro.run_validator(configuration, 5))
+
+        return results
+
+    @staticmethod
+    # the textual INSERT of the original implementation, the value formatting per datatype, the compiled converter and the cached parameterized INSERT
+    def run_query_creator(requests: list) -> list:
+        resolved = [(RiLoggingRoutingTable.resolve(request), request) for request in requests]
+
+        def create_insert_query(entry):
+            route, request = entry
+            RiLoggingMySqlQueryCreator.create_insert_query(route.collection, route.target_name, route.timestamp_name, route.fields, request)
+
+        def convert(entry):
+            route, request = entry
+            route.converter.convert(request)
+
+        def create_insert_parameters(entry):
+            route, request = entry
+            statement = RiLoggingMySqlQueryCreator.get_insert_statement(route.collection, route.target_name, route.timestamp_name, route.fields)
+            RiLoggingMySqlQueryCreator.create_insert_parameters(statement, route.converter.convert(request)[0])
+
+        results = [
+            BenchmarkMeasure.run("micro.create_insert_query", create_insert_query, resolved),
+            BenchmarkMeasure.run("micro.convert", convert, resolved),
+            BenchmarkMeasure.run("micro.create_insert_parameters", create_insert_parameters, resolved)
+        ]
+        for datatype in BenchmarkSynthetic.datatypes:
+            values = [request.get(name) for route, request in resolved for name, field_datatype in zip(route.field_names, route.datatypes) if field_datatype == datatype]
+            results.append(BenchmarkMeasure.run("micro.format_value." + datatype, lambda value: RiLoggingMySqlQueryCreator.format_value(value, datatype), values))
+
+        return results
+
+    @staticmethod
+    # the lookup of the route of every event in the routing index
+    def run_routing(requests: list) -> dict:
+        return BenchmarkMeasure.run("micro.resolve_route", RiLoggingRequestHandler.resolve_route, requests)
+
+    @staticmethod
+    # the full handler of /log without flask, writing into the in-process MySQL stand-in
+    def run_create_log(requests: list) -> dict:
+        BenchmarkMySQLServer().install()
+        RiLoggingRequestHandler.create_connections()
+
+        return BenchmarkMeasure.run("micro.create_log", RiLoggingRequestHandler.create_log, requests)
+
+    @staticmethod
+    # the validation of the whole configuration, done once on start
+    def run_validator(configuration: dict, repeat: int) -> dict:
+        def validate(_):
+            # the validator keeps its findings on the class, they are reset for every run
+            RiLoggingConfigurationValidator.errors = []
+            RiLoggingConfigurationValidator.warnings = []
+            RiLoggingConfigurationValidator(configuration=configuration).validate_strucutre()
+
+        result = BenchmarkMeasure.run("micro.validate_strucutre", validate, list(range(repeat)), warmup=1)
+        if len(RiLoggingConfigurationValidator.errors) > 0:
+            exit("The synthetic configuration is invalid: " + str(RiLoggingConfigurationValidator.errors[:5]))
+        result.__setitem__("informations", len(configuration.get("logging").get("frontend").get("information")))
+        result.__setitem__("targets", len(configuration.get("logging").get("frontend").get("targets")))
+
+        return result
@@ -0,0 +1,87 @@
+# dependencies
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from benchmarks.load import BenchmarkLoad
+from benchmarks.micro import BenchmarkMicro
+
+
+# compares the results with the ones of an earlier run, a benchmark regressed if its throughput dropped by more than the tolerance
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    previous = {result.get("name"): result for result in baseline.get("results", [])}
+    for result in results:
+        before = previous.get(result.get("name"))
+        if before is None or before.get("events_per_second", 0) <= 0:
+            continue
+        change = result.get("events_per_second") / before.get("events_per_second") - 1.0
+        if change < -tolerance:
+            regressions.append({
+                "name": result.get("name"),
+                "events_per_second": result.get("events_per_second"),
+                "events_per_second_baseline": before.get("events_per_second"),
+                "change": round(change, 4)
+            })
+
+    return regressions
+
+
+# running the benchmarks and writing the results as json
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks of the ingestion pipeline of ri-logging")
+    parser.add_argument("suite", nargs="?", choices=["all", "micro", "load"], default="all")
+    parser.add_argument("--events", type=int, default=20000, help="amount of events per benchmark")
+    parser.add_argument("--informations", type=int, default=200, help="informations of the synthetic configuration of the micro benchmarks")
+    parser.add_argument("--targets", type=int, default=10, help="targets per information of the synthetic configuration")
+    parser.add_argument("--fields", type=int, default=12, help="fields per information of the synthetic configuration")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients of the load generator")
+    parser.add_argument("--batch", type=int, default=100, help="events per request of the batch load")
+    parser.add_argument("--server", choices=["mysql", "mongodb", "file"], action="append", help="stand-ins used by the load generator, default all, the file backend writes into the temporary directory")
+    parser.add_argument("--url", help="base url of a running ri-logging instance, replaces the in-process server and stand-ins")
+    parser.add_argument("--configuration", help="configuration of the running instance, its targets are used to generate the events")
+    parser.add_argument("--output", help="file to write the results into, default stdout")
+    parser.add_argument("--baseline", help="results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative drop of events per second against the baseline")
+    arguments = parser.parse_args()
+
+    results = []
+    if arguments.suite in ["all", "micro"]:
+        results.extend(BenchmarkMicro.run(events=arguments.events, informations=arguments.informations, targets=arguments.targets, fields=arguments.fields))
+
+    if arguments.suite in ["all", "load"]:
+        if arguments.url is not None:
+            configuration = json.loads(open(arguments.configuration, "r").read()) if arguments.configuration is not None else None
+            server_type = configuration.get("connection").get("server").get("type") if configuration is not None else "mysql"
+            for batch in [1, arguments.batch]:
+                results.append(BenchmarkLoad.run(server_type, arguments.events, arguments.concurrency, batch=batch, url=arguments.url, configuration=configuration))
+        else:
+            for server_type in arguments.server or ["mysql", "mongodb", "file"]:
+                results.append(BenchmarkLoad.run(server_type, arguments.events, arguments.concurrency))
+                results.append(BenchmarkLoad.run(server_type, arguments.events, arguments.concurrency, batch=arguments.batch))
+                results.append(BenchmarkLoad.run(server_type, arguments.events, arguments.concurrency, buffer=True))
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": vars(arguments),
+        "results": results
+    }
+    status_code = 0
+    if arguments.baseline is not None:
+        report.__setitem__("regressions", compare(results, json.loads(open(arguments.baseline, "r").read()), arguments.tolerance))
+        if len(report.get("regressions")) > 0:
+            status_code = 1
+
+    output = json.dumps(report, indent=2)
+    if arguments.output is not None:
+        open(arguments.output, "w").write(output + "\n")
+    else:
+        print(output)
+    sys.exit(status_code)
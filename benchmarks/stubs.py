@@ -0,0 +1,69 @@
+# dependencies
+import threading
+import microservice.connectors.MongoDB as mongodb_module
+from microservice.connectors.MySQL import MySQLConnection
+
+
+# in-process stand-in for a pymysql cursor, which only counts the statements and rows it receives
+class BenchmarkMySQLCursor:
+    def __init__(self, server):
+        self.server = server
+
+    def execute(self, query, parameters=None):
+        return self.server.record(query, 1)
+
+    def executemany(self, query, parameters_list):
+        return self.server.record(query, len(parameters_list))
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+# in-process stand-in for a pymysql connection
+class BenchmarkMySQLConnection:
+    def __init__(self, server):
+        self.server = server
+        self.open = True
+
+    def cursor(self, cursor_class=None):
+        return BenchmarkMySQLCursor(self.server)
+
+    def ping(self, reconnect: bool = True):
+        pass
+
+    def close(self):
+        self.open = False
+
+
+# in-process stand-in for the MySQL server, which replaces the network round trip of the connector
+class BenchmarkMySQLServer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.statements = 0
+        self.rows = 0
+
+    def record(self, query: str, rows: int) -> int:
+        with self.lock:
+            self.statements += 1
+            if query.startswith("INSERT"):
+                self.rows += rows
+        return rows
+
+    def connect(self) -> BenchmarkMySQLConnection:
+        return BenchmarkMySQLConnection(self)
+
+    # lets the MySQL connector open its pooled connections against this stand-in
+    def install(self):
+        MySQLConnection.create_connection = classmethod(lambda cls: self.connect())
+
+
+# installs mongomock as stand-in for the MongoDB server, mongomock is only needed for the benchmarks
+def install_mongomock():
+    try:
+        import mongomock
+    except ImportError:
+        exit("The MongoDB benchmarks need mongomock, install it with: pip install -r requirements.txt")
+    mongodb_module.MongoClient = mongomock.MongoClient
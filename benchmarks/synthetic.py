@@ -0,0 +1,122 @@
+# dependencies
+import os
+import random
+import tempfile
+
+
+# creates synthetic configurations and events of arbitrary size, seeded so every run measures the same data
+class BenchmarkSynthetic:
+    # datatypes which are spread over the generated fields
+    datatypes: list = ["string", "integer", "float"]
+    # name of the target and timestamp field of every generated information
+    target_name: str = "logging_event"
+    timestamp_name: str = "created"
+
+    @staticmethod
+    # creates a valid configuration with the given amount of informations, targets per information and fields per information
+    def create_configuration(server_type: str = "mysql", informations: int = 1, targets: int = 3, fields: int = 6) -> dict:
+        configuration_informations = []
+        configuration_targets = []
+        configuration_maps = []
+        for information_index in range(informations):
+            information_id = "information_" + str(information_index)
+            configuration_informations.append({
+                "id": information_id,
+                "target_name": BenchmarkSynthetic.target_name,
+                "timestamp_name": BenchmarkSynthetic.timestamp_name,
+                "header": [],
+                "fields": [
+                    {
+                        "name": "field_" + str(field_index),
+                        "source": "variable",
+                        "value": "field_" + str(field_index),
+                        "datatype": BenchmarkSynthetic.datatypes[field_index % len(BenchmarkSynthetic.datatypes)]
+                    } for field_index in range(fields)
+                ]
+            })
+            configuration_maps.append({
+                "information": information_id,
+                "collection": "logging_" + information_id
+            })
+            for target_index in range(targets):
+                configuration_targets.append({
+                    "bound": False,
+                    "name": BenchmarkSynthetic.get_target(information_index, target_index),
+                    "type": "mouse",
+                    "category": "click",
+                    "selector": ".benchmark-" + str(information_index) + "-" + str(target_index),
+                    "information": information_id
+                })
+
+        server = {
+            "host": "localhost",
+            "port": 3306 if server_type == "mysql" else 27017,
+            "type": server_type,
+            "database": {
+                "name": "benchmark",
+                "create_collection": True,
+                "map": configuration_maps
+            }
+        }
+        # the file backend writes into the temporary directory instead of a server
+        if server_type == "file":
+            server = {"type": server_type, "directory": os.path.join(tempfile.gettempdir(), "rilogging-benchmark"), "database": server.get("database")}
+
+        return {
+            "connection": {
+                "server": server,
+                "user": {
+                    "name": "benchmark",
+                    "password": "benchmark"
+                }
+            },
+            "logging": {
+                "backend": {
+                    "server": {
+                        "host": "127.0.0.1",
+                        "port": 9798
+                    }
+                },
+                "frontend": {
+                    "receiver": "/log",
+                    "debug": {
+                        "enabled": False,
+                        "console": {
+                            "date": False,
+                            "class": False
+                        }
+                    },
+                    "targets": configuration_targets,
+                    "information": configuration_informations
+                }
+            }
+        }
+
+    @staticmethod
+    def get_target(information_index: int, target_index: int) -> str:
+        return "target_" + str(information_index) + "_" + str(target_index)
+
+    @staticmethod
+    # creates events which match the targets of the configuration, spread randomly over all targets
+    def create_events(configuration: dict, amount: int, seed: int = 1) -> list:
+        generator = random.Random(seed)
+        targets = configuration.get("logging").get("frontend").get("targets")
+        informations = {information.get("id"): information for information in configuration.get("logging").get("frontend").get("information")}
+        events = []
+        for index in range(amount):
+            target = targets[generator.randrange(len(targets))]
+            information = informations.get(target.get("information"))
+            event = {
+                information.get("target_name"): target.get("name"),
+                information.get("timestamp_name"): "2026-01-01 10:%02d:%02d" % (index // 60 % 60, index % 60)
+            }
+            for field in information.get("fields"):
+                if field.get("datatype") == "integer":
+                    event.__setitem__(field.get("name"), generator.randrange(1000000))
+                elif field.get("datatype") == "float":
+                    event.__setitem__(field.get("name"), round(generator.random() * 1000, 4))
+                else:
+                    event.__setitem__(field.get("name"), "value-" + str(generator.randrange(1000000)))
+            events.append(event)
+
+        return events
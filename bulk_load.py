@@ -0,0 +1,62 @@
+# dependencies
+from microservice.lib.request_handler import RiLoggingRequestHandler
+from microservice.lib.messages import RiLoggingError
+from microservice.lib.configuration_validator import RiLoggingConfigurationValidator
+from microservice.lib.bulk_load import RiLoggingBulkLoad
+from microservice.lib.changes import RiLoggingChanges
+from microservice.lib.rollups import RiLoggingRollups
+import sys
+import os
+import json
+
+# bulk loading historical logs from a newline-delimited JSON or CSV file into the configured database, without starting the server
+# usage: python bulk_load.py <configuration.json> <input.ndjson|input.csv> [rows per chunk]
+if __name__ == '__main__':
+    status_code = 0
+    # validate the given configuration and input for existence and type
+    if len(sys.argv) < 2:
+        status_code = 1
+    if status_code == 0 and os.path.isfile(sys.argv[1]) is not True:
+        status_code = 2
+    if status_code == 0 and os.path.splitext(sys.argv[1])[1] != ".json":
+        status_code = 3
+    if status_code == 0 and (len(sys.argv) < 3 or os.path.isfile(sys.argv[2]) is not True):
+        status_code = 32
+
+    # validate the content of configuration
+    configuration = None
+    if status_code == 0:
+        try:
+            configuration = json.loads(open(sys.argv[1], "r").read())
+        except json.JSONDecodeError as error:
+            status_code = 4
+        except TypeError as error:
+            status_code = 5
+    if status_code == 0 and type(configuration) is not dict:
+        status_code = 6
+
+    # validate the configuration structure
+    if status_code == 0:
+        validator = RiLoggingConfigurationValidator(configuration=configuration)
+        validator.validate_strucutre()
+        if len(validator.errors) > 0:
+            status_code = 7
+            for error in validator.errors:
+                print(RiLoggingError.error_message(status_code=error.get("error"), prefix="Error", placeholder=error.get("placeholder")))
+
+    # load the file and print the report, the change counts and rollups of the loaded logs are flushed before exiting
+    if status_code == 0:
+        RiLoggingRequestHandler.configuration = configuration
+        RiLoggingRequestHandler.create_routes()
+        RiLoggingRequestHandler.create_connections()
+        RiLoggingRequestHandler.create_changes()
+        RiLoggingRequestHandler.create_rollups()
+        input_format = RiLoggingBulkLoad.format_csv if os.path.splitext(sys.argv[2])[1] == ".csv" else RiLoggingBulkLoad.format_ndjson
+        with open(sys.argv[2], "r", encoding="utf-8", newline="") as lines:
+            report = RiLoggingBulkLoad.load(lines, input_format, RiLoggingRequestHandler.load_logs, int(sys.argv[3]) if len(sys.argv) > 3 else None)
+        RiLoggingChanges.stop()
+        RiLoggingRollups.stop()
+        RiLoggingRequestHandler.storage.close()
+        print(json.dumps(report, indent=2))
+    else:
+        print(RiLoggingError.error_message(status_code=status_code))
@@ -1,9 +1,16 @@
 # dependencies
 from microservice.lib.request_handler import RiLoggingRequestHandler
 from microservice.lib.messages import RiLoggingError
+from microservice.lib.server import RiLoggingServer
 
 
 # executes the initialization
-def start(configuration):
+def start(configuration, filename: str = None):
     RiLoggingRequestHandler.configuration = configuration
+    RiLoggingRequestHandler.create_reload(filename)
+    RiLoggingRequestHandler.create_routes()
+    RiLoggingRequestHandler.create_frontend_script()
+    RiLoggingRequestHandler.create_frontend_configuration()
+    RiLoggingRequestHandler.create_metrics()
     import microservice.lib.endpoints
+    RiLoggingServer.run(application=microservice.lib.endpoints.logging_handler, server=configuration.get("logging").get("backend").get("server"))
@@ -1,6 +1,8 @@
 # dependencies
+import logging
 import microservice.lib.messages as message_module
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError
 
 
 # class for handling the mongodb database
@@ -10,40 +12,170 @@ class MongoDBConnection:
     username: str = ""
     password: str = ""
     database: str = ""
+    # shared client, which keeps its own pool of sockets and is created once on start of the microservice
     connection: MongoClient = None
+    # False if the server couldn't be reached on start
+    reachable: bool = False
+    # error code of the server if a dataset with the same _id exists already
+    error_duplicate_key: int = 11000
+    # default sizes of the client side connection pool
+    pool_min_default: int = 1
+    pool_max_default: int = 10
 
     @classmethod
-    def __init__(cls, host, port, username: str = "", password: str = "", database: str = ""):
+    def __init__(cls, host, port, username: str = "", password: str = "", database: str = "", pool_min: int = None, pool_max: int = None):
         cls.host = host
         cls.port = port
         cls.username = username
         cls.password = password
         cls.database = database
+        cls.close()
+        cls.create_connection(pool_min=pool_min if pool_min is not None else cls.pool_min_default, pool_max=pool_max if pool_max is not None else cls.pool_max_default)
 
     @classmethod
-    # creates new connection
-    def create_connection(cls):
+    # returns a connector of its own, which keeps a separate shared client, e.g. for a further shard of RiLoggingStorageSharded
+    def isolate(cls, name: str):
+        return type(cls.__name__ + name, (cls,), {"connection": None, "reachable": False})
+
+    @classmethod
+    # creates the shared client and checks that the server is reachable
+    # the client connects on its own once the server is reachable, until then the logs are spooled
+    def create_connection(cls, pool_min: int, pool_max: int):
         try:
             cls.connection = MongoClient(
                 host=cls.host,
                 port=cls.port,
-                document_class=dict
+                document_class=dict,
+                minPoolSize=pool_min,
+                maxPoolSize=max(pool_max, pool_min, 1)
             )
+            cls.connection.admin.command("ping")
+            cls.reachable = True
         except Exception:
-            exit(message_module.RiLoggingError.error_message(8))
+            cls.reachable = False
+            logging.getLogger(__name__).warning(message_module.RiLoggingError.error_message(8, prefix=""))
 
     @classmethod
     # inserts the dataset, if needed creates the database and the collection
     def insert(cls, logging_data: dict, database_name: str, collection_name: str):
         result = None
-        cls.create_connection()
         if cls.connection is not None:
-            database = cls.connection[database_name]
-            collection = database[collection_name]
-            entry_id = collection.save(logging_data)
-            result = type(entry_id) is not None
+            collection = cls.connection[database_name][collection_name]
+            try:
+                entry = collection.insert_one(logging_data)
+            # the client reconnects on its own, the failed write is repeated once
+            except AutoReconnect:
+                entry = collection.insert_one(logging_data)
+            result = entry.inserted_id is not None
 
-            cls.connection.close()
+        return result
+
+    @classmethod
+    # inserts multiple datasets with one bulk operation and returns the amount of inserted datasets
+    def insert_many(cls, logging_data: list, database_name: str, collection_name: str) -> int:
+        result = 0
+        if cls.connection is not None and len(logging_data) > 0:
+            collection = cls.connection[database_name][collection_name]
+            entries = collection.insert_many(logging_data, ordered=False)
+            result = len(entries.inserted_ids)
 
         return result
 
+    @classmethod
+    # inserts datasets which carry their own _id, datasets which were inserted before are skipped instead of duplicated
+    # returns the amount of inserted and skipped datasets, every other error is raised
+    def insert_many_idempotent(cls, logging_data: list, database_name: str, collection_name: str) -> int:
+        result = 0
+        if cls.connection is not None and len(logging_data) > 0:
+            collection = cls.connection[database_name][collection_name]
+            try:
+                result = len(collection.insert_many(logging_data, ordered=False).inserted_ids)
+            except BulkWriteError as error:
+                write_errors = error.details.get("writeErrors", [])
+                if len(error.details.get("writeConcernErrors", [])) > 0 or any(write_error.get("code") != cls.error_duplicate_key for write_error in write_errors):
+                    raise
+                result = error.details.get("nInserted", 0) + len(write_errors)
+
+        return result
+
+    @classmethod
+    # updates the datasets matching the filters (filter, update e.g. $inc or $max) with one bulk operation, missing datasets are created
+    def upsert_many(cls, updates: list, database_name: str, collection_name: str):
+        if cls.connection is not None and len(updates) > 0:
+            collection = cls.connection[database_name][collection_name]
+            collection.bulk_write([UpdateOne(query, update, upsert=True) for query, update in updates], ordered=False)
+
+    @classmethod
+    # deletes the matching datasets and returns the amount of deleted datasets
+    def delete_many(cls, query: dict, database_name: str, collection_name: str) -> int:
+        result = 0
+        if cls.connection is not None:
+            result = cls.connection[database_name][collection_name].delete_many(query).deleted_count
+
+        return result
+
+    @classmethod
+    # drops the collection and returns the amount of datasets it had, which is read from the metadata of the collection
+    def drop(cls, database_name: str, collection_name: str) -> int:
+        result = 0
+        if cls.connection is not None:
+            collection = cls.connection[database_name][collection_name]
+            result = collection.estimated_document_count()
+            collection.drop()
+
+        return result
+
+    @classmethod
+    # runs the aggregation pipeline and returns all resulting datasets, meant for small results like sums
+    def aggregate(cls, database_name: str, collection_name: str, pipeline: list) -> list:
+        documents = []
+        if cls.connection is not None:
+            documents = list(cls.connection[database_name][collection_name].aggregate(pipeline))
+
+        return documents
+
+    @classmethod
+    # returns the matching datasets in the given order, meant for small results like a page of logs
+    def find(cls, database_name: str, collection_name: str, query: dict, sort: list, limit: int) -> list:
+        documents = []
+        if cls.connection is not None:
+            documents = list(cls.connection[database_name][collection_name].find(query, sort=sort, limit=limit))
+
+        return documents
+
+    @classmethod
+    # creates the indexes of the collection, existing indexes are left untouched
+    def create_indexes(cls, database_name: str, collection_name: str, indexes: list, unique: bool = False):
+        if cls.connection is not None:
+            collection = cls.connection[database_name][collection_name]
+            for index_name, index_keys in indexes:
+                collection.create_index(index_keys, name=index_name, unique=unique)
+
+    @classmethod
+    # reads the matching datasets with a batched cursor and returns a generator of dataset batches, errors of the query are raised right away
+    def stream(cls, database_name: str, collection_name: str, query: dict, batch: int):
+        cursor = cls.connection[database_name][collection_name].find(query, batch_size=batch)
+        first = next(cursor, None)
+
+        return cls.stream_documents(cursor, first, batch)
+
+    @staticmethod
+    def stream_documents(cursor, first: dict, batch: int):
+        try:
+            documents = [first] if first is not None else []
+            for document in cursor:
+                documents.append(document)
+                if len(documents) >= batch:
+                    yield documents
+                    documents = []
+            if len(documents) > 0:
+                yield documents
+        finally:
+            cursor.close()
+
+    @classmethod
+    # closes the shared client and all of its sockets
+    def close(cls):
+        if cls.connection is not None:
+            cls.connection.close()
+            cls.connection = None
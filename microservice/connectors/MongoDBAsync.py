@@ -0,0 +1,61 @@
+# dependencies
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import AutoReconnect
+from microservice.connectors.MongoDB import MongoDBConnection
+
+
+# non-blocking connector to mongodb database, used by the asyncio ingestion path
+class MongoDBAsyncConnection:
+    host: str = ""
+    port: int = 0
+    # shared client of the event loop, which keeps its own pool of sockets
+    connection: AsyncIOMotorClient = None
+
+    @classmethod
+    # returns a connector of its own, which keeps a separate shared client, e.g. for a further shard of RiLoggingStorageSharded
+    def isolate(cls, name: str):
+        return type(cls.__name__ + name, (cls,), {"connection": None})
+
+    @classmethod
+    # creates the shared client and checks that the server is reachable
+    async def create_connection(cls, host, port, pool_min: int = None, pool_max: int = None):
+        cls.host = host
+        cls.port = port
+        cls.close()
+        pool_min = pool_min if pool_min is not None else MongoDBConnection.pool_min_default
+        pool_max = pool_max if pool_max is not None else MongoDBConnection.pool_max_default
+        cls.connection = AsyncIOMotorClient(host=cls.host, port=cls.port, document_class=dict, minPoolSize=pool_min, maxPoolSize=max(pool_max, pool_min, 1))
+        await cls.connection.admin.command("ping")
+
+    @classmethod
+    # inserts the dataset, if needed creates the database and the collection
+    async def insert(cls, logging_data: dict, database_name: str, collection_name: str):
+        result = None
+        if cls.connection is not None:
+            collection = cls.connection[database_name][collection_name]
+            try:
+                entry = await collection.insert_one(logging_data)
+            # the client reconnects on its own, the failed write is repeated once
+            except AutoReconnect:
+                entry = await collection.insert_one(logging_data)
+            result = entry.inserted_id is not None
+
+        return result
+
+    @classmethod
+    # inserts multiple datasets with one bulk operation and returns the amount of inserted datasets
+    async def insert_many(cls, logging_data: list, database_name: str, collection_name: str) -> int:
+        result = 0
+        if cls.connection is not None and len(logging_data) > 0:
+            collection = cls.connection[database_name][collection_name]
+            entries = await collection.insert_many(logging_data, ordered=False)
+            result = len(entries.inserted_ids)
+
+        return result
+
+    @classmethod
+    # closes the shared client and all of its sockets
+    def close(cls):
+        if cls.connection is not None:
+            cls.connection.close()
+            cls.connection = None
@@ -1,7 +1,9 @@
 # dependencies
+import logging
 import pymysql as adapter
 import microservice.lib.messages as message_module
 from microservice.lib.mysql_query_generator import RiLoggingMySqlQueryCreator
+from microservice.connectors.Pool import ConnectionPool
 
 
 # connector to MySQL database
@@ -11,55 +13,205 @@ class MySQLConnection:
     username: str = ""
     password: str = ""
     database: str = ""
-    connection: adapter.connections.Connection = None
+    # shared connections, created once on start of the microservice
+    pool: ConnectionPool = None
+    # False if the server couldn't be reached on start
+    reachable: bool = False
+    # tables which are known to exist, so the hot path doesn't need to ask the server
+    known_tables: set = set()
+    # error code of the server if the table doesn't exist
+    error_table_missing: int = 1146
 
     @classmethod
-    def __init__(cls, host, port, username, password, database):
+    # configures the connector and opens the shared pool of connections
+    def __init__(cls, host, port, username, password, database, pool_min: int = None, pool_max: int = None):
         cls.host = host
         cls.port = port
         cls.username = username
         cls.password = password
         cls.database = database
-        cls.create_connection()
-        if cls.connection is not None:
-            cls.connection.select_db(cls.database)
+        cls.close()
+        cls.known_tables = set()
+        try:
+            cls.pool = ConnectionPool(create=cls.create_connection, check=cls.check_connection, close=cls.close_connection, size_min=pool_min, size_max=pool_max)
+            cls.reachable = True
+        except Exception:
+            cls.reachable = False
+            # the server isn't reachable on start, the connections are opened on demand once it is, until then the logs are spooled
+            cls.pool = ConnectionPool(create=cls.create_connection, check=cls.check_connection, close=cls.close_connection, size_min=0, size_max=pool_max)
+            logging.getLogger(__name__).warning(message_module.RiLoggingError.error_message(8, prefix=""))
 
     @classmethod
-    def create_connection(cls):
+    # returns a connector of its own, which keeps separate shared connections, e.g. for a further shard of RiLoggingStorageSharded
+    def isolate(cls, name: str):
+        return type(cls.__name__ + name, (cls,), {"pool": None, "reachable": False, "known_tables": set()})
+
+    @classmethod
+    # opens a new connection to the configured database
+    def create_connection(cls) -> adapter.connections.Connection:
+        return adapter.connections.Connection(host=cls.host, port=cls.port, user=cls.username, password=cls.password, database=cls.database, autocommit=True)
+
+    @staticmethod
+    # pings the server on checkout and reconnects if the connection was lost
+    def check_connection(connection: adapter.connections.Connection) -> bool:
         try:
-            cls.connection = adapter.connections.Connection(host=cls.host, port=cls.port, user=cls.username, password=cls.password, database=cls.database)
-            cls.connection.connect()
+            connection.ping(reconnect=True)
         except Exception:
-            exit(message_module.RiLoggingError.error_message(8))
+            return False
+
+        return True
+
+    @staticmethod
+    def close_connection(connection: adapter.connections.Connection):
+        if connection.open is True:
+            connection.close()
 
     @classmethod
     def is_connected(cls):
-        return cls.connection is not None and cls.connection.open is True
+        return cls.pool is not None
 
     @classmethod
     def table_exists(cls, table_name: str) -> bool:
         result = False
-        if cls.connection is not None:
-            cls.connection.select_db(cls.database)
-            cursor = cls.connection.cursor()
-            result = cursor.execute(query=RiLoggingMySqlQueryCreator.table_exists(table_name=table_name))
-            cursor.close()
-            
+        if cls.pool is not None:
+            with cls.pool.connection() as connection:
+                cursor = connection.cursor()
+                result = cursor.execute(query=RiLoggingMySqlQueryCreator.table_exists(table_name=table_name))
+                cursor.close()
+
             result = type(result) is int and result == 1
 
         return result
 
     @classmethod
-    def insert_query(cls, query, database=None):
+    # checks if the error was raised because the table doesn't exist (anymore)
+    def is_table_missing(cls, error: Exception) -> bool:
+        return isinstance(error, adapter.err.ProgrammingError) and len(error.args) > 0 and error.args[0] == cls.error_table_missing
+
+    @classmethod
+    def insert_query(cls, query):
+        result = None
+        if cls.pool is not None:
+            with cls.pool.connection() as connection:
+                cursor = connection.cursor()
+                result = cursor.execute(query=query)
+                cursor.close()
+        return result
+
+    @classmethod
+    # executes the parameterized query, values are escaped by the adapter
+    def execute(cls, query: str, parameters: tuple):
+        result = None
+        if cls.pool is not None:
+            with cls.pool.connection() as connection:
+                cursor = connection.cursor()
+                result = cursor.execute(query, parameters)
+                cursor.close()
+        return result
+
+    @classmethod
+    # executes the parameterized INSERT once for all given rows, the adapter sends them as multi-row INSERT
+    def execute_many(cls, query: str, parameters_list: list):
+        result = None
+        if cls.pool is not None:
+            with cls.pool.connection() as connection:
+                cursor = connection.cursor()
+                result = cursor.executemany(query, parameters_list)
+                cursor.close()
+        return result
+
+    @classmethod
+    # executes the parameterized INSERT for all given rows and stores the sequence number of a replayed spool in the same transaction
+    # so a replay which is repeated after a crash knows which rows were already written
+    def execute_replay(cls, query: str, parameters_list: list, sequence_query: str, sequence_parameters: tuple):
         result = None
-        if cls.connection is not None:
-            cls.create_connection()
-            if database is not None and cls.database != database:
-                cls.database = database
-                cls.connection.select_db(cls.database)
-            cursor = cls.connection.cursor()
-            result = cursor.execute(query=query)
+        if cls.pool is not None:
+            with cls.pool.connection() as connection:
+                connection.begin()
+                try:
+                    cursor = connection.cursor()
+                    result = cursor.executemany(query, parameters_list)
+                    cursor.execute(sequence_query, sequence_parameters)
+                    cursor.close()
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+        return result
+
+    @classmethod
+    # executes the queries (query, list of parameters or None) in one transaction, e.g. to replace all rows of a table at once
+    def execute_transaction(cls, queries: list):
+        if cls.pool is not None:
+            with cls.pool.connection() as connection:
+                connection.begin()
+                try:
+                    cursor = connection.cursor()
+                    for query, parameters_list in queries:
+                        if parameters_list is None:
+                            cursor.execute(query)
+                        elif len(parameters_list) > 0:
+                            cursor.executemany(query, parameters_list)
+                    cursor.close()
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+
+    @classmethod
+    # loads the file of the client with LOAD DATA LOCAL INFILE and returns the amount of loaded rows
+    # the load runs on its own connection, which is the only one allowed to send local files to the server
+    def load_file(cls, query: str, path: str) -> int:
+        connection = adapter.connections.Connection(host=cls.host, port=cls.port, user=cls.username, password=cls.password, database=cls.database, autocommit=True, local_infile=True)
+        try:
+            cursor = connection.cursor()
+            result = cursor.execute(query, (path,))
             cursor.close()
-            cls.connection.close()
+        finally:
+            connection.close()
+
         return result
 
+    @classmethod
+    # executes the parameterized query and returns all rows as dictionaries, meant for small results like a page of logs
+    def fetch_all(cls, query: str, parameters: tuple = None) -> list:
+        rows = []
+        if cls.pool is not None:
+            with cls.pool.connection() as connection:
+                cursor = connection.cursor(adapter.cursors.DictCursor)
+                cursor.execute(query, parameters)
+                rows = list(cursor.fetchall())
+                cursor.close()
+        return rows
+
+    @classmethod
+    # executes the query with an unbuffered server side cursor and returns a generator of row batches, errors of the query are raised right away
+    # the stream runs on its own connection, so a long export doesn't hold a connection of the pool and can be aborted by closing the socket
+    def stream(cls, query: str, parameters: tuple, batch: int):
+        connection = cls.create_connection()
+        try:
+            cursor = connection.cursor(adapter.cursors.SSDictCursor)
+            cursor.execute(query, parameters)
+        except Exception:
+            connection.close()
+            raise
+
+        return cls.stream_rows(connection, cursor, batch)
+
+    @staticmethod
+    def stream_rows(connection: adapter.connections.Connection, cursor, batch: int):
+        try:
+            rows = cursor.fetchmany(batch)
+            while len(rows) > 0:
+                yield rows
+                rows = cursor.fetchmany(batch)
+        finally:
+            # closing the connection instead of the cursor, the cursor would read all remaining rows of an aborted stream
+            connection.close()
+
+    @classmethod
+    # closes all connections of the pool
+    def close(cls):
+        if cls.pool is not None:
+            cls.pool.close()
+            cls.pool = None
@@ -0,0 +1,65 @@
+# dependencies
+import aiomysql
+from microservice.connectors.Pool import ConnectionPool
+
+
+# non-blocking connector to MySQL database, used by the asyncio ingestion path
+class MySQLAsyncConnection:
+    host: str = ""
+    port: int = 3306
+    username: str = ""
+    password: str = ""
+    database: str = ""
+    # shared connections of the event loop, created once on startup of the worker
+    pool: aiomysql.Pool = None
+    # tables which are known to exist, so the hot path doesn't need to ask the server
+    known_tables: set = set()
+
+    @classmethod
+    # returns a connector of its own, which keeps separate shared connections, e.g. for a further shard of RiLoggingStorageSharded
+    def isolate(cls, name: str):
+        return type(cls.__name__ + name, (cls,), {"pool": None, "known_tables": set()})
+
+    @classmethod
+    # configures the connector and opens the shared pool of connections
+    async def create_pool(cls, host, port, username, password, database, pool_min: int = None, pool_max: int = None):
+        cls.host = host
+        cls.port = port
+        cls.username = username
+        cls.password = password
+        cls.database = database
+        await cls.close()
+        cls.known_tables = set()
+        pool_min = pool_min if pool_min is not None else ConnectionPool.size_min_default
+        pool_max = pool_max if pool_max is not None else ConnectionPool.size_max_default
+        cls.pool = await aiomysql.create_pool(host=cls.host, port=cls.port, user=cls.username, password=cls.password, db=cls.database, minsize=pool_min, maxsize=max(pool_max, pool_min, 1), autocommit=True)
+
+    @classmethod
+    # executes the query with the given parameters, the connection is pinged on checkout and reconnected if it was lost
+    async def execute(cls, query: str, parameters: tuple = None):
+        result = None
+        if cls.pool is not None:
+            async with cls.pool.acquire() as connection:
+                await connection.ping(reconnect=True)
+                async with connection.cursor() as cursor:
+                    result = await cursor.execute(query, parameters)
+        return result
+
+    @classmethod
+    # executes the parameterized INSERT once for all given rows, the adapter sends them as multi-row INSERT
+    async def execute_many(cls, query: str, parameters_list: list):
+        result = None
+        if cls.pool is not None:
+            async with cls.pool.acquire() as connection:
+                await connection.ping(reconnect=True)
+                async with connection.cursor() as cursor:
+                    result = await cursor.executemany(query, parameters_list)
+        return result
+
+    @classmethod
+    # closes all connections of the pool
+    async def close(cls):
+        if cls.pool is not None:
+            cls.pool.close()
+            await cls.pool.wait_closed()
+            cls.pool = None
@@ -0,0 +1,111 @@
+# dependencies
+from contextlib import contextmanager
+import queue
+import threading
+import time
+from microservice.lib.metrics import RiLoggingMetrics
+
+
+# raised if no connection could be checked out of the pool in time
+class ConnectionPoolExhausted(Exception):
+    pass
+
+
+# thread safe pool of database connections, which is created once and shared by all requests
+class ConnectionPool:
+    # default amount of connections which are opened when the pool is created
+    size_min_default: int = 1
+    # default maximum amount of connections which can be open at the same time
+    size_max_default: int = 10
+    # seconds to wait for a free connection if all connections are in use
+    timeout_default: float = 10.0
+
+    # creates the pool and opens the minimal amount of connections
+    def __init__(self, create, check, close, size_min: int = None, size_max: int = None, timeout: float = None):
+        self.create = create
+        self.check = check
+        self.close_connection = close
+        self.size_min = size_min if size_min is not None else ConnectionPool.size_min_default
+        self.size_max = size_max if size_max is not None else ConnectionPool.size_max_default
+        self.size_max = max(self.size_max, self.size_min, 1)
+        self.timeout = timeout if timeout is not None else ConnectionPool.timeout_default
+        self.size = 0
+        self.lock = threading.Lock()
+        # last in first out, so the warmest connection is reused first
+        self.idle = queue.LifoQueue()
+
+        for _ in range(self.size_min):
+            self.idle.put(self.open())
+
+    # opens a new connection if the maximum size is not reached yet, otherwise returns None
+    def open(self):
+        with self.lock:
+            if self.size >= self.size_max:
+                return None
+            self.size += 1
+        try:
+            connection = self.create()
+        except Exception:
+            with self.lock:
+                self.size -= 1
+            raise
+
+        return connection
+
+    # checks out a healthy connection, reconnects if the idle connection is broken
+    def acquire(self):
+        try:
+            connection = self.idle.get_nowait()
+        except queue.Empty:
+            connection = self.open()
+            if connection is None:
+                try:
+                    connection = self.idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise ConnectionPoolExhausted()
+
+        if self.check(connection) is not True:
+            self.discard(connection)
+            connection = self.open()
+            if connection is None:
+                raise ConnectionPoolExhausted()
+
+        return connection
+
+    # returns the connection into the pool
+    def release(self, connection):
+        self.idle.put(connection)
+
+    # closes the connection and frees its slot in the pool
+    def discard(self, connection):
+        with self.lock:
+            self.size -= 1
+        try:
+            self.close_connection(connection)
+        except Exception:
+            pass
+
+    @contextmanager
+    # checks out a connection for the duration of the with block, broken connections are not returned to the pool
+    def connection(self):
+        started = time.perf_counter()
+        connection = self.acquire()
+        RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, time.perf_counter() - started, RiLoggingMetrics.stage_pool_connect)
+        try:
+            yield connection
+        except Exception:
+            self.discard(connection)
+            raise
+        else:
+            started = time.perf_counter()
+            self.release(connection)
+            RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, time.perf_counter() - started, RiLoggingMetrics.stage_pool_close)
+
+    # closes all idle connections
+    def close(self):
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(connection)
@@ -669,14 +669,11 @@ function () {
 
       if (success === true) {
         this.message("data was sent successfully : " + response.message);
-      } else {
+      } else if (_typeof(response) === "object" && typeof response.message === "string") {
         this.message("data could not be sent : " + response.message);
-      } else if (typeof response === "object" && typeof response.message === "string") {
-		this.message("data could not be sent : " + response.message);
       } else {
-		this.message("data could not be sent : server not reachable");
-	  }
-	  // processing finished, so new event can be processed
+        this.message("data could not be sent : server not reachable");
+      } // processing finished, so new event can be processed
 
 
       RiLogging.processQueue(this);
@@ -0,0 +1,320 @@
+# dependencies
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+import time
+from microservice.lib.routing import RiLoggingRoute
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# incremental ingestion of the NGINX access logs (combined format) of the mounted log directory into the configured database
+# every file is identified by the fingerprint of its first line, so the read offset survives renaming by logrotate and compression with gzip
+class RiLoggingAccessLog:
+    # default table/collection of the parsed access logs
+    collection_default: str = "logging_backend_access"
+    # default glob-like prefix of the files which are ingested
+    prefix_default: str = "access.log"
+    # name of the file which keeps the read offsets, placed into the log directory if not configured otherwise
+    checkpoint_default: str = ".rilogging-checkpoints.json"
+    # amount of records which are written with one bulk operation, the checkpoint is saved after every batch
+    batch_default: int = 5000
+    # size of the uncompressed chunks which are read from gzip compressed files
+    chunk_size: int = 4194304
+    # maximum length of the first line which is used as fingerprint of a file
+    fingerprint_length: int = 4096
+    # $remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent "$http_referer" "$http_user_agent"
+    pattern = re.compile(rb'^(\S+) \S+ (\S+) \[([^\]\n]+)\] "([^"\n]*)" (\d{3}) (\d+|-) "([^"\n]*)" "([^"\n]*)"[^\n]*$', re.MULTILINE)
+    months: dict = {b"Jan": 1, b"Feb": 2, b"Mar": 3, b"Apr": 4, b"May": 5, b"Jun": 6, b"Jul": 7, b"Aug": 8, b"Sep": 9, b"Oct": 10, b"Nov": 11, b"Dec": 12}
+    # fields of the parsed records, described like a frontend information so the table is created by the query creator
+    information: dict = {
+        "id": "backend_access_log",
+        "target_name": "method",
+        "timestamp_name": "time",
+        "fields": [
+            {"name": "remote_addr", "datatype": "string"},
+            {"name": "remote_user", "datatype": "string"},
+            {"name": "path", "datatype": "string"},
+            {"name": "protocol", "datatype": "string"},
+            {"name": "status", "datatype": "integer"},
+            {"name": "body_bytes_sent", "datatype": "integer"},
+            {"name": "http_referer", "datatype": "string"},
+            {"name": "http_user_agent", "datatype": "string"}
+        ]
+    }
+    directory: str = None
+    prefix: str = prefix_default
+    checkpoint: str = None
+    batch: int = batch_default
+    route: RiLoggingRoute = None
+    # function which writes a list of records for one route and returns the amount of written records
+    writer = None
+    # serializes the ingestion within the process, the checkpoint file is additionally locked between processes
+    lock: threading.Lock = threading.Lock()
+    thread: threading.Thread = None
+
+    @classmethod
+    # reads the optional access_log dictionary of the backend configuration, the ingestion stays disabled without it
+    def configure(cls, access_log: dict, writer):
+        cls.directory = None
+        if type(access_log) is not dict:
+            return
+        cls.directory = access_log.get("directory")
+        cls.prefix = access_log.get("prefix", RiLoggingAccessLog.prefix_default)
+        cls.checkpoint = access_log.get("checkpoint", os.path.join(cls.directory, RiLoggingAccessLog.checkpoint_default))
+        cls.batch = access_log.get("batch", RiLoggingAccessLog.batch_default)
+        cls.route = RiLoggingRoute(information=RiLoggingAccessLog.information, database_map={"information": RiLoggingAccessLog.information.get("id"), "collection": access_log.get("collection", RiLoggingAccessLog.collection_default)})
+        cls.writer = writer
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls.directory is not None
+
+    @classmethod
+    # starts a background thread, which ingests the whole directory every interval seconds
+    def start(cls, interval: int):
+        if cls.is_enabled() is False or cls.thread is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    cls.ingest()
+                except Exception:
+                    # the checkpoints of the failed files weren't advanced, their lines are ingested again by the next run
+                    logging.getLogger(__name__).exception("The access logs couldn't be ingested from " + cls.directory)
+
+        cls.thread = threading.Thread(target=run, name="RiLoggingAccessLog", daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    # returns the names of the log files in the directory, oldest first so rotated files are read before the current one
+    def get_filenames(cls) -> list:
+        filenames = [filename for filename in os.listdir(cls.directory) if filename.startswith(cls.prefix) and os.path.isfile(os.path.join(cls.directory, filename))]
+
+        return sorted(filenames, key=lambda filename: os.path.getmtime(os.path.join(cls.directory, filename)))
+
+    @staticmethod
+    def is_compressed(filename: str) -> bool:
+        return filename.endswith(".gz")
+
+    @classmethod
+    def open_file(cls, filename: str):
+        path = os.path.join(cls.directory, filename)
+        return gzip.open(path, "rb") if cls.is_compressed(filename) is True else open(path, "rb")
+
+    @classmethod
+    # returns the fingerprint of the file or None if the file has no complete line yet
+    def get_fingerprint(cls, filename: str):
+        try:
+            with cls.open_file(filename) as file:
+                line = file.readline(RiLoggingAccessLog.fingerprint_length)
+        except (OSError, EOFError):
+            return None
+        if len(line) == 0 or line.endswith(b"\n") is False and len(line) < RiLoggingAccessLog.fingerprint_length:
+            return None
+
+        return hashlib.sha1(line).hexdigest()
+
+    @classmethod
+    # returns the files of the directory with their size and the offset up to which they were ingested
+    def list_files(cls) -> list:
+        checkpoints = cls.read_checkpoints()
+        files = []
+        for filename in cls.get_filenames():
+            checkpoint = checkpoints.get(cls.get_fingerprint(filename), {})
+            files.append({
+                "name": filename,
+                "size": os.path.getsize(os.path.join(cls.directory, filename)),
+                "compressed": cls.is_compressed(filename),
+                "offset": checkpoint.get("offset", 0)
+            })
+
+        return files
+
+    @classmethod
+    def read_checkpoints(cls) -> dict:
+        try:
+            with open(cls.checkpoint, "r") as file:
+                return json.loads(file.read())
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    # replaces the checkpoint file atomically, so a crash never leaves a half written file
+    def write_checkpoints(cls, checkpoints: dict):
+        temporary = cls.checkpoint + ".tmp"
+        with open(temporary, "w") as file:
+            file.write(json.dumps(checkpoints))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, cls.checkpoint)
+
+    @classmethod
+    # runs the function while holding the lock of the process and the lock of the checkpoint file, returns its result
+    def synchronized(cls, function):
+        with cls.lock:
+            lock_file = open(cls.checkpoint + ".lock", "a")
+            try:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                return function(cls.read_checkpoints())
+            finally:
+                lock_file.close()
+
+    @classmethod
+    # ingests the new lines of all files and forgets the checkpoints of files which don't exist anymore, returns the amount of imported records
+    def ingest(cls) -> int:
+        def ingest_all(checkpoints: dict) -> int:
+            imported = 0
+            fingerprints = []
+            for filename in cls.get_filenames():
+                fingerprint = cls.get_fingerprint(filename)
+                if fingerprint is not None:
+                    fingerprints.append(fingerprint)
+                    imported += cls.ingest_file(filename, fingerprint, checkpoints)
+            for fingerprint in list(checkpoints.keys()):
+                if fingerprint not in fingerprints:
+                    checkpoints.pop(fingerprint)
+            cls.write_checkpoints(checkpoints)
+            return imported
+
+        return cls.synchronized(ingest_all)
+
+    @classmethod
+    # ingests the new lines of one file of the directory, returns the amount of imported records or None if the file doesn't exist
+    def ingest_filename(cls, filename: str):
+        if filename not in cls.get_filenames():
+            return None
+
+        def ingest_one(checkpoints: dict) -> int:
+            fingerprint = cls.get_fingerprint(filename)
+            if fingerprint is None:
+                return 0
+            return cls.ingest_file(filename, fingerprint, checkpoints)
+
+        return cls.synchronized(ingest_one)
+
+    @classmethod
+    # parses the file from the checkpointed offset on and writes the records in batches, the checkpoint is saved after every written batch
+    def ingest_file(cls, filename: str, fingerprint: str, checkpoints: dict) -> int:
+        checkpoint = checkpoints.get(fingerprint, {"offset": 0})
+        checkpoint.__setitem__("name", filename)
+        checkpoints.__setitem__(fingerprint, checkpoint)
+        imported = 0
+        records = []
+
+        # the checkpoint is only advanced behind completely written batches, otherwise the batch is read again by the next ingestion
+        def save(offset: int) -> int:
+            written = cls.writer(cls.route, records) if len(records) > 0 else 0
+            if written != len(records):
+                raise IOError("The access logs of " + filename + " couldn't be written completely")
+            checkpoint.__setitem__("offset", offset)
+            cls.write_checkpoints(checkpoints)
+            records.clear()
+            return written
+
+        if cls.is_compressed(filename) is True:
+            chunks = cls.read_compressed(filename, checkpoint.get("offset"))
+        else:
+            chunks = cls.read_plain(filename, checkpoint.get("offset"))
+        try:
+            for buffer, start, end, base in chunks:
+                for record, line_end in cls.parse(buffer, start, end):
+                    # truncates the values to the column sizes, records which don't fit the columns are skipped
+                    document, errors = cls.route.converter.convert(record)
+                    if errors is None:
+                        records.append(document)
+                    if len(records) >= cls.batch:
+                        imported += save(base + line_end + 1)
+                imported += save(base + end)
+        finally:
+            chunks.close()
+
+        return imported
+
+    @classmethod
+    # maps the plain file into memory and returns the region from the offset to the last complete line
+    # the file was truncated (copytruncate) if it is shorter than the offset, it is read from the beginning then
+    def read_plain(cls, filename: str, offset: int):
+        with open(os.path.join(cls.directory, filename), "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < offset:
+                offset = 0
+            if size == offset:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                end = buffer.rfind(b"\n", offset) + 1
+                if end > offset:
+                    yield buffer, offset, end, 0
+
+    @classmethod
+    # decompresses the file in chunks, skips everything before the offset and returns the complete lines of every chunk
+    def read_compressed(cls, filename: str, offset: int):
+        with gzip.open(os.path.join(cls.directory, filename), "rb") as file:
+            if offset > 0:
+                file.seek(offset)
+            base = file.tell()
+            remainder = b""
+            while True:
+                chunk = file.read(RiLoggingAccessLog.chunk_size)
+                if len(chunk) == 0:
+                    break
+                buffer = remainder + chunk
+                end = buffer.rfind(b"\n") + 1
+                if end > 0:
+                    yield buffer, 0, end, base
+                base += end
+                remainder = buffer[end:]
+
+    @classmethod
+    # parses the lines of the buffer between start and end, returns every record together with the position of its line end
+    def parse(cls, buffer, start: int, end: int):
+        months = RiLoggingAccessLog.months
+        time_local = None
+        time_value = None
+        for match in RiLoggingAccessLog.pattern.finditer(buffer, start, end):
+            remote_addr, remote_user, time_raw, request, status, body_bytes_sent, http_referer, http_user_agent = match.groups()
+            # many lines share the same second, so the time is only converted if it changed
+            if time_raw != time_local:
+                time_local = time_raw
+                time_value = cls.convert_time(time_raw, months)
+            if time_value is None:
+                continue
+            request_parts = request.split(b" ")
+            if len(request_parts) == 3:
+                method, path, protocol = request_parts
+            else:
+                method, path, protocol = b"", request, b""
+            yield {
+                "method": method.decode("utf-8", "replace"),
+                "time": time_value,
+                "remote_addr": remote_addr.decode("utf-8", "replace"),
+                "remote_user": remote_user.decode("utf-8", "replace"),
+                "path": path.decode("utf-8", "replace"),
+                "protocol": protocol.decode("utf-8", "replace"),
+                "status": int(status),
+                "body_bytes_sent": int(body_bytes_sent) if body_bytes_sent != b"-" else 0,
+                "http_referer": http_referer.decode("utf-8", "replace"),
+                "http_user_agent": http_user_agent.decode("utf-8", "replace")
+            }, match.end()
+
+    @staticmethod
+    # converts $time_local (10/Oct/2000:13:55:36 -0700) into UTC in the timestamp format of the frontend logs, returns None if invalid
+    def convert_time(value: bytes, months: dict):
+        try:
+            moment = datetime.datetime(int(value[7:11]), months[value[3:6]], int(value[0:2]), int(value[12:14]), int(value[15:17]), int(value[18:20]))
+            offset = (int(value[22:24]) * 60 + int(value[24:26])) * (-1 if value[21:22] == b"-" else 1)
+        except (ValueError, KeyError, IndexError):
+            return None
+
+        return (moment - datetime.timedelta(minutes=offset)).strftime("%Y-%m-%d %H:%M:%S")
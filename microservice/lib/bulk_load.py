@@ -0,0 +1,106 @@
+# dependencies
+import csv
+import json
+import logging
+import time
+from microservice.lib.routing import RiLoggingRoutingTable
+
+
+# bulk loader of historical logs or large backlogs, given as newline-delimited JSON or as CSV with a header line
+# the rows are routed and converted with the same information and map rules as POST /log and collected per table/collection,
+# every full chunk is handed to the loader at once, which loads it with the bulk path of the storage backend (e.g. LOAD DATA in mysql)
+# the buffer, the spool and the per-log metrics are bypassed, a failed chunk is reported and the load continues with the next chunk
+class RiLoggingBulkLoad:
+    # enum values for possible formats of the input
+    format_ndjson: str = "ndjson"
+    format_csv: str = "csv"
+    formats: list = ["ndjson", "csv"]
+    # default amount of rows of a table/collection which are loaded at once
+    chunk_default: int = 100000
+    # maximum amount of reported errors of invalid rows and failed chunks
+    errors_max: int = 100
+
+    @staticmethod
+    # returns a generator of (line, row) of the input lines, rows which aren't valid JSON objects are None
+    def read_ndjson(lines):
+        for line_number, line in enumerate(lines, start=1):
+            if len(line.strip()) == 0:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                row = None
+            yield line_number, row if type(row) is dict else None
+
+    @staticmethod
+    # returns a generator of (line, row) of the csv lines, the first line names the fields, empty values are left out like missing fields
+    def read_csv(lines):
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        for row in reader:
+            if len(row) == 0:
+                continue
+            yield reader.line_num, {name: value for name, value in zip(header, row) if value != ""}
+
+    @classmethod
+    # reads, routes and converts the rows of the input and loads them in chunks per table/collection, returns the report of the load
+    # the loader writes the converted logs of one route and returns the amount of loaded logs, it raises if the chunk couldn't be loaded
+    def load(cls, lines, input_format: str, loader, chunk: int = None) -> dict:
+        chunk = chunk or cls.chunk_default
+        started = time.perf_counter()
+        report = {
+            "rows": 0,
+            "loaded": 0,
+            "invalid": 0,
+            "unrouted": 0,
+            "failed": 0,
+            "errors": [],
+            "collections": {}
+        }
+        groups = {}
+        rows = cls.read_csv(lines) if input_format == cls.format_csv else cls.read_ndjson(lines)
+        for line_number, row in rows:
+            report.__setitem__("rows", report.get("rows") + 1)
+            route = RiLoggingRoutingTable.resolve(row) if row is not None else None
+            if route is None:
+                report.__setitem__("unrouted", report.get("unrouted") + 1)
+                continue
+            document, errors = route.converter.convert(row)
+            if errors is not None:
+                report.__setitem__("invalid", report.get("invalid") + 1)
+                if len(report.get("errors")) < cls.errors_max:
+                    report.get("errors").append({"line": line_number, "errors": errors})
+                continue
+            group = groups.get(route.collection)
+            if group is None:
+                group = (route, [])
+                groups.__setitem__(route.collection, group)
+            group[1].append(document)
+            if len(group[1]) >= chunk:
+                cls.load_chunk(route, group[1], loader, report)
+                group[1].clear()
+        for route, documents in groups.values():
+            if len(documents) > 0:
+                cls.load_chunk(route, documents, loader, report)
+
+        seconds = time.perf_counter() - started
+        report.__setitem__("seconds", round(seconds, 3))
+        report.__setitem__("rows_per_second", round(report.get("loaded") / seconds, 1) if seconds > 0 else 0.0)
+
+        return report
+
+    @staticmethod
+    # loads the chunk of the route and adds the loaded logs to the report, the error of a failed chunk is logged and reported with its table/collection
+    def load_chunk(route, documents: list, loader, report: dict):
+        try:
+            loaded = loader(route, documents)
+        except Exception as error:
+            logging.getLogger(__name__).exception("The chunk couldn't be loaded into " + route.collection)
+            if len(report.get("errors")) < RiLoggingBulkLoad.errors_max:
+                report.get("errors").append({"collection": route.collection, "errors": [type(error).__name__ + ": " + str(error)]})
+            loaded = 0
+        report.__setitem__("loaded", report.get("loaded") + loaded)
+        report.__setitem__("failed", report.get("failed") + len(documents) - loaded)
+        report.get("collections").__setitem__(route.collection, report.get("collections").get(route.collection, 0) + loaded)
@@ -0,0 +1,86 @@
+# dependencies
+import gzip
+import hashlib
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# response body which is built once and kept together with its compressed variants and a strong ETag
+# requests are answered from the cached bytes, a matching If-None-Match is answered with 304 and no body
+class RiLoggingCachedResponse:
+    # enum values for possible content codings, in the order of preference
+    encoding_brotli: str = "br"
+    encoding_gzip: str = "gzip"
+    encoding_identity: str = "identity"
+    # http response status indicating that the body is sent
+    status_ok: int = 200
+    # http response status indicating that the cached copy of the client is still valid
+    status_not_modified: int = 304
+
+    # compresses the body once with every available coding
+    def __init__(self, body: bytes, mimetype: str, cache_control: str):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.bodies = {RiLoggingCachedResponse.encoding_identity: body}
+        self.bodies.__setitem__(RiLoggingCachedResponse.encoding_gzip, gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            self.bodies.__setitem__(RiLoggingCachedResponse.encoding_brotli, brotli.compress(body, quality=11))
+        # every coding is another representation and gets its own strong ETag, which all share the digest of the body
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etags = {}
+        for encoding in self.bodies.keys():
+            self.etags.__setitem__(encoding, "\"" + self.digest + ("" if encoding == RiLoggingCachedResponse.encoding_identity else "-" + encoding) + "\"")
+
+    # returns the preferred coding which the client accepts, codings with q=0 are refused
+    def negotiate(self, accept_encoding: str) -> str:
+        accepted = {}
+        for coding in (accept_encoding or "").split(","):
+            parts = coding.strip().split(";")
+            quality = 1.0
+            for parameter in parts[1:]:
+                name, _, value = parameter.strip().partition("=")
+                if name == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            accepted.__setitem__(parts[0].strip().lower(), quality)
+
+        for encoding in [RiLoggingCachedResponse.encoding_brotli, RiLoggingCachedResponse.encoding_gzip]:
+            if encoding in self.bodies and accepted.get(encoding, accepted.get("*", 0.0)) > 0.0:
+                return encoding
+
+        return RiLoggingCachedResponse.encoding_identity
+
+    # checks whether one of the ETags of the If-None-Match header belongs to the cached body
+    def is_not_modified(self, if_none_match: str) -> bool:
+        if type(if_none_match) is not str:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        for etag in if_none_match.split(","):
+            etag = etag.strip()
+            # If-None-Match uses the weak comparison
+            if etag.startswith("W/"):
+                etag = etag[2:]
+            if etag in self.etags.values():
+                return True
+
+        return False
+
+    # returns the status, the body and the headers of the response to the request
+    def get(self, if_none_match: str, accept_encoding: str) -> tuple:
+        encoding = self.negotiate(accept_encoding)
+        headers = {
+            "ETag": self.etags.get(encoding),
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding"
+        }
+        if self.is_not_modified(if_none_match) is True:
+            return RiLoggingCachedResponse.status_not_modified, b"", headers
+        if encoding != RiLoggingCachedResponse.encoding_identity:
+            headers.__setitem__("Content-Encoding", encoding)
+
+        return RiLoggingCachedResponse.status_ok, self.bodies.get(encoding), headers
@@ -0,0 +1,177 @@
+# dependencies
+import atexit
+import threading
+
+
+# counters of the changes (title, description, status) per project, requirement, user and change type
+# the counters are increased in memory whenever logs of the configured informations are written and added to the aggregate store
+# of the storage backend by a background thread, so /frontend/change is answered from the small store instead of the raw logs
+class RiLoggingChanges:
+    # enum values for possible types of changes, which are the keys of the change counts in the responses
+    change_types: list = ["title", "description", "status"]
+    # default milliseconds between two flushes of the counters
+    interval_default: int = 1000
+    # default amount of logs which are read at once by the backfill
+    batch_default: int = 1000
+    # map of the table/collection to the field names (project, requirement, user, type) of its logs, only the configured informations are counted
+    sources: dict = {}
+    # map of the value of the type field to the type of the change
+    types: dict = {}
+    # counters (project, requirement, user, change type) -> changes which weren't added to the aggregate store yet
+    pending: dict = {}
+    pending_lock: threading.Lock = threading.Lock()
+    # function which adds a list of counters (project, requirement, user, change type, changes) to the aggregate store
+    writer = None
+    # background thread flushing the counters
+    thread: threading.Thread = None
+    # signal for the background thread to flush the counters and stop
+    stopping: threading.Event = None
+    # set while the backfill counts all stored logs, the written logs aren't counted then so they aren't counted twice
+    backfilling: threading.Event = threading.Event()
+    interval: float = 1.0
+    # counters describing the state of the aggregation
+    counters: dict = {}
+
+    @classmethod
+    # compiles the sources of the changes and starts the background flusher
+    def start(cls, changes: dict, routes: list, writer):
+        cls.stop()
+        cls.configure(changes, routes)
+        cls.writer = writer
+        cls.interval = changes.get("interval", cls.interval_default) / 1000.0
+        cls.counters = {
+            "counted": 0,
+            "flushed": 0,
+            "failed": 0
+        }
+        cls.stopping = threading.Event()
+        cls.thread = threading.Thread(target=cls.run, name="RiLoggingChanges", daemon=True)
+        cls.thread.start()
+        # the counts are started again by a reload, the exit handler is registered only once
+        atexit.unregister(cls.stop)
+        atexit.register(cls.stop)
+
+    @classmethod
+    # compiles the field names of every table/collection of the configured informations, called on start and whenever the configuration changes
+    def configure(cls, changes: dict, routes: list):
+        sources = {}
+        for route in routes:
+            if route.information_id in changes.get("information"):
+                sources.__setitem__(route.collection, (changes.get("project"), changes.get("requirement"), changes.get("user"), changes.get("type", route.target_name)))
+        cls.types = changes.get("types", {change_type: change_type for change_type in cls.change_types})
+        cls.sources = sources
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls.thread is not None
+
+    @classmethod
+    # returns the counter key of the log, None if the log isn't a change or misses the project or requirement
+    # the converter stores missing fields as empty strings, which are missing values as well
+    def get_key(cls, fields: tuple, document: dict) -> tuple:
+        project_name, requirement_name, user_name, type_name = fields
+        change_type = cls.types.get(document.get(type_name))
+        if change_type is None or document.get(project_name) in [None, ""] or document.get(requirement_name) in [None, ""]:
+            return None
+
+        user = document.get(user_name) if user_name is not None else None
+
+        return str(document.get(project_name)), str(document.get(requirement_name)), str(user) if user is not None else "", change_type
+
+    @classmethod
+    # counts the changes among the written logs of the route, logs of other informations are ignored right away
+    def count(cls, route, documents: list):
+        fields = cls.sources.get(route.collection)
+        if fields is None or cls.thread is None or cls.backfilling.is_set() is True:
+            return
+        keys = [key for key in (cls.get_key(fields, document) for document in documents) if key is not None]
+        if len(keys) == 0:
+            return
+        with cls.pending_lock:
+            for key in keys:
+                cls.pending.__setitem__(key, cls.pending.get(key, 0) + 1)
+            cls.counters.__setitem__("counted", cls.counters.get("counted") + len(keys))
+
+    @classmethod
+    # returns the counters of the aggregation together with the amount of counters waiting for the flush
+    def statistics(cls) -> dict:
+        with cls.pending_lock:
+            statistics = dict(cls.counters)
+            statistics.__setitem__("pending", len(cls.pending))
+
+        return statistics
+
+    @classmethod
+    # background loop, flushes the counters after every interval
+    def run(cls):
+        while cls.stopping.wait(cls.interval) is False:
+            cls.flush()
+
+    @classmethod
+    # adds the pending counters to the aggregate store, counters which couldn't be added are kept for the next flush
+    def flush(cls):
+        with cls.pending_lock:
+            pending = cls.pending
+            cls.pending = {}
+        if len(pending) == 0:
+            return
+        try:
+            cls.writer([key + (changes,) for key, changes in pending.items()])
+        except Exception:
+            with cls.pending_lock:
+                for key, changes in pending.items():
+                    cls.pending.__setitem__(key, cls.pending.get(key, 0) + changes)
+                cls.counters.__setitem__("failed", cls.counters.get("failed") + 1)
+            return
+        with cls.pending_lock:
+            cls.counters.__setitem__("flushed", cls.counters.get("flushed") + sum(pending.values()))
+
+    @classmethod
+    # counts the changes of all logs stored in the tables/collections of the configured informations and replaces the aggregate store with them
+    # the pending counters are dropped and the written logs aren't counted until the store is replaced, only the logs read by the stream are counted then
+    def backfill(cls, routes: list, stream, replace) -> list:
+        cls.backfilling.set()
+        try:
+            with cls.pending_lock:
+                cls.pending = {}
+            totals = {}
+            for route in routes:
+                fields = cls.sources.get(route.collection)
+                if fields is None:
+                    continue
+                for documents in stream(route, {}, cls.batch_default):
+                    for document in documents:
+                        key = cls.get_key(fields, document)
+                        if key is not None:
+                            totals.__setitem__(key, totals.get(key, 0) + 1)
+            rows = [key + (changes,) for key, changes in totals.items()]
+            replace(rows)
+        finally:
+            cls.backfilling.clear()
+
+        return rows
+
+    @staticmethod
+    # groups the aggregated rows (id, change type, changes) by their id into the change counts of the response
+    def create_changes(rows: list, id_name: str) -> list:
+        changes = {}
+        for row_id, change_type, change_count in rows:
+            change = changes.get(row_id)
+            if change is None:
+                change = {id_name: row_id, "changeCount": {change_type: 0 for change_type in RiLoggingChanges.change_types}}
+                changes.__setitem__(row_id, change)
+            change.get("changeCount").__setitem__(change_type, change.get("changeCount").get(change_type, 0) + int(change_count))
+
+        return [changes.get(row_id) for row_id in sorted(changes.keys())]
+
+    @classmethod
+    # stops the background thread and flushes the remaining counters
+    def stop(cls):
+        if cls.thread is None:
+            return
+
+        cls.stopping.set()
+        cls.thread.join()
+        cls.thread = None
+        cls.flush()
+        cls.sources = {}
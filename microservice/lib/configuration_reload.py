@@ -0,0 +1,142 @@
+# dependencies
+import hashlib
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from microservice.lib.configuration_validator import RiLoggingConfigurationValidator
+from microservice.lib.messages import RiLoggingError
+
+
+# reloads the configuration file while serving, triggered by the file watcher, SIGHUP or the administrative endpoint
+# the file is validated like on start, an invalid file is reported and the active configuration stays in place
+class RiLoggingConfigurationReload:
+    # location of the configuration file, None if the configuration wasn't loaded from a file
+    filename: str = None
+    # digest of the file content which is active, a reload of the same content is skipped
+    digest: str = None
+    # modification time and size of the file when it was checked last, compared by the watcher
+    modified: tuple = None
+    # function which swaps in a validated configuration and returns the warnings of settings which need a restart
+    apply = None
+    # serializes the reloads within the process
+    lock: threading.Lock = threading.Lock()
+    thread: threading.Thread = None
+
+    @classmethod
+    # remembers the file of the active configuration and the function swapping in a new one
+    def configure(cls, filename: str, apply):
+        cls.filename = filename
+        cls.apply = apply
+        if filename is not None:
+            cls.modified = cls.get_modified()
+            content = RiLoggingConfigurationReload.load(filename)[0]
+            cls.digest = hashlib.sha256(content).hexdigest() if content is not None else None
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls.filename is not None
+
+    @classmethod
+    # returns the modification time and the size of the file or None if it can't be read
+    def get_modified(cls):
+        try:
+            status = os.stat(cls.filename)
+        except OSError:
+            return None
+
+        return status.st_mtime_ns, status.st_size
+
+    @staticmethod
+    # reads and validates the configuration file, returns the content, the configuration and the messages of the errors and warnings
+    def load(filename: str) -> tuple:
+        try:
+            with open(filename, "rb") as file:
+                content = file.read()
+        except OSError:
+            return None, None, [RiLoggingError.error_message(status_code=2, prefix="Error")], []
+        try:
+            configuration = json.loads(content.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return content, None, [RiLoggingError.error_message(status_code=4, prefix="Error")], []
+        if type(configuration) is not dict:
+            return content, None, [RiLoggingError.error_message(status_code=6, prefix="Error")], []
+
+        validator = RiLoggingConfigurationValidator(configuration=configuration)
+        validator.validate_strucutre()
+        errors = [RiLoggingError.error_message(status_code=error.get("error"), prefix="Error", placeholder=error.get("placeholder")) for error in validator.errors]
+        warnings = [RiLoggingError.error_message(status_code=warning.get("warning"), prefix="Warning", placeholder=warning.get("placeholder")) for warning in validator.warnings]
+
+        return content, configuration if len(errors) == 0 else None, errors, warnings
+
+    @classmethod
+    # reloads the configuration file, a file with the same content as the active configuration is only applied if forced
+    # returns whether the configuration was swapped, the errors of an invalid file and the warnings of the validation and of settings which need a restart
+    def reload(cls, force: bool = False) -> dict:
+        result = {"reloaded": False, "errors": [], "warnings": []}
+        if cls.is_enabled() is False:
+            result.get("errors").append(RiLoggingError.error_message(status_code=1, prefix="Error"))
+            return result
+
+        with cls.lock:
+            cls.modified = cls.get_modified()
+            content, configuration, errors, warnings = RiLoggingConfigurationReload.load(cls.filename)
+            if configuration is None:
+                result.__setitem__("errors", errors)
+                return result
+            digest = hashlib.sha256(content).hexdigest()
+            if digest == cls.digest and force is False:
+                return result
+            result.__setitem__("warnings", warnings + cls.apply(configuration))
+            cls.digest = digest
+            result.__setitem__("reloaded", True)
+
+        return result
+
+    @classmethod
+    # reloads the configuration if the file was modified since it was checked last
+    def check(cls) -> dict:
+        if cls.is_enabled() is False or cls.get_modified() == cls.modified:
+            return None
+
+        return cls.reload()
+
+    @staticmethod
+    # writes the errors and warnings of a reload into the log of the server, the reloads of the watcher and of SIGHUP have no response to return them with
+    def report(result: dict):
+        if result is None:
+            return
+        logger = logging.getLogger(__name__)
+        for error in result.get("errors"):
+            logger.error(error)
+        for warning in result.get("warnings"):
+            logger.warning(warning)
+
+    @classmethod
+    # starts a background thread, which checks the file for modifications every interval seconds
+    def start(cls, interval: int):
+        if cls.is_enabled() is False or cls.thread is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    RiLoggingConfigurationReload.report(cls.check())
+                except Exception:
+                    # a failing reload must not stop the watcher, the next modification is tried again
+                    logging.getLogger(__name__).exception("The configuration couldn't be reloaded from " + cls.filename)
+
+        cls.thread = threading.Thread(target=run, name="RiLoggingConfigurationReload", daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    # reloads the configuration on SIGHUP, the reload runs in its own thread instead of the interrupted one
+    # only possible in the main thread of a process which doesn't handle SIGHUP itself, like the development server
+    def install_signal(cls):
+        if cls.is_enabled() is False or hasattr(signal, "SIGHUP") is False or threading.current_thread() is not threading.main_thread():
+            return
+
+        signal.signal(signal.SIGHUP, lambda signal_number, frame: threading.Thread(target=lambda: RiLoggingConfigurationReload.report(cls.reload(force=True)), name="RiLoggingConfigurationReload", daemon=True).start())
@@ -1,3 +1,13 @@
+# dependencies
+from microservice.lib.storage import RiLoggingStorage
+from microservice.lib.storage_sharded import RiLoggingStorageSharded
+from microservice.lib.storage_file import RiLoggingStorageFile
+from microservice.lib.changes import RiLoggingChanges
+from microservice.lib.rollups import RiLoggingRollups
+from microservice.lib.partitions import RiLoggingPartitions
+from microservice.lib.mysql_query_generator import RiLoggingMySqlQueryCreator
+
+
 # validates the given configuration
 class RiLoggingConfigurationValidator:
     # saves the full configuration
@@ -9,14 +19,19 @@ class RiLoggingConfigurationValidator:
     # enum value for possible connections
     server_type_mysql: str = "mysql"
     server_type_mongodb: str = "mongodb"
+    server_type_file: str = "file"
+    # enum values for possible serving modes
+    server_modes: list = ["development", "prefork", "asgi", "async"]
     # enum values for possible additional validation procedures
     validator_additional_positive = "positive"
     validator_additional_not_empty = "not_empty"
 
     @classmethod
-    # sets the configuration for the instance
+    # sets the configuration for the instance, the errors and warnings of a previous validation are dropped
     def __init__(cls, configuration):
         cls.configuration = configuration
+        cls.errors = []
+        cls.warnings = []
 
     @classmethod
     # validates the given property of an object with given approach
@@ -73,16 +88,53 @@ class RiLoggingConfigurationValidator:
                 if connection.get("server").get("type") == RiLoggingConfigurationValidator.server_type_mysql:
                     if cls.validate_value(dict_object=connection, dict_key="user", check_type=dict, error=102) is True:
                         cls.validate_connection_user(user=connection.get("user"))
+            if cls.validate_value(dict_object=connection, dict_key="shards") is True:
+                if cls.validate_value(dict_object=connection, dict_key="shards", check_type=dict, error=103) is True:
+                    cls.validate_connection_shards(shards=connection.get("shards"), server=connection.get("server"), error_base=1030)
 
     @classmethod
     # validates the server dictionary in the connection dictionary
     def validate_connection_server(cls, server: dict):
-        cls.validate_value(dict_object=server, dict_key="host", check_type=str, error=1011, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
-        cls.validate_value(dict_object=server, dict_key="port", check_type=int, error=1012, additional=RiLoggingConfigurationValidator.validator_additional_positive)
+        # the file backend writes into a local directory instead of connecting to a server
+        if server.get("type") == RiLoggingConfigurationValidator.server_type_file:
+            cls.validate_value(dict_object=server, dict_key="directory", check_type=str, error=1016, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+            if cls.validate_value(dict_object=server, dict_key="file") is True:
+                if cls.validate_value(dict_object=server, dict_key="file", check_type=dict, error=1017) is True:
+                    cls.validate_connection_server_file(file=server.get("file"), error_base=10170)
+        else:
+            cls.validate_value(dict_object=server, dict_key="host", check_type=str, error=1011, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+            cls.validate_value(dict_object=server, dict_key="port", check_type=int, error=1012, additional=RiLoggingConfigurationValidator.validator_additional_positive)
         if cls.validate_value(dict_object=server, dict_key="type", check_type=str, error=1013, additional=RiLoggingConfigurationValidator.validator_additional_not_empty) is True:
-            cls.validate_value(dict_object={RiLoggingConfigurationValidator.server_type_mysql: 1, RiLoggingConfigurationValidator.server_type_mongodb: 1}, dict_key=server.get("type"), check_type=int, error=10131)
+            cls.validate_value(dict_object={server_type: 1 for server_type in RiLoggingStorage.backends.keys()}, dict_key=server.get("type"), check_type=int, error=10131)
         if cls.validate_value(dict_object=server, dict_key="database", check_type=dict, error=1014) is True:
             cls.validate_connection_server_database(database=server.get("database"), error_base=10140)
+        if cls.validate_value(dict_object=server, dict_key="pool") is True:
+            if cls.validate_value(dict_object=server, dict_key="pool", check_type=dict, error=1015) is True:
+                cls.validate_connection_server_pool(pool=server.get("pool"), error_base=10150)
+
+    @classmethod
+    # validates the optional file dictionary in the server dictionary of the file backend
+    def validate_connection_server_file(cls, file: dict, error_base: int):
+        file_format = file.get("format", RiLoggingStorageFile.format_ndjson)
+        if cls.validate_value(dict_object=file, dict_key="format") is True:
+            if cls.validate_value(dict_object=file, dict_key="format", check_type=str, error=error_base + 1) is True:
+                cls.validate_value(dict_object=RiLoggingStorageFile.compressions, dict_key=file_format, check_type=list, error=error_base + 1)
+        if cls.validate_value(dict_object=file, dict_key="compression") is True and type(file_format) is str and file_format in RiLoggingStorageFile.compressions:
+            if cls.validate_value(dict_object=file, dict_key="compression", check_type=str, error=error_base + 2) is True:
+                cls.validate_value(dict_object={compression: 1 for compression in RiLoggingStorageFile.compressions.get(file_format)}, dict_key=file.get("compression"), check_type=int, error=error_base + 2)
+        for index, file_key in enumerate(["segment", "rows", "rotate"]):
+            if cls.validate_value(dict_object=file, dict_key=file_key) is True:
+                if cls.validate_value(dict_object=file, dict_key=file_key, check_type=int, error=error_base + 3 + index, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                    cls.validate_value(dict_object=file, dict_key=file_key, check_type=int, error=error_base + 3 + index, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+
+    @classmethod
+    # validates the optional pool dictionary in the server dictionary
+    def validate_connection_server_pool(cls, pool: dict, error_base: int):
+        if cls.validate_value(dict_object=pool, dict_key="min") is True:
+            cls.validate_value(dict_object=pool, dict_key="min", check_type=int, error=error_base + 1, additional=RiLoggingConfigurationValidator.validator_additional_positive)
+        if cls.validate_value(dict_object=pool, dict_key="max") is True:
+            if cls.validate_value(dict_object=pool, dict_key="max", check_type=int, error=error_base + 2, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                cls.validate_value(dict_object=pool, dict_key="max", check_type=int, error=error_base + 2, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
 
     @classmethod
     # validates the database dictionary in the server dictionary
@@ -92,12 +144,49 @@ class RiLoggingConfigurationValidator:
         if cls.validate_value(dict_object=database, dict_key="map", check_type=list, error=error_base + 3, additional=RiLoggingConfigurationValidator.validator_additional_not_empty) is True:
             for database_map in database.get("map"):
                 cls.validate_connection_server_database_map(database_map=database_map, index=database.get("map").index(database_map), error_base=(error_base + 3) * 10)
+        if cls.validate_value(dict_object=database, dict_key="engine") is True:
+            if cls.validate_value(dict_object=database, dict_key="engine", check_type=str, error=error_base + 4) is True:
+                cls.validate_value(dict_object=dict.fromkeys(RiLoggingMySqlQueryCreator.engines, 1), dict_key=database.get("engine"), check_type=int, error=error_base + 4)
 
     @classmethod
     # validates the database_map dictionary in the map list
     def validate_connection_server_database_map(cls, database_map: dict, index: int, error_base: int):
         cls.validate_value(dict_object=database_map, dict_key="information", check_type=str, error=error_base + 1, additional=RiLoggingConfigurationValidator.validator_additional_not_empty, index=index)
         cls.validate_value(dict_object=database_map, dict_key="collection", check_type=str, error=error_base + 2, additional=RiLoggingConfigurationValidator.validator_additional_not_empty, index=index)
+        if cls.validate_value(dict_object=database_map, dict_key="partition") is True:
+            if cls.validate_value(dict_object=database_map, dict_key="partition", check_type=str, error=error_base + 3, index=index) is True:
+                cls.validate_value(dict_object=dict.fromkeys(RiLoggingPartitions.partitions, 1), dict_key=database_map.get("partition"), check_type=int, error=error_base + 3, index=index)
+        if cls.validate_value(dict_object=database_map, dict_key="retention") is True:
+            if cls.validate_value(dict_object=database_map, dict_key="retention", check_type=int, error=error_base + 4, additional=RiLoggingConfigurationValidator.validator_additional_positive, index=index) is True:
+                cls.validate_value(dict_object=database_map, dict_key="retention", check_type=int, error=error_base + 4, additional=RiLoggingConfigurationValidator.validator_additional_not_empty, index=index)
+
+    @classmethod
+    # validates the optional shards dictionary in the connection dictionary, every server overrides the properties of the configured server
+    def validate_connection_shards(cls, shards: dict, server: dict, error_base: int):
+        if cls.validate_value(dict_object=shards, dict_key="key", check_type=str, error=error_base + 1, additional=RiLoggingConfigurationValidator.validator_additional_not_empty) is True:
+            logging = cls.configuration.get("logging")
+            frontend = logging.get("frontend") if type(logging) is dict else None
+            informations = frontend.get("information") if type(frontend) is dict and type(frontend.get("information")) is list else []
+            field_names = [field.get("name") for information in informations if type(information) is dict and type(information.get("fields")) is list for field in information.get("fields") if type(field) is dict]
+            if shards.get("key") not in field_names:
+                cls.warnings.append({"warning": (error_base + 1) * 10 + 1, "placeholder": {}})
+        if cls.validate_value(dict_object=shards, dict_key="servers", check_type=list, error=error_base + 2, additional=RiLoggingConfigurationValidator.validator_additional_not_empty) is True:
+            names = [RiLoggingStorageSharded.get_name(server)]
+            for index, shard_server in enumerate(shards.get("servers")):
+                if type(shard_server) is not dict:
+                    cls.errors.append({"error": (error_base + 2) * 10 + 1, "placeholder": {"index": index}})
+                    continue
+                for server_key, check_type, additional in [("host", str, RiLoggingConfigurationValidator.validator_additional_not_empty), ("port", int, RiLoggingConfigurationValidator.validator_additional_positive), ("directory", str, RiLoggingConfigurationValidator.validator_additional_not_empty)]:
+                    if cls.validate_value(dict_object=shard_server, dict_key=server_key) is True:
+                        if cls.validate_value(dict_object=shard_server, dict_key=server_key, check_type=check_type, error=(error_base + 2) * 10 + 1, index=index, additional=additional) is False:
+                            break
+                name = RiLoggingStorageSharded.get_name(dict(server, **shard_server))
+                if name in names:
+                    cls.errors.append({"error": (error_base + 2) * 10 + 2, "placeholder": {"index": index}})
+                names.append(name)
+        if cls.validate_value(dict_object=shards, dict_key="replicas") is True:
+            if cls.validate_value(dict_object=shards, dict_key="replicas", check_type=int, error=error_base + 3, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                cls.validate_value(dict_object=shards, dict_key="replicas", check_type=int, error=error_base + 3, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
 
     @classmethod
     # validates the user dictionary in the connection dictionary
@@ -118,12 +207,116 @@ class RiLoggingConfigurationValidator:
     def validate_logging_backend(cls, backend: dict):
         if cls.validate_value(dict_object=backend, dict_key="server", check_type=dict, error=2011) is True:
             cls.validate_logging_backend_server(server=backend.get("server"))
+        if cls.validate_value(dict_object=backend, dict_key="buffer") is True:
+            if cls.validate_value(dict_object=backend, dict_key="buffer", check_type=dict, error=2012) is True:
+                cls.validate_logging_backend_buffer(buffer=backend.get("buffer"), error_base=20120)
+        if cls.validate_value(dict_object=backend, dict_key="token") is True:
+            cls.validate_value(dict_object=backend, dict_key="token", check_type=str, error=2013, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+        if cls.validate_value(dict_object=backend, dict_key="access_log") is True:
+            if cls.validate_value(dict_object=backend, dict_key="access_log", check_type=dict, error=2014) is True:
+                cls.validate_logging_backend_access_log(access_log=backend.get("access_log"), error_base=20140)
+        if cls.validate_value(dict_object=backend, dict_key="reload") is True:
+            if cls.validate_value(dict_object=backend, dict_key="reload", check_type=dict, error=2015) is True:
+                cls.validate_logging_backend_reload(reload=backend.get("reload"), error_base=20150)
+        if cls.validate_value(dict_object=backend, dict_key="spool") is True:
+            if cls.validate_value(dict_object=backend, dict_key="spool", check_type=dict, error=2016) is True:
+                cls.validate_logging_backend_spool(spool=backend.get("spool"), error_base=20160)
+        if cls.validate_value(dict_object=backend, dict_key="changes") is True:
+            if cls.validate_value(dict_object=backend, dict_key="changes", check_type=dict, error=2017) is True:
+                cls.validate_logging_backend_changes(changes=backend.get("changes"), error_base=20170)
+        if cls.validate_value(dict_object=backend, dict_key="partitions") is True:
+            if cls.validate_value(dict_object=backend, dict_key="partitions", check_type=dict, error=2018) is True:
+                cls.validate_logging_backend_partitions(partitions=backend.get("partitions"), error_base=20180)
 
     @classmethod
     # validates the server dictionary in the backend dictionary
     def validate_logging_backend_server(cls, server: dict):
         cls.validate_value(dict_object=server, dict_key="host", check_type=str, error=20111, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
         cls.validate_value(dict_object=server, dict_key="port", check_type=int, error=20112, additional=RiLoggingConfigurationValidator.validator_additional_positive)
+        if cls.validate_value(dict_object=server, dict_key="mode") is True:
+            if cls.validate_value(dict_object=server, dict_key="mode", check_type=str, error=20113, additional=RiLoggingConfigurationValidator.validator_additional_not_empty) is True:
+                cls.validate_value(dict_object=dict.fromkeys(RiLoggingConfigurationValidator.server_modes, 1), dict_key=server.get("mode"), check_type=int, error=20113)
+        for index, server_key in enumerate(["workers", "threads", "keepalive", "body_limit"]):
+            if cls.validate_value(dict_object=server, dict_key=server_key) is True:
+                if cls.validate_value(dict_object=server, dict_key=server_key, check_type=int, error=20114 + index, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                    cls.validate_value(dict_object=server, dict_key=server_key, check_type=int, error=20114 + index, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+
+    @classmethod
+    # validates the optional buffer dictionary in the backend dictionary
+    def validate_logging_backend_buffer(cls, buffer: dict, error_base: int):
+        cls.validate_value(dict_object=buffer, dict_key="enabled", check_type=bool, error=error_base + 1)
+        for index, buffer_key in enumerate(["size", "interval", "batch"]):
+            if cls.validate_value(dict_object=buffer, dict_key=buffer_key) is True:
+                if cls.validate_value(dict_object=buffer, dict_key=buffer_key, check_type=int, error=error_base + 2 + index, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                    cls.validate_value(dict_object=buffer, dict_key=buffer_key, check_type=int, error=error_base + 2 + index, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+
+    @classmethod
+    # validates the optional access_log dictionary in the backend dictionary
+    def validate_logging_backend_access_log(cls, access_log: dict, error_base: int):
+        cls.validate_value(dict_object=access_log, dict_key="directory", check_type=str, error=error_base + 1, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+        for index, access_log_key in enumerate(["collection", "prefix", "checkpoint"]):
+            if cls.validate_value(dict_object=access_log, dict_key=access_log_key) is True:
+                cls.validate_value(dict_object=access_log, dict_key=access_log_key, check_type=str, error=error_base + 2 + index, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+        for index, access_log_key in enumerate(["batch", "interval"]):
+            if cls.validate_value(dict_object=access_log, dict_key=access_log_key) is True:
+                if cls.validate_value(dict_object=access_log, dict_key=access_log_key, check_type=int, error=error_base + 5 + index, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                    cls.validate_value(dict_object=access_log, dict_key=access_log_key, check_type=int, error=error_base + 5 + index, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+
+    @classmethod
+    # validates the optional spool dictionary in the backend dictionary
+    def validate_logging_backend_spool(cls, spool: dict, error_base: int):
+        cls.validate_value(dict_object=spool, dict_key="enabled", check_type=bool, error=error_base + 1)
+        cls.validate_value(dict_object=spool, dict_key="directory", check_type=str, error=error_base + 2, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+        if cls.validate_value(dict_object=spool, dict_key="sync") is True:
+            cls.validate_value(dict_object=spool, dict_key="sync", check_type=int, error=error_base + 4, additional=RiLoggingConfigurationValidator.validator_additional_positive)
+        for spool_key, error in [("segment", error_base + 3), ("batch", error_base + 5), ("interval", error_base + 6)]:
+            if cls.validate_value(dict_object=spool, dict_key=spool_key) is True:
+                if cls.validate_value(dict_object=spool, dict_key=spool_key, check_type=int, error=error, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                    cls.validate_value(dict_object=spool, dict_key=spool_key, check_type=int, error=error, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+
+    @classmethod
+    # validates the optional changes dictionary in the backend dictionary, the informations must be configured in the frontend
+    def validate_logging_backend_changes(cls, changes: dict, error_base: int):
+        cls.validate_value(dict_object=changes, dict_key="enabled", check_type=bool, error=error_base + 1)
+        if cls.validate_value(dict_object=changes, dict_key="information", check_type=list, error=error_base + 2, additional=RiLoggingConfigurationValidator.validator_additional_not_empty) is True:
+            logging = cls.configuration.get("logging")
+            frontend = logging.get("frontend") if type(logging) is dict else None
+            informations = {}
+            if type(frontend) is dict and type(frontend.get("information")) is list:
+                informations = {information.get("id"): 1 for information in frontend.get("information") if type(information) is dict and type(information.get("id")) is str}
+            for index, information_id in enumerate(changes.get("information")):
+                if type(information_id) is not str or information_id not in informations:
+                    cls.errors.append({"error": error_base + 2, "placeholder": {"index": index}})
+        for changes_key, error in [("project", error_base + 3), ("requirement", error_base + 4)]:
+            cls.validate_value(dict_object=changes, dict_key=changes_key, check_type=str, error=error, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+        for changes_key, error in [("user", error_base + 5), ("type", error_base + 6)]:
+            if cls.validate_value(dict_object=changes, dict_key=changes_key) is True:
+                cls.validate_value(dict_object=changes, dict_key=changes_key, check_type=str, error=error, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+        if cls.validate_value(dict_object=changes, dict_key="types") is True:
+            if cls.validate_value(dict_object=changes, dict_key="types", check_type=dict, error=error_base + 7) is True:
+                for change_type in changes.get("types").values():
+                    if change_type not in RiLoggingChanges.change_types:
+                        cls.errors.append({"error": error_base + 7, "placeholder": {}})
+                        break
+        if cls.validate_value(dict_object=changes, dict_key="interval") is True:
+            if cls.validate_value(dict_object=changes, dict_key="interval", check_type=int, error=error_base + 8, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                cls.validate_value(dict_object=changes, dict_key="interval", check_type=int, error=error_base + 8, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+
+    @classmethod
+    # validates the optional partitions dictionary in the backend dictionary, the partitions themselves are configured per entry of the database map
+    def validate_logging_backend_partitions(cls, partitions: dict, error_base: int):
+        if cls.validate_value(dict_object=partitions, dict_key="interval") is True:
+            if cls.validate_value(dict_object=partitions, dict_key="interval", check_type=int, error=error_base + 1, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                cls.validate_value(dict_object=partitions, dict_key="interval", check_type=int, error=error_base + 1, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
+        if cls.validate_value(dict_object=partitions, dict_key="ahead") is True:
+            cls.validate_value(dict_object=partitions, dict_key="ahead", check_type=int, error=error_base + 2, additional=RiLoggingConfigurationValidator.validator_additional_positive)
+
+    @classmethod
+    # validates the optional reload dictionary in the backend dictionary
+    def validate_logging_backend_reload(cls, reload: dict, error_base: int):
+        if cls.validate_value(dict_object=reload, dict_key="interval") is True:
+            if cls.validate_value(dict_object=reload, dict_key="interval", check_type=int, error=error_base + 1, additional=RiLoggingConfigurationValidator.validator_additional_positive) is True:
+                cls.validate_value(dict_object=reload, dict_key="interval", check_type=int, error=error_base + 1, additional=RiLoggingConfigurationValidator.validator_additional_not_empty)
 
     @classmethod
     # validates the frontend dictionary in the logging dictionary
@@ -234,6 +427,22 @@ class RiLoggingConfigurationValidator:
                     if cls.validate_value(dict_object=information, dict_key=list_type, check_type=list, additional=RiLoggingConfigurationValidator.validator_additional_not_empty) is True:
                         for selection_object in information.get(list_type):
                             cls.validate_logging_frontend_information_selection_object(selection_object=selection_object, object_type=list_type, information_index=informations.index(information), index=information.get(list_type).index(selection_object), error_base=(error_base + 6) * 10)
+        if cls.validate_value(dict_object=information, dict_key="rollup") is True:
+            if cls.validate_value(dict_object=information, dict_key="rollup", check_type=dict, error=error_base + 7, index=index) is True:
+                cls.validate_logging_frontend_information_rollup(rollup=information.get("rollup"), information=information, index=index, error_base=(error_base + 7) * 10)
+
+    @classmethod
+    # validates the optional rollup dictionary of the information dictionary, the distinct field must be a field of the information
+    def validate_logging_frontend_information_rollup(cls, rollup: dict, information: dict, index: int, error_base: int):
+        cls.validate_value(dict_object=rollup, dict_key="enabled", check_type=bool, error=error_base + 1, index=index)
+        if cls.validate_value(dict_object=rollup, dict_key="granularities") is True:
+            if cls.validate_value(dict_object=rollup, dict_key="granularities", check_type=list, error=error_base + 2, index=index, additional=RiLoggingConfigurationValidator.validator_additional_not_empty) is True:
+                if any(granularity not in RiLoggingRollups.granularities for granularity in rollup.get("granularities")):
+                    cls.errors.append({"error": error_base + 2, "placeholder": {"index": index}})
+        if cls.validate_value(dict_object=rollup, dict_key="distinct") is True:
+            field_names = [field.get("name") for field in information.get("fields", []) if type(field) is dict] if type(information.get("fields")) is list else []
+            if type(rollup.get("distinct")) is not str or rollup.get("distinct") not in field_names:
+                cls.errors.append({"error": error_base + 3, "placeholder": {"index": index}})
 
     @classmethod
     # validates the selection_target dictionary in ether header list or in the fields list of the information dictionary
@@ -2,6 +2,7 @@
 from microservice.lib.request_handler import RiLoggingRequestHandler
 from flask import Flask, Response, request
 from flask_cors import CORS
+import io
 import json
 import os
 import sys
@@ -40,6 +41,233 @@ def create_log():
     return response
 
 
+# saves a batch of logs, sent as JSON array or newline-delimited JSON, into specific database
+@logging_handler.route("/log/batch", methods=['POST'])
+def create_log_batch():
+    response_body = RiLoggingRequestHandler.create_log_batch(request_body=request.get_data(as_text=True))
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# respondes to options request in case the logging receiver is having different host than the sender
+@logging_handler.route("/log/batch", methods=['OPTIONS'])
+def request_options_batch():
+    response = Response(response=json.dumps(RiLoggingRequestHandler.get_response_default()), status=RiLoggingRequestHandler.response_status_ok, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+# returns the counters of the write-behind buffer
+@logging_handler.route("/log/buffer", methods=['GET'])
+def log_buffer():
+    response_body = RiLoggingRequestHandler.get_buffer_statistics()
+    response = Response(response=json.dumps(response_body), status=RiLoggingRequestHandler.response_status_ok, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# returns the metrics of this process in the prometheus text format
+@logging_handler.route("/metrics", methods=['GET'])
+def metrics():
+    response = Response(response=RiLoggingRequestHandler.get_metrics(), status=RiLoggingRequestHandler.response_status_ok, mimetype=RiLoggingRequestHandler.response_mimetype_metrics)
+    return response
+
+
+# streams all logs of the table/collection as JSON array or newline-delimited JSON, optionally filtered by time range and targets
+@logging_handler.route("/admin/<collection_name>/export", methods=['GET'])
+def export_collection(collection_name):
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body, chunks = RiLoggingRequestHandler.export_collection(collection_name=collection_name, arguments=request.args)
+    if chunks is None:
+        response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+        return Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+
+    response = Response(response=chunks, status=RiLoggingRequestHandler.response_status_ok, mimetype=response_body.get("mimetype"))
+    response.headers['Content-Disposition'] = 'attachment; filename="' + response_body.get("filename") + '"'
+    return response
+
+
+# removes all logs of the table/collection, the table is truncated or the collection dropped instead of deleting the logs one by one
+@logging_handler.route("/admin/<collection_name>/remove", methods=['DELETE'])
+def remove_collection(collection_name):
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization"), required=True) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.remove_collection(collection_name=collection_name)
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# bulk loads historical logs, sent as newline-delimited JSON or CSV, the body is read line by line while the rows are loaded
+@logging_handler.route("/admin/load", methods=['POST'])
+def bulk_load():
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization"), required=True) is False:
+        return get_response_unauthorized()
+
+    lines = io.TextIOWrapper(request.stream, encoding="utf-8", newline="")
+    response_body = RiLoggingRequestHandler.bulk_load(lines=lines, arguments=request.args, content_type=request.headers.get("Content-Type"))
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# reloads the configuration file while serving, an invalid file is reported and the active configuration stays in place
+@logging_handler.route("/admin/configuration/reload", methods=['POST'])
+def reload_configuration():
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization"), required=True) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.reload_configuration()
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# lists the NGINX access logs of the mounted log directory and up to which offset they were imported
+@logging_handler.route("/backend/log", methods=['GET'])
+def backend_logs():
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.get_backend_logs()
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# imports the lines of all NGINX access logs which were added since the last import
+@logging_handler.route("/backend/log", methods=['POST'])
+def backend_logs_import():
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.import_backend_logs()
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# returns the size of the NGINX access log and up to which offset it was imported
+@logging_handler.route("/backend/log/<filename>", methods=['GET'])
+def backend_log(filename):
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.get_backend_log(filename=filename)
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# imports the lines of the NGINX access log which were added since the last import
+@logging_handler.route("/backend/log/<filename>", methods=['POST'])
+def backend_log_import(filename):
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.import_backend_logs(filename=filename)
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# returns a page of the stored frontend logs, filtered by time range, targets and field values
+@logging_handler.route("/frontend/log", methods=['GET'])
+def frontend_log_query():
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.query_frontend_logs(arguments=request.args)
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# returns the pre-aggregated counts of the logs per target and per minute, hour or day, filtered by time range and targets
+@logging_handler.route("/frontend/rollup", methods=['GET'])
+def frontend_rollup():
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.query_rollups(arguments=request.args)
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# returns a page of the imported NGINX access logs, filtered by time range, request methods and field values
+@logging_handler.route("/backend/db/log", methods=['GET'])
+def backend_db_log_query():
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.query_backend_logs(arguments=request.args)
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# returns the number of changes (title, description, status) per project, optionally only of one user
+@logging_handler.route("/frontend/change", methods=['GET'])
+def frontend_change():
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.get_changes(project_id=None, arguments=request.args)
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# returns the number of changes (title, description, status) per requirement of the project, optionally only of one user
+@logging_handler.route("/frontend/change/<project_id>", methods=['GET'])
+def frontend_change_project(project_id):
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.get_changes(project_id=project_id, arguments=request.args)
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# counts the changes of all stored logs again and replaces the change counts with them
+@logging_handler.route("/admin/change/backfill", methods=['POST'])
+def backfill_changes():
+    if RiLoggingRequestHandler.is_authorized(request.headers.get("Authorization")) is False:
+        return get_response_unauthorized()
+
+    response_body = RiLoggingRequestHandler.backfill_changes()
+    response_code = RiLoggingRequestHandler.get_response_code(response_body=response_body)
+
+    response = Response(response=json.dumps(response_body), status=response_code, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    return response
+
+
+# answers requests of the administrative endpoints which are missing the bearer token
+def get_response_unauthorized():
+    response_body = RiLoggingRequestHandler.get_response_unauthorized()
+    response = Response(response=json.dumps(response_body), status=RiLoggingRequestHandler.get_response_code(response_body=response_body), mimetype=RiLoggingRequestHandler.response_mimetype_default)
+    response.headers['WWW-Authenticate'] = 'Bearer'
+    return response
+
+
 # respondes to options request in case the logging receiver is having different host than the sender
 @logging_handler.route("/log", methods=['OPTIONS'])
 def request_options():
@@ -48,11 +276,28 @@ def request_options():
     return response
 
 
-# returns the given frontend configuration which was used to start the server
-@logging_handler.route("/frontend_configuration", methods=["GET"])
-def frontend_configuration():
-    response = Response(response=json.dumps(RiLoggingRequestHandler.configuration.get("logging").get("frontend")), status=RiLoggingRequestHandler.response_status_ok, mimetype=RiLoggingRequestHandler.response_mimetype_default)
+# delivers the minified tracking script with the inlined frontend configuration, conditional requests are answered with 304
+@logging_handler.route("/frontend/script", methods=["GET"])
+def frontend_script():
+    cached_response = RiLoggingRequestHandler.get_frontend_script(version=request.args.get("version"))
+    if cached_response is None:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+        return Response(response=json.dumps(response_body), status=RiLoggingRequestHandler.get_response_code(response_body=response_body), mimetype=RiLoggingRequestHandler.response_mimetype_default)
+
+    return get_response_cached(cached_response)
+
+
+# answers the request from the cached bytes of the response
+def get_response_cached(cached_response):
+    status, body, headers = cached_response.get(if_none_match=request.headers.get("If-None-Match"), accept_encoding=request.headers.get("Accept-Encoding"))
+    response = Response(response=body, status=status, mimetype=cached_response.mimetype)
+    for name, value in headers.items():
+        response.headers[name] = value
     return response
 
 
-logging_handler.run(host=RiLoggingRequestHandler.configuration["logging"]["backend"]["server"]["host"], port=int(RiLoggingRequestHandler.configuration["logging"]["backend"]["server"]["port"]))
\ No newline at end of file
+# returns the given frontend configuration which was used to start the server, conditional requests are answered with 304
+@logging_handler.route("/frontend_configuration", methods=["GET"])
+def frontend_configuration():
+    return get_response_cached(RiLoggingRequestHandler.get_frontend_configuration())
@@ -0,0 +1,95 @@
+# dependencies
+from asgiref.wsgi import WsgiToAsgi
+from flask import Flask
+from microservice.lib.request_handler import RiLoggingRequestHandler
+from microservice.lib.request_handler_async import RiLoggingAsyncRequestHandler
+import json
+
+
+# asgi application, which serves the ingestion endpoints natively on the event loop and passes all other requests to flask
+class RiLoggingAsyncApplication:
+    # status of a request which body is larger than allowed
+    response_status_too_large: int = 413
+
+    # wraps the flask application and registers the natively served routes
+    def __init__(self, application: Flask, body_limit: int = None):
+        self.application = WsgiToAsgi(application)
+        self.body_limit = body_limit
+        self.routes = {
+            ("POST", "/log"): self.create_log,
+            ("POST", "/log/batch"): self.create_log_batch
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope.get("type") == "lifespan":
+            await self.lifespan(receive, send)
+            return
+
+        if scope.get("type") == "http":
+            route = self.routes.get((scope.get("method"), scope.get("path")))
+            if route is not None:
+                await route(receive, send)
+                return
+
+        await self.application(scope, receive, send)
+
+    # opens the non-blocking connections on startup of the worker and closes them on shutdown
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message.get("type") == "lifespan.startup":
+                await RiLoggingAsyncRequestHandler.create_connections()
+                await send({"type": "lifespan.startup.complete"})
+            elif message.get("type") == "lifespan.shutdown":
+                await RiLoggingAsyncRequestHandler.close_connections()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # reads the whole body of the request, returns None if the body exceeds the limit
+    async def read_body(self, receive):
+        body = b""
+        more_body = True
+        while more_body is True:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if self.body_limit is not None and len(body) > self.body_limit:
+                return None
+
+        return body
+
+    # sends the response body as json, allowing cross origin requests like the flask endpoints do
+    async def respond(self, send, response_body: dict, response_code: int):
+        await send({
+            "type": "http.response.start",
+            "status": response_code,
+            "headers": [
+                (b"content-type", RiLoggingRequestHandler.response_mimetype_default.encode()),
+                (b"access-control-allow-origin", b"*")
+            ]
+        })
+        await send({"type": "http.response.body", "body": json.dumps(response_body).encode()})
+
+    # saves the log into specific database
+    async def create_log(self, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            await self.respond(send, {RiLoggingRequestHandler.response_key_message: RiLoggingRequestHandler.response_message_error}, RiLoggingAsyncApplication.response_status_too_large)
+            return
+
+        try:
+            request_json = json.loads(body)
+        except ValueError:
+            request_json = None
+        response_body = await RiLoggingAsyncRequestHandler.create_log(request_json=request_json)
+        await self.respond(send, response_body, RiLoggingRequestHandler.get_response_code(response_body=response_body))
+
+    # saves a batch of logs, sent as JSON array or newline-delimited JSON, into specific database
+    async def create_log_batch(self, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            await self.respond(send, {RiLoggingRequestHandler.response_key_message: RiLoggingRequestHandler.response_message_error}, RiLoggingAsyncApplication.response_status_too_large)
+            return
+
+        response_body = await RiLoggingAsyncRequestHandler.create_log_batch(request_body=body.decode("utf-8", errors="replace"))
+        await self.respond(send, response_body, RiLoggingRequestHandler.get_response_code(response_body=response_body))
@@ -0,0 +1,133 @@
+# dependencies
+import datetime
+import math
+from microservice.lib.mysql_query_generator import RiLoggingMySqlQueryCreator
+
+
+# validator and converter of the logs of one information, compiled once from the configuration
+# every field is resolved into a converter of its datatype up front, so a log is converted by walking a flat list of (name, converter)
+# the converted log holds only the configured fields with the column types and sizes of the table, in mysql and mongodb alike
+class RiLoggingEventConverter:
+    # enum values for possible errors of a field
+    error_missing: str = "missing"
+    error_datatype: str = "datatype"
+    error_range: str = "range"
+    error_format: str = "format"
+    # format of the timestamps written by the frontend logger and stored in the database
+    timestamp_format: str = "%Y-%m-%d %H:%M:%S"
+    # range of the INT column
+    integer_min: int = -2147483648
+    integer_max: int = 2147483647
+
+    # compiles the converters of the fields of the information
+    def __init__(self, information: dict):
+        self.target_name = information.get("target_name")
+        self.timestamp_name = information.get("timestamp_name")
+        self.accessors = [
+            (self.target_name, RiLoggingEventConverter.create_converter_target()),
+            (self.timestamp_name, RiLoggingEventConverter.convert_timestamp)
+        ]
+        for field in information.get("fields", []):
+            datatype = field.get("datatype") if field.get("datatype") is not None else "string"
+            self.accessors.append((field.get("name"), RiLoggingEventConverter.create_converter(datatype)))
+
+    # converts the log into the stored document, returns the document and None or None and the errors of the invalid fields
+    def convert(self, request: dict) -> tuple:
+        document = {}
+        errors = None
+        for name, convert in self.accessors:
+            value, error = convert(request.get(name))
+            if error is not None:
+                if errors is None:
+                    errors = []
+                errors.append({"field": name, "error": error})
+            else:
+                document.__setitem__(name, value)
+        if errors is not None:
+            return None, errors
+
+        return document, None
+
+    @staticmethod
+    # returns the converter of the datatype, missing values and empty strings are stored as the default of the datatype
+    def create_converter(datatype: str):
+        size_string = int(RiLoggingMySqlQueryCreator.sizes.get("string"))
+        digits, decimals = [int(size) for size in RiLoggingMySqlQueryCreator.sizes.get("float")]
+        float_max = 10.0 ** (digits - decimals)
+
+        def convert_string(value) -> tuple:
+            if value is None:
+                return "", None
+            if type(value) is str:
+                return value[:size_string], None
+            if type(value) in [int, float]:
+                return str(value)[:size_string], None
+            return None, RiLoggingEventConverter.error_datatype
+
+        def convert_integer(value) -> tuple:
+            if value is None or value == "":
+                return 0, None
+            if type(value) is bool or type(value) not in [int, float, str]:
+                return None, RiLoggingEventConverter.error_datatype
+            # floats are only accepted without fraction, instead of truncating them silently
+            if type(value) is float and value.is_integer() is False:
+                return None, RiLoggingEventConverter.error_datatype
+            try:
+                value = int(value)
+            except (ValueError, OverflowError):
+                return None, RiLoggingEventConverter.error_datatype
+            if value < RiLoggingEventConverter.integer_min or value > RiLoggingEventConverter.integer_max:
+                return None, RiLoggingEventConverter.error_range
+            return value, None
+
+        def convert_float(value) -> tuple:
+            if value is None or value == "":
+                return 0.0, None
+            if type(value) is bool or type(value) not in [int, float, str]:
+                return None, RiLoggingEventConverter.error_datatype
+            try:
+                value = float(value)
+            except ValueError:
+                return None, RiLoggingEventConverter.error_datatype
+            if math.isfinite(value) is False or abs(value) >= float_max:
+                return None, RiLoggingEventConverter.error_range
+            return round(value, decimals), None
+
+        converters = {
+            "string": convert_string,
+            "integer": convert_integer,
+            "float": convert_float
+        }
+
+        return converters.get(datatype, convert_string)
+
+    @staticmethod
+    # returns the converter of the target, which is a string by routing and only truncated to the column size
+    def create_converter_target():
+        size_string = int(RiLoggingMySqlQueryCreator.sizes.get("string"))
+
+        def convert_target(value) -> tuple:
+            if type(value) is not str:
+                return None, RiLoggingEventConverter.error_datatype
+            return value[:size_string], None
+
+        return convert_target
+
+    @staticmethod
+    # normalizes the timestamp (ISO 8601 date and time, offsets are converted into UTC) into the format of the frontend logger
+    def convert_timestamp(value) -> tuple:
+        if value is None:
+            return None, RiLoggingEventConverter.error_missing
+        if type(value) is not str:
+            return None, RiLoggingEventConverter.error_datatype
+        try:
+            moment = datetime.datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+        except ValueError:
+            return None, RiLoggingEventConverter.error_format
+        # the frontend logger already sends the stored format, which is kept as it is
+        if len(value) == 19 and value[10] == " ":
+            return value, None
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+        return moment.strftime(RiLoggingEventConverter.timestamp_format), None
@@ -0,0 +1,92 @@
+# dependencies
+import datetime
+import decimal
+import json
+from microservice.lib.event_converter import RiLoggingEventConverter
+from microservice.lib.export_columnar import RiLoggingColumnarExport
+
+
+# streams the logs of one table/collection batch by batch, so the memory stays flat regardless of the size of the collection
+class RiLoggingExport:
+    # enum values for possible formats of the export
+    format_ndjson: str = "ndjson"
+    format_json: str = "json"
+    # mime-types of the formats
+    mimetypes: dict = {
+        "ndjson": "application/x-ndjson",
+        "json": "application/json"
+    }
+    # amount of rows which are read from the database and written into the response at once
+    batch_default: int = 1000
+    # format of the timestamps written by the frontend logger
+    timestamp_format: str = "%Y-%m-%d %H:%M:%S"
+
+    @staticmethod
+    # normalizes a timestamp given as query parameter (ISO 8601 date or date and time) into the format of the stored timestamps, returns None if invalid
+    # a timestamp with an offset is converted into UTC like the timestamps of the logs
+    def parse_timestamp(value: str):
+        return RiLoggingEventConverter.convert_timestamp(value.strip())[0]
+
+    @staticmethod
+    # reads the filters of the export from the query parameters, returns None if a filter is invalid
+    def create_filters(arguments: dict) -> dict:
+        filters = {
+            "format": arguments.get("format", RiLoggingExport.format_json),
+            "time_from": None,
+            "time_to": None,
+            "targets": None
+        }
+        if filters.get("format") not in RiLoggingExport.mimetypes and filters.get("format") not in RiLoggingColumnarExport.compressions:
+            return None
+        # the columnar formats are compressed internally and written in row groups
+        if filters.get("format") in RiLoggingColumnarExport.compressions:
+            filters.__setitem__("compression", arguments.get("compression", RiLoggingColumnarExport.compressions.get(filters.get("format"))[0]))
+            if filters.get("compression") not in RiLoggingColumnarExport.compressions.get(filters.get("format")):
+                return None
+            try:
+                filters.__setitem__("row_group", int(arguments.get("row_group", RiLoggingColumnarExport.row_group_default)))
+            except ValueError:
+                return None
+            if filters.get("row_group") <= 0:
+                return None
+        for key, argument in [("time_from", "from"), ("time_to", "to")]:
+            if arguments.get(argument) is not None:
+                filters.__setitem__(key, RiLoggingExport.parse_timestamp(arguments.get(argument)))
+                if filters.get(key) is None:
+                    return None
+        if arguments.get("target") is not None:
+            filters.__setitem__("targets", [target for target in arguments.get("target").split(",") if len(target) > 0])
+
+        return filters
+
+    @staticmethod
+    # converts the values which json can't serialize, like DATETIME and DECIMAL columns or the ObjectId of mongodb
+    def serialize_value(value):
+        if type(value) is datetime.datetime:
+            return value.strftime(RiLoggingExport.timestamp_format)
+        if type(value) is decimal.Decimal:
+            return float(value)
+
+        return str(value)
+
+    @staticmethod
+    def is_columnar(filters: dict) -> bool:
+        return filters.get("format") in RiLoggingColumnarExport.compressions
+
+    @staticmethod
+    # encodes the batches into chunks of the response, one chunk per batch
+    def encode(stream, export_format: str):
+        encoder = json.JSONEncoder(default=RiLoggingExport.serialize_value)
+        try:
+            if export_format == RiLoggingExport.format_ndjson:
+                for rows in stream:
+                    yield "".join(encoder.encode(row) + "\n" for row in rows)
+            else:
+                separator = "["
+                for rows in stream:
+                    yield separator + ",".join(encoder.encode(row) for row in rows)
+                    separator = ","
+                yield "[]" if separator == "[" else "]"
+        finally:
+            # releases the cursor right away if the client aborted the download
+            stream.close()
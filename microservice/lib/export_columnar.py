@@ -0,0 +1,173 @@
+# dependencies
+import datetime
+import os
+import shutil
+import tarfile
+import tempfile
+from microservice.lib.mysql_query_generator import RiLoggingMySqlQueryCreator
+from microservice.lib.routing import RiLoggingRoute
+
+
+# writes the logs of one table/collection into columnar files (parquet or arrow ipc), partitioned by the day of the timestamp
+# the files are written into a temporary directory and streamed as tar archive in the hive layout <collection>/day=YYYY-MM-DD/part-N.<format>
+class RiLoggingColumnarExport:
+    # enum values for possible formats of the columnar export
+    format_parquet: str = "parquet"
+    format_arrow: str = "arrow"
+    # enum values for possible compressions per format, the first one is the default
+    compressions: dict = {
+        "parquet": ["zstd", "snappy", "gzip", "none"],
+        "arrow": ["zstd", "lz4", "none"]
+    }
+    # mime-type of the streamed archive
+    mimetype: str = "application/x-tar"
+    # amount of rows per file and row group (parquet) or record batch (arrow)
+    row_group_default: int = 65536
+    # maximum amount of rows held in memory over all days, if reached all days are written as (smaller) files
+    buffer_limit: int = 524288
+    # amount of rows which are read from the database at once
+    batch_default: int = 10000
+    # partition of the rows which timestamp can't be read
+    partition_default: str = "__HIVE_DEFAULT_PARTITION__"
+    # size of the chunks of the streamed archive
+    chunk_size: int = 1048576
+
+    @staticmethod
+    # returns the arrow schema of the route, the column types follow the datatypes of the configured fields
+    def create_schema(route: RiLoggingRoute):
+        import pyarrow
+        datatypes = {
+            "string": pyarrow.string(),
+            "integer": pyarrow.int64(),
+            "float": pyarrow.float64()
+        }
+        columns = [
+            pyarrow.field(route.target_name, pyarrow.string()),
+            pyarrow.field(route.timestamp_name, pyarrow.timestamp("s"))
+        ]
+        for field_name, datatype in zip(route.field_names, route.datatypes):
+            columns.append(pyarrow.field(field_name, datatypes.get(datatype, pyarrow.string())))
+
+        return pyarrow.schema(columns)
+
+    @staticmethod
+    # reads the stored timestamp, which is a DATETIME column in mysql and the string of the frontend logger in mongodb
+    def convert_timestamp(value):
+        if type(value) is datetime.datetime:
+            return value
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    # returns the converter of every column, values which can't be converted are written as null
+    def create_converters(route: RiLoggingRoute) -> list:
+        def create_converter(convert):
+            def converter(value):
+                if value is None:
+                    return None
+                try:
+                    return convert(value)
+                except (TypeError, ValueError, ArithmeticError):
+                    return None
+            return converter
+
+        converters = [(route.target_name, lambda value: value if type(value) is str else None), (route.timestamp_name, RiLoggingColumnarExport.convert_timestamp)]
+        for field_name, datatype in zip(route.field_names, route.datatypes):
+            convert = RiLoggingMySqlQueryCreator.converters.get(datatype, RiLoggingMySqlQueryCreator.convert_string)
+            if datatype == "float":
+                # DECIMAL columns are read as decimal.Decimal from mysql
+                convert = (lambda convert_float: lambda value: convert_float(float(value)))(convert)
+            converters.append((field_name, create_converter(convert)))
+
+        return converters
+
+    @staticmethod
+    # writes the streamed row batches into the directory and yields the path of every file as soon as it is written
+    # the rows of a day are written as a file of their own whenever they are flushed (part-0, part-1, ...), so the archive is streamed while the logs are read
+    def write(stream, route: RiLoggingRoute, directory: str, export_format: str, compression: str, row_group: int):
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+        schema = RiLoggingColumnarExport.create_schema(route)
+        converters = RiLoggingColumnarExport.create_converters(route)
+        timestamp_index = 1
+        extension = "." + export_format
+        compression = None if compression == "none" else compression
+        parts = {}
+        buffers = {}
+        buffered = 0
+
+        def flush(day: str) -> str:
+            columns = buffers.pop(day)
+            path = os.path.join(route.collection, "day=" + day, "part-" + str(parts.get(day, 0)) + extension)
+            parts.__setitem__(day, parts.get(day, 0) + 1)
+            os.makedirs(os.path.dirname(os.path.join(directory, path)), exist_ok=True)
+            table = pyarrow.Table.from_arrays([pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema)
+            if export_format == RiLoggingColumnarExport.format_parquet:
+                pyarrow.parquet.write_table(table, os.path.join(directory, path), row_group_size=row_group, compression=compression or "none")
+            else:
+                with pyarrow.ipc.new_file(os.path.join(directory, path), schema, options=pyarrow.ipc.IpcWriteOptions(compression=compression)) as writer:
+                    writer.write_table(table, max_chunksize=row_group)
+
+            return path
+
+        try:
+            for rows in stream:
+                for row in rows:
+                    values = [convert(row.get(name)) for name, convert in converters]
+                    timestamp = values[timestamp_index]
+                    day = timestamp.date().isoformat() if timestamp is not None else RiLoggingColumnarExport.partition_default
+                    columns = buffers.get(day)
+                    if columns is None:
+                        columns = [[] for _ in converters]
+                        buffers.__setitem__(day, columns)
+                    for column, value in zip(columns, values):
+                        column.append(value)
+                    buffered += 1
+                    if len(columns[0]) >= row_group:
+                        buffered -= len(columns[0])
+                        yield flush(day)
+                if buffered >= RiLoggingColumnarExport.buffer_limit:
+                    for day in sorted(buffers.keys()):
+                        yield flush(day)
+                    buffered = 0
+            for day in sorted(buffers.keys()):
+                yield flush(day)
+        finally:
+            stream.close()
+
+    @staticmethod
+    # streams the files of the export as uncompressed tar archive while they are written into a temporary directory, the files are already compressed internally
+    # every file is removed once it is streamed, so the directory holds at most one file
+    def encode(stream, route: RiLoggingRoute, export_format: str, compression: str, row_group: int):
+        directory = tempfile.mkdtemp(prefix="rilogging-export-")
+        paths = RiLoggingColumnarExport.write(stream, route, directory, export_format, compression, row_group)
+        try:
+            written = 0
+            for path in paths:
+                full_path = os.path.join(directory, path)
+                information = tarfile.TarInfo(name=path)
+                information.size = os.path.getsize(full_path)
+                information.mtime = int(os.path.getmtime(full_path))
+                header = information.tobuf(format=tarfile.PAX_FORMAT)
+                written += len(header)
+                yield header
+                with open(full_path, "rb") as file:
+                    chunk = file.read(RiLoggingColumnarExport.chunk_size)
+                    while len(chunk) > 0:
+                        written += len(chunk)
+                        yield chunk
+                        chunk = file.read(RiLoggingColumnarExport.chunk_size)
+                if written % tarfile.BLOCKSIZE != 0:
+                    padding = tarfile.BLOCKSIZE - written % tarfile.BLOCKSIZE
+                    written += padding
+                    yield b"\0" * padding
+                os.remove(full_path)
+            # two empty blocks end the archive, which is filled up to a full record like tarfile does
+            written += tarfile.BLOCKSIZE * 2
+            yield b"\0" * (tarfile.BLOCKSIZE * 2 + (tarfile.RECORDSIZE - written % tarfile.RECORDSIZE) % tarfile.RECORDSIZE)
+        finally:
+            paths.close()
+            shutil.rmtree(directory, ignore_errors=True)
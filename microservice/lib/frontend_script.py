@@ -0,0 +1,52 @@
+# dependencies
+import json
+import os
+from jsmin import jsmin
+from microservice.lib.cached_response import RiLoggingCachedResponse
+
+
+# tracking script of the frontend, built once from the logger and the frontend configuration and served from memory
+class RiLoggingFrontendScript:
+    # enum values for possible versions of the logger, es5 runs in every browser and is the default
+    version_es5: str = "es5"
+    version_es6: str = "es6"
+    # files of the logger per version
+    filenames: dict = {
+        "es5": "logger-es5.js",
+        "es6": "logger-es6.js"
+    }
+    directory: str = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "js")
+    # the script may be cached by the browser for an hour, afterwards it is revalidated with the ETag
+    cache_control: str = "public, max-age=3600"
+    # map of the version to the cached response, replaced as a whole when the script is rebuilt
+    responses: dict = {}
+
+    @staticmethod
+    # returns the logger of the version with the configuration inlined, so the page doesn't have to fetch the configuration
+    def create_source(version: str, frontend: dict) -> str:
+        with open(os.path.join(RiLoggingFrontendScript.directory, RiLoggingFrontendScript.filenames.get(version)), "r", encoding="utf-8") as file:
+            source = file.read()
+        # "</" is escaped so the configuration can't end an inline script tag
+        configuration = json.dumps(frontend, separators=(",", ":")).replace("</", "<\\/")
+
+        return source + "\n$(document).ready(function () {\n  RiLogging.start(" + configuration + ");\n});\n"
+
+    @classmethod
+    # minifies and compresses the script of every version, called on start and whenever the frontend configuration changes
+    def build(cls, frontend: dict, mimetype: str):
+        cls.responses = RiLoggingFrontendScript.compile(frontend, mimetype)
+
+    @staticmethod
+    # returns the cached responses of every version without touching the active ones
+    def compile(frontend: dict, mimetype: str) -> dict:
+        responses = {}
+        for version in RiLoggingFrontendScript.filenames.keys():
+            script = jsmin(RiLoggingFrontendScript.create_source(version, frontend)).encode("utf-8")
+            responses.__setitem__(version, RiLoggingCachedResponse(body=script, mimetype=mimetype, cache_control=RiLoggingFrontendScript.cache_control))
+
+        return responses
+
+    @classmethod
+    # returns the cached response of the version or None if the version doesn't exist or the script wasn't built
+    def get(cls, version: str):
+        return cls.responses.get(version)
@@ -12,6 +12,9 @@ class RiLoggingError:
 
         self.connection_adapter = "The connection adapter couldn't establish connection, please check the configuration"
         self.connection_mysql = "The connection to MySQL server couldn't be established, please check the configuration"
+        self.server_mode_dependencies = "The configured server mode requires packages which are not installed, please install 'gunicorn', for the 'asgi' mode also 'uvicorn' and 'asgiref' and for the 'async' mode additionally 'aiomysql' and 'motor'"
+        self.reload_restart = "The '[property]' property of the configuration was changed, the change is applied after a restart"
+        self.bulk_load_input = "The input file of the bulk load wasn't given or doesn't exist, please pass the location of a newline-delimited JSON (.ndjson, .json) or CSV (.csv) file"
 
         self.configuration_structure_connection = "The configuration should contain 'connection' property which is a dictionary"
 
@@ -19,24 +22,84 @@ class RiLoggingError:
         self.configuration_structure_connection_server_host = "The 'server' dictionary should contain 'host' property which is a string and not empty"
         self.configuration_structure_connection_server_port = "The 'server' dictionary should contain 'port' property which is a positive integer value"
         self.configuration_structure_connection_server_type = "The 'server' dictionary should contain 'type' property which is a string and not empty"
-        self.configuration_structure_connection_server_type_selection = "The 'server' dictionary should contain 'type' property which is a string and ether 'mysql' or 'mongodb'"
+        self.configuration_structure_connection_server_type_selection = "The 'server' dictionary should contain 'type' property which is a string and ether 'mysql', 'mongodb', 'file' or the type of a registered storage backend"
         self.configuration_structure_connection_server_database = "The 'server' dictionary should contain 'database' property which is a dictionary"
         self.configuration_structure_connection_server_database_name = "The 'database' dictionary should contain 'name' property which is a string and not empty"
         self.configuration_structure_connection_server_database_create_collection = "The 'database' dictionary should contain 'create_collection' property which is a bool"
         self.configuration_structure_connection_server_database_map = "The 'database' dictionary should contain 'map' property which is a list and not empty"
+        self.configuration_structure_connection_server_database_engine = "The 'database' dictionary contains optional 'engine' property which is not 'InnoDB' or 'MyISAM'"
         self.configuration_structure_connection_server_database_map_information = "The dictionary on index [index] in the 'map' list should have property 'information' which is a string and not empty."
         self.configuration_structure_connection_server_database_map_collection = "The dictionary on index [index] in the 'map' list should have property 'collection' which is a string and not empty"
+        self.configuration_structure_connection_server_database_map_partition = "The dictionary on index [index] in the 'map' list contains optional 'partition' property which is not 'day' or 'month'"
+        self.configuration_structure_connection_server_database_map_retention = "The dictionary on index [index] in the 'map' list contains optional 'retention' property which is not a positive integer value greater than zero"
+        self.configuration_structure_connection_server_pool = "The 'server' dictionary contains optional 'pool' property which is not a dictionary"
+        self.configuration_structure_connection_server_pool_min = "The 'pool' dictionary contains optional 'min' property which is not a positive integer value"
+        self.configuration_structure_connection_server_pool_max = "The 'pool' dictionary contains optional 'max' property which is not a positive integer value greater than zero"
+        self.configuration_structure_connection_server_directory = "The 'server' dictionary of the 'file' type should contain 'directory' property which is a string and not empty"
+        self.configuration_structure_connection_server_file = "The 'server' dictionary contains optional 'file' property which is not a dictionary"
+        self.configuration_structure_connection_server_file_format = "The 'file' dictionary contains optional 'format' property which is not ether 'ndjson' or 'parquet'"
+        self.configuration_structure_connection_server_file_compression = "The 'file' dictionary contains optional 'compression' property which isn't supported by the format ('gzip' or 'none' for 'ndjson', 'zstd', 'snappy', 'gzip' or 'none' for 'parquet')"
+        self.configuration_structure_connection_server_file_segment = "The 'file' dictionary contains optional 'segment' property which is not a positive integer value greater than zero"
+        self.configuration_structure_connection_server_file_rows = "The 'file' dictionary contains optional 'rows' property which is not a positive integer value greater than zero"
+        self.configuration_structure_connection_server_file_rotate = "The 'file' dictionary contains optional 'rotate' property which is not a positive integer value greater than zero"
 
         self.configuration_structure_connection_user = "The 'connection' dictionary should contain 'user' property which is a dictionary"
         self.configuration_structure_connection_user_name = "The 'user' dictionary should contain 'name' property which is a string and not empty"
         self.configuration_structure_connection_user_password = "The 'user' dictionary should contain 'password' property which is a string and not empty"
 
+        self.configuration_structure_connection_shards = "The 'connection' dictionary contains optional 'shards' property which is not a dictionary"
+        self.configuration_structure_connection_shards_key = "The 'shards' dictionary should contain 'key' property which is a string and not empty"
+        self.configuration_structure_connection_shards_key_field = "The 'key' property of the 'shards' dictionary is no field of any information, the logs are spread over the shards by their timestamp"
+        self.configuration_structure_connection_shards_servers = "The 'shards' dictionary should contain 'servers' property which is a list and not empty"
+        self.configuration_structure_connection_shards_servers_server = "The dictionary on index [index] in the 'servers' list should be a dictionary, whose optional 'host' and 'directory' properties are strings and not empty and whose optional 'port' property is a positive integer value"
+        self.configuration_structure_connection_shards_servers_distinct = "The server on index [index] in the 'servers' list has the same host and port or directory as another shard"
+        self.configuration_structure_connection_shards_replicas = "The 'shards' dictionary contains optional 'replicas' property which is not a positive integer value greater than zero"
+
         self.configuration_structure_logging = "The configuration should contain 'logging' property which is a dictionary"
 
         self.configuration_structure_logging_backend = "The 'logging' dictionary should contain 'backend' property which is a dictionary"
         self.configuration_structure_logging_backend_server = "The 'backend' dictionary should contain 'server' property which is a dictionary"
         self.configuration_structure_logging_backend_server_host = "The 'server' dictionary should contain 'host' property which is a string and not empty"
         self.configuration_structure_logging_backend_server_port = "The 'server' dictionary should contain 'port' property which is a positive integer value"
+        self.configuration_structure_logging_backend_server_mode = "The 'server' dictionary contains optional 'mode' property which is not ether 'development', 'prefork', 'asgi' or 'async'"
+        self.configuration_structure_logging_backend_server_workers = "The 'server' dictionary contains optional 'workers' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_server_threads = "The 'server' dictionary contains optional 'threads' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_server_keepalive = "The 'server' dictionary contains optional 'keepalive' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_server_body_limit = "The 'server' dictionary contains optional 'body_limit' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_buffer = "The 'backend' dictionary contains optional 'buffer' property which is not a dictionary"
+        self.configuration_structure_logging_backend_buffer_enabled = "The 'buffer' dictionary should contain 'enabled' property which is a bool"
+        self.configuration_structure_logging_backend_buffer_size = "The 'buffer' dictionary contains optional 'size' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_buffer_interval = "The 'buffer' dictionary contains optional 'interval' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_buffer_batch = "The 'buffer' dictionary contains optional 'batch' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_token = "The 'backend' dictionary contains optional 'token' property which is not a string or is empty"
+        self.configuration_structure_logging_backend_access_log = "The 'backend' dictionary contains optional 'access_log' property which is not a dictionary"
+        self.configuration_structure_logging_backend_access_log_directory = "The 'access_log' dictionary should contain 'directory' property which is a string and not empty"
+        self.configuration_structure_logging_backend_access_log_collection = "The 'access_log' dictionary contains optional 'collection' property which is not a string or is empty"
+        self.configuration_structure_logging_backend_access_log_prefix = "The 'access_log' dictionary contains optional 'prefix' property which is not a string or is empty"
+        self.configuration_structure_logging_backend_access_log_checkpoint = "The 'access_log' dictionary contains optional 'checkpoint' property which is not a string or is empty"
+        self.configuration_structure_logging_backend_access_log_batch = "The 'access_log' dictionary contains optional 'batch' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_access_log_interval = "The 'access_log' dictionary contains optional 'interval' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_reload = "The 'backend' dictionary contains optional 'reload' property which is not a dictionary"
+        self.configuration_structure_logging_backend_reload_interval = "The 'reload' dictionary contains optional 'interval' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_spool = "The 'backend' dictionary contains optional 'spool' property which is not a dictionary"
+        self.configuration_structure_logging_backend_spool_enabled = "The 'spool' dictionary should contain 'enabled' property which is a bool"
+        self.configuration_structure_logging_backend_spool_directory = "The 'spool' dictionary should contain 'directory' property which is a string and not empty"
+        self.configuration_structure_logging_backend_spool_segment = "The 'spool' dictionary contains optional 'segment' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_spool_sync = "The 'spool' dictionary contains optional 'sync' property which is not a positive integer value"
+        self.configuration_structure_logging_backend_spool_batch = "The 'spool' dictionary contains optional 'batch' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_spool_interval = "The 'spool' dictionary contains optional 'interval' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_changes = "The 'backend' dictionary contains optional 'changes' property which is not a dictionary"
+        self.configuration_structure_logging_backend_changes_enabled = "The 'changes' dictionary should contain 'enabled' property which is a bool"
+        self.configuration_structure_logging_backend_changes_information = "The 'changes' dictionary should contain 'information' property which is a not empty list of the ids of configured informations"
+        self.configuration_structure_logging_backend_changes_project = "The 'changes' dictionary should contain 'project' property which is the name of a field and not empty"
+        self.configuration_structure_logging_backend_changes_requirement = "The 'changes' dictionary should contain 'requirement' property which is the name of a field and not empty"
+        self.configuration_structure_logging_backend_changes_user = "The 'changes' dictionary contains optional 'user' property which is not the name of a field"
+        self.configuration_structure_logging_backend_changes_type = "The 'changes' dictionary contains optional 'type' property which is not the name of a field"
+        self.configuration_structure_logging_backend_changes_types = "The 'changes' dictionary contains optional 'types' property which is not a dictionary of the field values to 'title', 'description' or 'status'"
+        self.configuration_structure_logging_backend_changes_interval = "The 'changes' dictionary contains optional 'interval' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_partitions = "The 'backend' dictionary contains optional 'partitions' property which is not a dictionary"
+        self.configuration_structure_logging_backend_partitions_interval = "The 'partitions' dictionary contains optional 'interval' property which is not a positive integer value greater than zero"
+        self.configuration_structure_logging_backend_partitions_ahead = "The 'partitions' dictionary contains optional 'ahead' property which is not a positive integer value"
 
         self.configuration_structure_logging_frontend = "The 'logging' dictionary should contain 'frontend' property which is a dictionary"
         self.configuration_structure_logging_frontend_receiver = "The 'frontend' dictionary should contain 'receiver' property which is a string and not empty"
@@ -71,6 +134,10 @@ class RiLoggingError:
         self.configuration_structure_logging_frontend_information_timestamp_name = "The 'information' dictionary on position [index] should contain 'timestamp_name' property which is a string and not empty"
         self.configuration_structure_logging_frontend_information_header = "The 'information' dictionary on position [index] contains optional 'header' property which is not a list"
         self.configuration_structure_logging_frontend_information_fields = "The 'information' dictionary on position [index] contains optional 'fields' property which is not a list"
+        self.configuration_structure_logging_frontend_information_rollup = "The 'information' dictionary on position [index] contains optional 'rollup' property which is not a dictionary"
+        self.configuration_structure_logging_frontend_information_rollup_enabled = "The 'rollup' dictionary of the 'information' dictionary on position [index] should contain 'enabled' property which is a bool"
+        self.configuration_structure_logging_frontend_information_rollup_granularities = "The 'rollup' dictionary of the 'information' dictionary on position [index] contains optional 'granularities' property which is not a not empty list of 'minute', 'hour' and 'day'"
+        self.configuration_structure_logging_frontend_information_rollup_distinct = "The 'rollup' dictionary of the 'information' dictionary on position [index] contains optional 'distinct' property which is not the name of a field of the information"
 
         self.configuration_structure_logging_frontend_selection_object_name = "The 'selection_object' dictionary on position [index] in the '[object]' list of information on position [information_index] should contain 'name' property which is a string and not empty"
         self.configuration_structure_logging_frontend_selection_object_source = "The 'selection_object' dictionary on position [index] in the '[object]' list of information on position [information_index] should contain 'source' property which is a string and not empty"
@@ -97,6 +164,9 @@ class RiLoggingError:
             6: messages_object.configuration_type,
             7: messages_object.configuration_structure,
             8: messages_object.connection_adapter,
+            9: messages_object.server_mode_dependencies,
+            31: messages_object.reload_restart,
+            32: messages_object.bulk_load_input,
 
             10: messages_object.configuration_structure_connection,
             101: messages_object.configuration_structure_connection_server,
@@ -108,18 +178,78 @@ class RiLoggingError:
             10141: messages_object.configuration_structure_connection_server_database_name,
             10142: messages_object.configuration_structure_connection_server_database_create_collection,
             10143: messages_object.configuration_structure_connection_server_database_map,
+            10144: messages_object.configuration_structure_connection_server_database_engine,
             101431: messages_object.configuration_structure_connection_server_database_map_information,
             101432: messages_object.configuration_structure_connection_server_database_map_collection,
+            101433: messages_object.configuration_structure_connection_server_database_map_partition,
+            101434: messages_object.configuration_structure_connection_server_database_map_retention,
+            1015: messages_object.configuration_structure_connection_server_pool,
+            10151: messages_object.configuration_structure_connection_server_pool_min,
+            10152: messages_object.configuration_structure_connection_server_pool_max,
+            1016: messages_object.configuration_structure_connection_server_directory,
+            1017: messages_object.configuration_structure_connection_server_file,
+            10171: messages_object.configuration_structure_connection_server_file_format,
+            10172: messages_object.configuration_structure_connection_server_file_compression,
+            10173: messages_object.configuration_structure_connection_server_file_segment,
+            10174: messages_object.configuration_structure_connection_server_file_rows,
+            10175: messages_object.configuration_structure_connection_server_file_rotate,
 
             102: messages_object.configuration_structure_connection_user,
             1021: messages_object.configuration_structure_connection_user_name,
             1022: messages_object.configuration_structure_connection_user_password,
 
+            103: messages_object.configuration_structure_connection_shards,
+            1031: messages_object.configuration_structure_connection_shards_key,
+            10311: messages_object.configuration_structure_connection_shards_key_field,
+            1032: messages_object.configuration_structure_connection_shards_servers,
+            10321: messages_object.configuration_structure_connection_shards_servers_server,
+            10322: messages_object.configuration_structure_connection_shards_servers_distinct,
+            1033: messages_object.configuration_structure_connection_shards_replicas,
+
             20: messages_object.configuration_structure_logging,
             201: messages_object.configuration_structure_logging_backend,
             2011: messages_object.configuration_structure_logging_backend_server,
             20111: messages_object.configuration_structure_logging_backend_server_host,
             20112: messages_object.configuration_structure_logging_backend_server_port,
+            20113: messages_object.configuration_structure_logging_backend_server_mode,
+            20114: messages_object.configuration_structure_logging_backend_server_workers,
+            20115: messages_object.configuration_structure_logging_backend_server_threads,
+            20116: messages_object.configuration_structure_logging_backend_server_keepalive,
+            20117: messages_object.configuration_structure_logging_backend_server_body_limit,
+            2012: messages_object.configuration_structure_logging_backend_buffer,
+            20121: messages_object.configuration_structure_logging_backend_buffer_enabled,
+            20122: messages_object.configuration_structure_logging_backend_buffer_size,
+            20123: messages_object.configuration_structure_logging_backend_buffer_interval,
+            20124: messages_object.configuration_structure_logging_backend_buffer_batch,
+            2013: messages_object.configuration_structure_logging_backend_token,
+            2014: messages_object.configuration_structure_logging_backend_access_log,
+            20141: messages_object.configuration_structure_logging_backend_access_log_directory,
+            20142: messages_object.configuration_structure_logging_backend_access_log_collection,
+            20143: messages_object.configuration_structure_logging_backend_access_log_prefix,
+            20144: messages_object.configuration_structure_logging_backend_access_log_checkpoint,
+            20145: messages_object.configuration_structure_logging_backend_access_log_batch,
+            20146: messages_object.configuration_structure_logging_backend_access_log_interval,
+            2015: messages_object.configuration_structure_logging_backend_reload,
+            20151: messages_object.configuration_structure_logging_backend_reload_interval,
+            2016: messages_object.configuration_structure_logging_backend_spool,
+            20161: messages_object.configuration_structure_logging_backend_spool_enabled,
+            20162: messages_object.configuration_structure_logging_backend_spool_directory,
+            20163: messages_object.configuration_structure_logging_backend_spool_segment,
+            20164: messages_object.configuration_structure_logging_backend_spool_sync,
+            20165: messages_object.configuration_structure_logging_backend_spool_batch,
+            20166: messages_object.configuration_structure_logging_backend_spool_interval,
+            2017: messages_object.configuration_structure_logging_backend_changes,
+            20171: messages_object.configuration_structure_logging_backend_changes_enabled,
+            20172: messages_object.configuration_structure_logging_backend_changes_information,
+            20173: messages_object.configuration_structure_logging_backend_changes_project,
+            20174: messages_object.configuration_structure_logging_backend_changes_requirement,
+            20175: messages_object.configuration_structure_logging_backend_changes_user,
+            20176: messages_object.configuration_structure_logging_backend_changes_type,
+            20177: messages_object.configuration_structure_logging_backend_changes_types,
+            20178: messages_object.configuration_structure_logging_backend_changes_interval,
+            2018: messages_object.configuration_structure_logging_backend_partitions,
+            20181: messages_object.configuration_structure_logging_backend_partitions_interval,
+            20182: messages_object.configuration_structure_logging_backend_partitions_ahead,
 
             202: messages_object.configuration_structure_logging_frontend,
             2021: messages_object.configuration_structure_logging_frontend_receiver,
@@ -151,6 +281,10 @@ class RiLoggingError:
             20243: messages_object.configuration_structure_logging_frontend_information_timestamp_name,
             20244: messages_object.configuration_structure_logging_frontend_information_header,
             20245: messages_object.configuration_structure_logging_frontend_information_fields,
+            20247: messages_object.configuration_structure_logging_frontend_information_rollup,
+            202471: messages_object.configuration_structure_logging_frontend_information_rollup_enabled,
+            202472: messages_object.configuration_structure_logging_frontend_information_rollup_granularities,
+            202473: messages_object.configuration_structure_logging_frontend_information_rollup_distinct,
             202461: messages_object.configuration_structure_logging_frontend_selection_object_name,
             202462: messages_object.configuration_structure_logging_frontend_selection_object_source,
             202463: messages_object.configuration_structure_logging_frontend_selection_object_value,
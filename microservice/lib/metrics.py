@@ -0,0 +1,110 @@
+# dependencies
+import bisect
+import threading
+
+
+# process wide registry of counters, latency histograms and gauges, rendered in the prometheus text format
+class RiLoggingMetrics:
+    # upper bounds in seconds of the latency histogram buckets
+    buckets: tuple = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    # name of the counter of received events per target and information
+    metric_events: str = "rilogging_events_total"
+    # name of the counter of failed events per cause
+    metric_errors: str = "rilogging_errors_total"
+    # name of the histogram of the duration of every stage of the ingestion
+    metric_stage: str = "rilogging_stage_seconds"
+    # possible causes of failed events
+    cause_unrouted: str = "unrouted"
+    cause_invalid: str = "invalid"
+    cause_unavailable: str = "unavailable"
+    cause_database: str = "database"
+    # labels of the measured stages, created once to keep the instrumentation cheap
+    stage_create_log_route: tuple = (("function", "create_log"), ("stage", "route"))
+    stage_create_log_write: tuple = (("function", "create_log"), ("stage", "write"))
+    stage_create_log_mysql_query: tuple = (("function", "create_log_mysql"), ("stage", "query"))
+    stage_create_log_mysql_execute: tuple = (("function", "create_log_mysql"), ("stage", "execute"))
+    stage_create_log_mongodb_insert: tuple = (("function", "create_log_mongodb"), ("stage", "insert"))
+    stage_pool_connect: tuple = (("function", "pool"), ("stage", "connect"))
+    stage_pool_close: tuple = (("function", "pool"), ("stage", "close"))
+    stage_buffer_flush: tuple = (("function", "buffer"), ("stage", "flush"))
+    # description and type of every metric
+    descriptions: dict = {
+        "rilogging_events_total": ("Received events per target and information", "counter"),
+        "rilogging_errors_total": ("Events which could not be saved per cause", "counter"),
+        "rilogging_stage_seconds": ("Duration of the stages of the ingestion", "histogram")
+    }
+    # (name, labels) -> value
+    counters: dict = {}
+    # (name, labels) -> [count per bucket..., count above last bucket, sum, count]
+    histograms: dict = {}
+    # name -> function returning a list of (labels, value), evaluated on rendering
+    gauges: dict = {}
+    lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    # increases the counter with the given labels, labels are a tuple of (name, value) tuples
+    def count(cls, name: str, labels: tuple = (), value=1):
+        key = (name, labels)
+        with cls.lock:
+            cls.counters[key] = cls.counters.get(key, 0) + value
+
+    @classmethod
+    # records one observed duration in the histogram with the given labels
+    def observe(cls, name: str, seconds: float, labels: tuple = ()):
+        key = (name, labels)
+        bucket = bisect.bisect_left(cls.buckets, seconds)
+        with cls.lock:
+            histogram = cls.histograms.get(key)
+            if histogram is None:
+                histogram = [0] * (len(cls.buckets) + 1) + [0.0, 0]
+                cls.histograms[key] = histogram
+            histogram[bucket] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+
+    @classmethod
+    # registers a gauge, which values are collected only when the metrics are rendered
+    def register_gauge(cls, name: str, description: str, collect):
+        cls.descriptions.__setitem__(name, (description, "gauge"))
+        cls.gauges.__setitem__(name, collect)
+
+    @staticmethod
+    def format_labels(labels: tuple, additional: tuple = ()) -> str:
+        labels = labels + additional
+        if len(labels) == 0:
+            return ""
+
+        return "{" + ",".join(name + "=\"" + str(value).replace("\\", "\\\\").replace("\"", "\\\"") + "\"" for name, value in labels) + "}"
+
+    @classmethod
+    # renders all metrics in the prometheus text exposition format
+    def render(cls) -> str:
+        with cls.lock:
+            counters = dict(cls.counters)
+            histograms = {key: list(value) for key, value in cls.histograms.items()}
+
+        samples = {}
+        for (name, labels), value in counters.items():
+            samples.setdefault(name, []).append(name + cls.format_labels(labels) + " " + str(value))
+        for (name, labels), histogram in histograms.items():
+            lines = samples.setdefault(name, [])
+            cumulative = 0
+            for index, bound in enumerate(cls.buckets):
+                cumulative += histogram[index]
+                lines.append(name + "_bucket" + cls.format_labels(labels, (("le", bound),)) + " " + str(cumulative))
+            lines.append(name + "_bucket" + cls.format_labels(labels, (("le", "+Inf"),)) + " " + str(histogram[-1]))
+            lines.append(name + "_sum" + cls.format_labels(labels) + " " + str(histogram[-2]))
+            lines.append(name + "_count" + cls.format_labels(labels) + " " + str(histogram[-1]))
+        for name, collect in cls.gauges.items():
+            lines = samples.setdefault(name, [])
+            for labels, value in collect():
+                lines.append(name + cls.format_labels(labels) + " " + str(value))
+
+        output = []
+        for name in sorted(samples.keys()):
+            description, metric_type = cls.descriptions.get(name, ("", "untyped"))
+            output.append("# HELP " + name + " " + description)
+            output.append("# TYPE " + name + " " + metric_type)
+            output.extend(samples.get(name))
+
+        return "\n".join(output) + "\n"
@@ -10,6 +10,24 @@ class RiLoggingMySqlQueryCreator:
         "integer": "INT",
         "float": "DECIMAL"
     }
+    # converters of the supported datatypes into parameter values
+    converters: dict = {}
+    # cache of the parameterized INSERT statements per table
+    statements: dict = {}
+    # names of the secondary indexes, which serve time range queries over all targets and over one target
+    index_timestamp: str = "index_timestamp"
+    index_target_timestamp: str = "index_target_timestamp"
+    # table of the sequence numbers up to which the on-disk spools were replayed
+    spool_table: str = "rilogging_spool"
+    # table of the change counts per project, requirement, user and change type
+    changes_table: str = "rilogging_changes"
+    # name of the last partition of partitioned tables, which takes the rows beyond the upper bounds of the other partitions
+    partition_catch_all: str = "pmax"
+    # rows which are deleted at once from tables without partitions
+    delete_limit: int = 10000
+    # enum values for possible storage engines of the tables of the logs, MyISAM is the default of tables without partitions
+    engines: list = ["InnoDB", "MyISAM"]
+    engine_default: str = "MyISAM"
 
     @staticmethod
     def table_exists(table_name: str):
@@ -17,7 +35,9 @@ class RiLoggingMySqlQueryCreator:
         return sql
 
     @staticmethod
-    def create_table(table_name: str, target_name, timestamp_name, fields: list) -> str:
+    # with partitions (name, upper bound) the table is split into RANGE partitions on the timestamp followed by the catch-all partition
+    # the timestamp has to be part of the primary key then, and the table is InnoDB regardless of the engine since mysql partitions no MyISAM tables
+    def create_table(table_name: str, target_name, timestamp_name, fields: list, partitions: list = None, engine: str = None) -> str:
         sql = "CREATE TABLE IF NOT EXISTS " + table_name + " ("
         sql += "id INT(" + RiLoggingMySqlQueryCreator.sizes.get("integer") + ") NOT NULL AUTO_INCREMENT,"
         sql += target_name + " VARCHAR(" + RiLoggingMySqlQueryCreator.sizes.get("string") + ") NOT NULL,"
@@ -33,11 +53,168 @@ class RiLoggingMySqlQueryCreator:
                     datatype = ",".join(datatype)
                 sql += "(" + datatype + ")"
             sql += " NOT NULL,"
-        sql += "PRIMARY KEY (id)"
-        sql += ") ENGINE=MyISAM DEFAULT CHARSET=utf8 DEFAULT COLLATE utf8_general_ci;"
+        sql += "PRIMARY KEY (id)," if partitions is None else "PRIMARY KEY (id, " + timestamp_name + "),"
+        sql += ",".join(["INDEX " + index_name + " (" + ", ".join(index_columns) + ")" for index_name, index_columns in RiLoggingMySqlQueryCreator.get_indexes(target_name, timestamp_name)])
+        if partitions is None:
+            sql += ") ENGINE=" + (engine or RiLoggingMySqlQueryCreator.engine_default) + " DEFAULT CHARSET=utf8 DEFAULT COLLATE utf8_general_ci;"
+        else:
+            sql += ") ENGINE=InnoDB DEFAULT CHARSET=utf8 DEFAULT COLLATE utf8_general_ci"
+            sql += " PARTITION BY RANGE COLUMNS(" + timestamp_name + ") (" + RiLoggingMySqlQueryCreator.create_partitions(partitions) + ");"
 
         return sql
 
+    @staticmethod
+    # returns the definitions of the partitions (name, upper bound) followed by the catch-all partition
+    def create_partitions(partitions: list) -> str:
+        definitions = ["PARTITION " + name + " VALUES LESS THAN ('" + bound + "')" for name, bound in partitions]
+        definitions.append("PARTITION " + RiLoggingMySqlQueryCreator.partition_catch_all + " VALUES LESS THAN (MAXVALUE)")
+
+        return ", ".join(definitions)
+
+    @staticmethod
+    # returns the query of the partitions of the table in their order, the description is the quoted upper bound or MAXVALUE
+    def select_partitions() -> str:
+        return "SELECT PARTITION_NAME AS name, PARTITION_DESCRIPTION AS description FROM information_schema.PARTITIONS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION;"
+
+    @staticmethod
+    # splits the empty catch-all partition into the new partitions and the catch-all partition, which only moves logs with timestamps far ahead
+    def add_partitions(table_name: str, partitions: list) -> str:
+        return "ALTER TABLE " + table_name + " REORGANIZE PARTITION " + RiLoggingMySqlQueryCreator.partition_catch_all + " INTO (" + RiLoggingMySqlQueryCreator.create_partitions(partitions) + ");"
+
+    @staticmethod
+    def drop_partitions(table_name: str, names: list) -> str:
+        return "ALTER TABLE " + table_name + " DROP PARTITION " + ", ".join(names) + ";"
+
+    @staticmethod
+    # deletes a limited amount of expired rows with the timestamp index, so the table isn't locked for long by one statement
+    def delete_expired(table_name: str, timestamp_name: str, limit: int) -> str:
+        return "DELETE FROM " + table_name + " WHERE " + timestamp_name + " < %s ORDER BY " + timestamp_name + " LIMIT " + str(int(limit)) + ";"
+
+    @staticmethod
+    # loads the tab separated file of the client into the columns of the table, backslashes, tabs and line breaks of the values are escaped
+    def load_file(table_name: str, columns: tuple) -> str:
+        return "LOAD DATA LOCAL INFILE %s INTO TABLE " + table_name + " CHARACTER SET utf8 FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' (" + ", ".join(columns) + ");"
+
+    @staticmethod
+    # returns the line of the tab separated file of the values of a row
+    def create_file_line(values: tuple) -> str:
+        return "\t".join(value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r") if type(value) is str else "\\N" if value is None else str(value) for value in values) + "\n"
+
+    @staticmethod
+    def count_rows(table_name: str) -> str:
+        return "SELECT COUNT(*) AS count FROM " + table_name + ";"
+
+    @staticmethod
+    # truncating drops and creates the table (and its partitions) again instead of deleting the rows one by one
+    def truncate_table(table_name: str) -> str:
+        return "TRUNCATE TABLE " + table_name + ";"
+
+    @staticmethod
+    # returns the secondary indexes of a table, the id ends every index so the keyset pagination (timestamp, id) is read from the index
+    def get_indexes(target_name: str, timestamp_name: str) -> list:
+        return [
+            (RiLoggingMySqlQueryCreator.index_timestamp, [timestamp_name, "id"]),
+            (RiLoggingMySqlQueryCreator.index_target_timestamp, [target_name, timestamp_name, "id"])
+        ]
+
+    @staticmethod
+    # the table is transactional, so the sequence number is stored together with the replayed rows
+    # rows of MyISAM tables are written even if the transaction fails, a crash in between repeats at most one replayed batch
+    def create_spool_table() -> str:
+        return "CREATE TABLE IF NOT EXISTS " + RiLoggingMySqlQueryCreator.spool_table + " (spool VARCHAR(32) NOT NULL, sequence_number BIGINT NOT NULL, PRIMARY KEY (spool)) ENGINE=InnoDB;"
+
+    @staticmethod
+    def get_spool_sequence() -> str:
+        return "SELECT sequence_number FROM " + RiLoggingMySqlQueryCreator.spool_table + " WHERE spool = %s;"
+
+    @staticmethod
+    def set_spool_sequence() -> str:
+        return "INSERT INTO " + RiLoggingMySqlQueryCreator.spool_table + " (spool, sequence_number) VALUES (%s, %s) ON DUPLICATE KEY UPDATE sequence_number = VALUES(sequence_number);"
+
+    @staticmethod
+    # the primary key serves the sums per project and per requirement of a project, the table stays small as it has one row per counter
+    def create_changes_table() -> str:
+        sql = "CREATE TABLE IF NOT EXISTS " + RiLoggingMySqlQueryCreator.changes_table + " ("
+        sql += "project_id VARCHAR(128) NOT NULL, requirement_id VARCHAR(128) NOT NULL, username VARCHAR(128) NOT NULL, change_type VARCHAR(32) NOT NULL, change_count BIGINT NOT NULL,"
+        sql += " PRIMARY KEY (project_id, requirement_id, username, change_type)) ENGINE=InnoDB;"
+        return sql
+
+    @staticmethod
+    def increment_changes() -> str:
+        return "INSERT INTO " + RiLoggingMySqlQueryCreator.changes_table + " (project_id, requirement_id, username, change_type, change_count) VALUES (%s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE change_count = change_count + VALUES(change_count);"
+
+    @staticmethod
+    def delete_changes() -> str:
+        return "DELETE FROM " + RiLoggingMySqlQueryCreator.changes_table + ";"
+
+    @staticmethod
+    # returns the query of the changes summed up per project or per requirement of the project, optionally only of one user
+    def select_changes(project: str, user: str) -> tuple:
+        id_name = "project_id" if project is None else "requirement_id"
+        conditions = []
+        parameters = []
+        if project is not None:
+            conditions.append("project_id = %s")
+            parameters.append(project)
+        if user is not None:
+            conditions.append("username = %s")
+            parameters.append(user)
+        sql = "SELECT " + id_name + " AS id, change_type, SUM(change_count) AS change_count FROM " + RiLoggingMySqlQueryCreator.changes_table
+        if len(conditions) > 0:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " GROUP BY " + id_name + ", change_type;"
+        return sql, tuple(parameters)
+
+    @staticmethod
+    # returns the names of the companion tables of the rollups (counts, registers of the distinct users) of a table
+    def get_rollup_tables(table_name: str) -> tuple:
+        return table_name + "_rollup", table_name + "_rollup_distinct"
+
+    @staticmethod
+    # the primary keys serve the time range queries of one granularity, the registers of the distinct users are stored sparsely
+    def create_rollup_tables(table_name: str) -> list:
+        table_rollup, table_distinct = RiLoggingMySqlQueryCreator.get_rollup_tables(table_name)
+        target_size = RiLoggingMySqlQueryCreator.sizes.get("string")
+        return [
+            "CREATE TABLE IF NOT EXISTS " + table_rollup + " (granularity VARCHAR(8) NOT NULL, bucket DATETIME NOT NULL, target VARCHAR(" + target_size + ") NOT NULL, logs BIGINT NOT NULL, PRIMARY KEY (granularity, bucket, target)) ENGINE=InnoDB;",
+            "CREATE TABLE IF NOT EXISTS " + table_distinct + " (granularity VARCHAR(8) NOT NULL, bucket DATETIME NOT NULL, target VARCHAR(" + target_size + ") NOT NULL, register_index SMALLINT NOT NULL, register_rank TINYINT NOT NULL, PRIMARY KEY (granularity, bucket, target, register_index)) ENGINE=InnoDB;"
+        ]
+
+    @staticmethod
+    def increment_rollup(table_name: str) -> str:
+        return "INSERT INTO " + RiLoggingMySqlQueryCreator.get_rollup_tables(table_name)[0] + " (granularity, bucket, target, logs) VALUES (%s, %s, %s, %s) ON DUPLICATE KEY UPDATE logs = logs + VALUES(logs);"
+
+    @staticmethod
+    # the registers of the processes are merged by their maximum, so they are added without reading them first
+    def merge_rollup_distinct(table_name: str) -> str:
+        return "INSERT INTO " + RiLoggingMySqlQueryCreator.get_rollup_tables(table_name)[1] + " (granularity, bucket, target, register_index, register_rank) VALUES (%s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE register_rank = GREATEST(register_rank, VALUES(register_rank));"
+
+    @staticmethod
+    # returns the query of the rollups of one granularity within the time range [time_from, time_to) and of the given targets
+    def select_rollup(table_name: str, columns: str, granularity: str, time_from: str, time_to: str, targets: list) -> tuple:
+        sql = "SELECT " + columns + " FROM " + table_name + " WHERE granularity = %s"
+        parameters = [granularity]
+        if time_from is not None:
+            sql += " AND bucket >= %s"
+            parameters.append(time_from)
+        if time_to is not None:
+            sql += " AND bucket < %s"
+            parameters.append(time_to)
+        if targets is not None and len(targets) > 0:
+            sql += " AND target IN (" + ", ".join(["%s"] * len(targets)) + ")"
+            parameters.extend(targets)
+        sql += ";"
+        return sql, tuple(parameters)
+
+    @staticmethod
+    def show_indexes(table_name: str) -> str:
+        return "SHOW INDEX FROM " + table_name + ";"
+
+    @staticmethod
+    # adds a secondary index to a table, which was created before the indexes were part of the schema
+    def create_index(table_name: str, index_name: str, index_columns: list) -> str:
+        return "ALTER TABLE " + table_name + " ADD INDEX " + index_name + " (" + ", ".join(index_columns) + ");"
+
     @staticmethod
     def create_insert_query(table_name: str, field_name_target: str, field_name_timestamp: str, fields: list, values: dict) -> str:
         query = "INSERT INTO " + table_name + "("
@@ -61,22 +238,87 @@ class RiLoggingMySqlQueryCreator:
 
     @staticmethod
     def format_value(value, datatype: str):
-        if datatype == "integer":
-            if type(value) is str and value == "" or value is None:
-                value = 0
-            else:
-                value = int(value)
-        if datatype == "float":
-            if type(value) is str and value == "":
-                value = 0.0
-            else:
-                datatype_limits = RiLoggingMySqlQueryCreator.sizes.get(datatype)
-                value = round(float(value), int(datatype_limits[1]))
+        value = RiLoggingMySqlQueryCreator.converters.get(datatype, RiLoggingMySqlQueryCreator.convert_string)(value)
         if datatype == "string":
-            if type(value) is not str:
-                value = ""
-            if len(value) >= int(RiLoggingMySqlQueryCreator.sizes.get(datatype)):
-                value = value[:int(RiLoggingMySqlQueryCreator.sizes.get(datatype))]
             value = "\"" + value + "\""
 
         return str(value)
+
+    @staticmethod
+    def convert_integer(value) -> int:
+        if type(value) is str and value == "" or value is None:
+            return 0
+
+        return int(value)
+
+    @staticmethod
+    def convert_float(value) -> float:
+        if type(value) is str and value == "" or value is None:
+            return 0.0
+
+        return round(float(value), int(RiLoggingMySqlQueryCreator.sizes.get("float")[1]))
+
+    @staticmethod
+    def convert_string(value) -> str:
+        if type(value) is not str:
+            return ""
+
+        return value[:int(RiLoggingMySqlQueryCreator.sizes.get("string"))]
+
+    @staticmethod
+    # returns the parameterized INSERT statement of the table together with its columns, the statement is created once and cached
+    def get_insert_statement(table_name: str, field_name_target: str, field_name_timestamp: str, fields: list) -> tuple:
+        key = (table_name, field_name_target, field_name_timestamp, tuple(field.get("name") for field in fields))
+        statement = RiLoggingMySqlQueryCreator.statements.get(key)
+        if statement is None:
+            query_fields = [field_name_target, field_name_timestamp] + [field.get("name") for field in fields]
+            query = "INSERT INTO " + table_name + "(" + ", ".join(query_fields) + ") VALUES (" + ", ".join(["%s"] * len(query_fields)) + ")"
+            statement = (query, tuple(query_fields))
+            RiLoggingMySqlQueryCreator.statements.__setitem__(key, statement)
+
+        return statement
+
+    @staticmethod
+    # returns the parameters of the INSERT statement created by get_insert_statement, the log is already converted by the converter of its route
+    def create_insert_parameters(statement: tuple, document: dict) -> tuple:
+        return tuple(document.get(field_name) for field_name in statement[1])
+
+    @staticmethod
+    # returns the parameterized SELECT of all rows of the table matching the time range [time_from, time_to), the targets and the field values, filters which are None are left out
+    # with a limit the rows are ordered by (timestamp, id) and start after the keyset (timestamp, id) of the last row of the previous page
+    def create_select_query(table_name: str, field_name_target: str, field_name_timestamp: str, time_from: str = None, time_to: str = None, targets: list = None, fields: dict = None, after: tuple = None, descending: bool = False, limit: int = None) -> tuple:
+        conditions = []
+        parameters = []
+        for field_name, value in (fields or {}).items():
+            conditions.append(field_name + " = %s")
+            parameters.append(value)
+        if after is not None:
+            comparison = " < " if descending is True else " > "
+            conditions.append("(" + field_name_timestamp + comparison + "%s OR " + field_name_timestamp + " = %s AND id" + comparison + "%s)")
+            parameters.extend([after[0], after[0], after[1]])
+        if time_from is not None:
+            conditions.append(field_name_timestamp + " >= %s")
+            parameters.append(time_from)
+        if time_to is not None:
+            conditions.append(field_name_timestamp + " < %s")
+            parameters.append(time_to)
+        if targets is not None and len(targets) > 0:
+            conditions.append(field_name_target + " IN (" + ", ".join(["%s"] * len(targets)) + ")")
+            parameters.extend(targets)
+
+        query = "SELECT * FROM " + table_name
+        if len(conditions) > 0:
+            query += " WHERE " + " AND ".join(conditions)
+        if limit is not None:
+            direction = " DESC" if descending is True else " ASC"
+            query += " ORDER BY " + field_name_timestamp + direction + ", id" + direction + " LIMIT " + str(int(limit))
+
+        return query, tuple(parameters)
+
+
+# converters of the supported datatypes, assigned after the class is defined so the static methods can be referenced
+RiLoggingMySqlQueryCreator.converters = {
+    "string": RiLoggingMySqlQueryCreator.convert_string,
+    "integer": RiLoggingMySqlQueryCreator.convert_integer,
+    "float": RiLoggingMySqlQueryCreator.convert_float
+}
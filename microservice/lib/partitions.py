@@ -0,0 +1,205 @@
+# dependencies
+import atexit
+import datetime
+import threading
+
+
+# time partitions and retention of the tables/collections, configured per entry of the database map with 'partition' and 'retention'
+# mysql tables with 'partition' are split into daily or monthly RANGE partitions on their timestamp, a background thread creates
+# the upcoming partitions in advance and drops the partitions which are older than the retention, so expired logs are removed
+# with a metadata operation instead of deleting them row by row
+# backends without partitions remove the expired logs with a range delete on the timestamp index
+class RiLoggingPartitions:
+    # enum values for possible intervals of the partitions
+    partition_day: str = "day"
+    partition_month: str = "month"
+    partitions: list = ["day", "month"]
+    # format of the start of the interval in the names of the partitions
+    name_formats: dict = {
+        "day": "%Y%m%d",
+        "month": "%Y%m"
+    }
+    # format of the timestamps written by the frontend logger, the bounds of the partitions use the same format
+    timestamp_format: str = "%Y-%m-%d %H:%M:%S"
+    # default amount of upcoming partitions which are created in advance
+    ahead_default: int = 3
+    # default seconds between two runs of the manager
+    interval_default: int = 3600
+    # routes of the tables/collections with partition or retention
+    routes: list = []
+    # function which maintains the partitions and the retention of a route
+    maintainer = None
+    ahead: int = 3
+    interval: float = 3600.0
+    # background thread maintaining the partitions
+    thread: threading.Thread = None
+    # signal for the background thread to stop
+    stopping: threading.Event = None
+    lock: threading.Lock = threading.Lock()
+    # counters describing the state of the manager
+    counters: dict = {}
+
+    @classmethod
+    # compiles the routes with partition or retention and starts the background manager, which runs right away and then after every interval
+    def start(cls, partitions: dict, routes: list, maintainer):
+        cls.stop()
+        cls.configure(routes)
+        cls.maintainer = maintainer
+        cls.ahead = partitions.get("ahead", cls.ahead_default)
+        cls.interval = float(partitions.get("interval", cls.interval_default))
+        cls.counters = {
+            "runs": 0,
+            "created": 0,
+            "dropped": 0,
+            "expired": 0,
+            "failed": 0
+        }
+        cls.stopping = threading.Event()
+        cls.thread = threading.Thread(target=cls.run, name="RiLoggingPartitions", daemon=True)
+        cls.thread.start()
+        atexit.register(cls.stop)
+
+    @classmethod
+    # replaces the maintained routes, called on start and whenever the configuration changes
+    def configure(cls, routes: list):
+        cls.routes = cls.get_routes(routes)
+
+    @staticmethod
+    # returns the routes whose entry of the database map is configured with partition or retention
+    def get_routes(routes: list) -> list:
+        return [route for route in routes if route.database_map.get("partition") is not None or route.database_map.get("retention") is not None]
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls.thread is not None
+
+    @staticmethod
+    # returns the start of the interval of the partition containing the moment
+    def get_start(partition: str, moment: datetime.datetime) -> datetime.datetime:
+        if partition == RiLoggingPartitions.partition_month:
+            return datetime.datetime(moment.year, moment.month, 1)
+
+        return datetime.datetime(moment.year, moment.month, moment.day)
+
+    @staticmethod
+    # returns the start of the interval following the interval starting at start
+    def get_next(partition: str, start: datetime.datetime) -> datetime.datetime:
+        if partition == RiLoggingPartitions.partition_month:
+            return datetime.datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+        return start + datetime.timedelta(days=1)
+
+    @classmethod
+    # returns the partitions (name, upper bound) of the intervals from start up to the upper bound until
+    def create_range(cls, partition: str, start: datetime.datetime, until: datetime.datetime) -> list:
+        partitions = []
+        while start < until:
+            bound = cls.get_next(partition, start)
+            partitions.append(("p" + start.strftime(cls.name_formats.get(partition)), bound.strftime(cls.timestamp_format)))
+            start = bound
+
+        return partitions
+
+    @classmethod
+    # returns the upper bound of the partitions which have to exist at the moment, the current interval and the ones ahead
+    def get_until(cls, partition: str, moment: datetime.datetime) -> datetime.datetime:
+        until = cls.get_start(partition, moment)
+        for index in range(cls.ahead + 1):
+            until = cls.get_next(partition, until)
+
+        return until
+
+    @classmethod
+    # returns the partitions (name, upper bound) of a new table, the first one also takes all logs before the current interval
+    def create_partitions(cls, partition: str, moment: datetime.datetime = None) -> list:
+        moment = moment or cls.get_now()
+
+        return cls.create_range(partition, cls.get_start(partition, moment), cls.get_until(partition, moment))
+
+    @classmethod
+    # returns the partitions (name, upper bound) which are missing behind the existing partitions (name, upper bound or None for the catch-all)
+    def get_upcoming(cls, partition: str, existing: list, moment: datetime.datetime) -> list:
+        bounds = [bound for name, bound in existing if bound is not None]
+        if len(bounds) == 0:
+            return cls.create_partitions(partition, moment)
+
+        start = datetime.datetime.strptime(max(bounds), cls.timestamp_format)
+
+        return cls.create_range(partition, start, cls.get_until(partition, moment))
+
+    @staticmethod
+    # returns the names of the existing partitions whose logs are all older than the cutoff, the catch-all is never dropped
+    def get_expired(existing: list, cutoff: str) -> list:
+        return [name for name, bound in existing if bound is not None and bound <= cutoff]
+
+    @classmethod
+    # returns the timestamp before which the logs are expired after the retention in days
+    def get_cutoff(cls, retention: int, moment: datetime.datetime) -> str:
+        return (moment - datetime.timedelta(days=retention)).strftime(cls.timestamp_format)
+
+    @staticmethod
+    # the timestamps are compared in UTC like the imported access logs
+    def get_now() -> datetime.datetime:
+        return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+    @classmethod
+    # creates the upcoming partitions of the route and removes its expired logs, tables without partitions are cleaned with a range delete
+    def maintain(cls, storage, route, moment: datetime.datetime = None):
+        moment = moment or cls.get_now()
+        partition = route.database_map.get("partition")
+        retention = route.database_map.get("retention")
+        existing = storage.get_partitions(route) if partition is not None else []
+        if len(existing) > 0:
+            upcoming = cls.get_upcoming(partition, existing, moment)
+            if len(upcoming) > 0:
+                storage.add_partitions(route, upcoming)
+                cls.increase("created", len(upcoming))
+        if retention is None:
+            return
+        if len(existing) > 0:
+            expired = cls.get_expired(existing, cls.get_cutoff(retention, moment))
+            if len(expired) > 0:
+                storage.drop_partitions(route, expired)
+                cls.increase("dropped", len(expired))
+        else:
+            removed = storage.remove_expired(route, cls.get_cutoff(retention, moment))
+            if removed is not None:
+                cls.increase("expired", removed)
+
+    @classmethod
+    def increase(cls, key: str, amount: int):
+        with cls.lock:
+            cls.counters.__setitem__(key, cls.counters.get(key) + amount)
+
+    @classmethod
+    # returns the counters of the manager together with the amount of maintained tables/collections
+    def statistics(cls) -> dict:
+        with cls.lock:
+            statistics = dict(cls.counters)
+        statistics.__setitem__("collections", len(cls.routes))
+
+        return statistics
+
+    @classmethod
+    # background loop, maintains all routes right away and after every interval, a failing route doesn't keep the others from being maintained
+    def run(cls):
+        while True:
+            for route in list(cls.routes):
+                try:
+                    cls.maintainer(route)
+                except Exception:
+                    cls.increase("failed", 1)
+            cls.increase("runs", 1)
+            if cls.stopping.wait(cls.interval) is True:
+                break
+
+    @classmethod
+    # stops the background thread, a running maintenance is finished first
+    def stop(cls):
+        if cls.thread is None:
+            return
+
+        cls.stopping.set()
+        cls.thread.join()
+        cls.thread = None
+        cls.routes = []
@@ -0,0 +1,123 @@
+# dependencies
+import base64
+import datetime
+import decimal
+import json
+from bson import ObjectId
+from microservice.lib.export import RiLoggingExport
+from microservice.lib.mysql_query_generator import RiLoggingMySqlQueryCreator
+from microservice.lib.routing import RiLoggingRoute
+
+
+# reads one page of the logs of a table/collection, filtered by time range, targets and field values
+# the pages are addressed by the keyset (timestamp, id) of the last log of the previous page, so every page is read from the index
+# regardless of how deep the client pages, unlike an offset which has to skip all previous rows
+# the pages of sharded backends are merged from all shards, their keyset ends with the index of the shard of the log
+class RiLoggingQuery:
+    # enum values for possible orders of the logs
+    order_ascending: str = "asc"
+    order_descending: str = "desc"
+    # amount of logs per page if not requested otherwise, and the maximum amount
+    limit_default: int = 100
+    limit_max: int = 1000
+    # query parameters which aren't filters of a field
+    parameters: list = ["collection", "from", "to", "target", "limit", "after", "order"]
+
+    @staticmethod
+    # encodes the keyset of the last log of the page into an opaque, url safe cursor, the shard is left out if the backend isn't sharded
+    def encode_cursor(timestamp, log_id, shard: int = None) -> str:
+        keyset = [timestamp, log_id] if shard is None else [timestamp, log_id, shard]
+
+        return base64.urlsafe_b64encode(json.dumps(keyset).encode()).decode().rstrip("=")
+
+    @staticmethod
+    # decodes the cursor into the keyset (timestamp, id, shard), the shard is None if the cursor has none, returns None if the cursor is invalid
+    def decode_cursor(cursor: str):
+        try:
+            keyset = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+        except (ValueError, UnicodeDecodeError):
+            return None
+        if type(keyset) is not list or len(keyset) not in [2, 3] or type(keyset[0]) is not str or type(keyset[1]) not in [int, str]:
+            return None
+        if len(keyset) == 3 and (type(keyset[2]) is not int or keyset[2] < 0):
+            return None
+
+        return keyset[0], keyset[1], keyset[2] if len(keyset) == 3 else None
+
+    @staticmethod
+    # reads the filters of the query from the query parameters, returns None if a filter is invalid
+    # field_arguments maps the query parameters, which filter a field, to the name of the field
+    def create_filters(route: RiLoggingRoute, arguments: dict, field_arguments: dict) -> dict:
+        filters = {
+            "time_from": None,
+            "time_to": None,
+            "targets": None,
+            "fields": {},
+            "after": None,
+            "after_shard": None,
+            "descending": arguments.get("order", RiLoggingQuery.order_ascending) == RiLoggingQuery.order_descending,
+            "limit": RiLoggingQuery.limit_default
+        }
+        if arguments.get("order", RiLoggingQuery.order_ascending) not in [RiLoggingQuery.order_ascending, RiLoggingQuery.order_descending]:
+            return None
+        for key, argument in [("time_from", "from"), ("time_to", "to")]:
+            if arguments.get(argument) is not None:
+                filters.__setitem__(key, RiLoggingExport.parse_timestamp(arguments.get(argument)))
+                if filters.get(key) is None:
+                    return None
+        if arguments.get("target") is not None:
+            filters.__setitem__("targets", [target for target in arguments.get("target").split(",") if len(target) > 0])
+        if arguments.get("limit") is not None:
+            try:
+                filters.__setitem__("limit", int(arguments.get("limit")))
+            except ValueError:
+                return None
+            if filters.get("limit") <= 0 or filters.get("limit") > RiLoggingQuery.limit_max:
+                return None
+        if arguments.get("after") is not None:
+            keyset = RiLoggingQuery.decode_cursor(arguments.get("after"))
+            if keyset is None:
+                return None
+            filters.__setitem__("after", keyset[:2])
+            filters.__setitem__("after_shard", keyset[2])
+
+        datatypes = dict(zip(route.field_names, route.datatypes))
+        for argument, field_name in field_arguments.items():
+            if arguments.get(argument) is None or field_name not in datatypes:
+                continue
+            try:
+                value = RiLoggingMySqlQueryCreator.converters.get(datatypes.get(field_name), RiLoggingMySqlQueryCreator.convert_string)(arguments.get(argument))
+            except ValueError:
+                return None
+            filters.get("fields").__setitem__(field_name, value)
+
+        return filters
+
+    @staticmethod
+    # converts the values of the log which json can't serialize, like DATETIME and DECIMAL columns or the ObjectId of mongodb
+    def serialize_log(log: dict) -> dict:
+        serialized = {}
+        for key, value in log.items():
+            if type(value) in [datetime.datetime, decimal.Decimal, ObjectId]:
+                value = RiLoggingExport.serialize_value(value)
+            serialized.__setitem__(key, value)
+
+        return serialized
+
+    @staticmethod
+    # reads the page of logs of the route's table/collection from the storage backend
+    # returns the logs and the cursor of the next page, which is None if there are no more logs
+    def find(storage, route: RiLoggingRoute, filters: dict) -> tuple:
+        # one more log than requested tells whether there is a next page
+        limit = filters.get("limit") + 1
+        logs = storage.find(route, filters, limit)
+        if logs is None:
+            return None, None
+
+        cursor = None
+        if len(logs) == limit:
+            logs = logs[:filters.get("limit")]
+            last = RiLoggingQuery.serialize_log(logs[-1])
+            cursor = RiLoggingQuery.encode_cursor(last.get(route.timestamp_name), last.get(storage.id_name), storage.get_shard(logs[-1]))
+
+        return [RiLoggingQuery.serialize_log(log) for log in logs], cursor
@@ -1,8 +1,27 @@
 # dependencies
 from flask import Flask
+import hmac
+import json
+import time
 from microservice.lib.mysql_query_generator import RiLoggingMySqlQueryCreator
 from microservice.connectors.MySQL import MySQLConnection
-from microservice.connectors.MongoDB import MongoDBConnection
+from microservice.lib.storage import RiLoggingStorage
+from microservice.lib.write_buffer import RiLoggingWriteBuffer
+from microservice.lib.routing import RiLoggingRoute, RiLoggingRoutingTable
+from microservice.lib.metrics import RiLoggingMetrics
+from microservice.lib.export import RiLoggingExport
+from microservice.lib.export_columnar import RiLoggingColumnarExport
+from microservice.lib.access_log import RiLoggingAccessLog
+from microservice.lib.query import RiLoggingQuery
+from microservice.lib.frontend_script import RiLoggingFrontendScript
+from microservice.lib.cached_response import RiLoggingCachedResponse
+from microservice.lib.configuration_reload import RiLoggingConfigurationReload
+from microservice.lib.spool import RiLoggingSpool
+from microservice.lib.changes import RiLoggingChanges
+from microservice.lib.rollups import RiLoggingRollups
+from microservice.lib.partitions import RiLoggingPartitions
+from microservice.lib.bulk_load import RiLoggingBulkLoad
+from microservice.lib.messages import RiLoggingError
 
 
 # class for handling the requests
@@ -10,24 +29,43 @@ class RiLoggingRequestHandler:
     # enum value for possible connections
     server_type_mysql: str = "mysql"
     server_type_mongodb: str = "mongodb"
+    server_type_file: str = "file"
+    # enum value of the serving mode with non-blocking connections
+    server_mode_async: str = "async"
     # full configuration of the tool
     configuration: dict = None
+    # storage backend of the configured server type, opened once on start
+    storage: RiLoggingStorage = None
+    # serialized frontend configuration together with the frontend configuration it was created from
+    frontend_configuration: tuple = (None, None)
+    # the frontend configuration may be cached by the browser, but has to be revalidated with the ETag on every use
+    frontend_configuration_cache_control: str = "no-cache"
     # request-response-communication
     logging_handler: Flask = None
     # default mime-type for data exchange
     response_mimetype_default: str = "application/json"
     # mime-type for delivering JavaScript file
     response_mimetype_javascript: str = "application/javascript"
+    # mime-type of the metrics in the prometheus text format
+    response_mimetype_metrics: str = "text/plain; version=0.0.4"
     # key for the response to return the textual status
     response_key_message: str = "message"
     # textual response status indicating that everything went ok
     response_message_ok: str = "ok"
     # textual response status indicating that something went wrong
     response_message_error: str = "error"
+    # textual response status indicating that the log couldn't be accepted right now
+    response_message_unavailable: str = "unavailable"
+    # textual response status indicating that the bearer token is missing or wrong
+    response_message_unauthorized: str = "unauthorized"
     # http response status indicating that everything went ok
     response_status_ok: int = 200
     # http response status indicating that something went wrong
     response_status_bad_request: int = 400
+    # http response status indicating that the request requires the bearer token
+    response_status_unauthorized: int = 401
+    # http response status indicating that the server is overloaded and the request should be repeated later
+    response_status_service_unavailable: int = 503
 
     @staticmethod
     # returns the basic response dict which describes the structure of all responses
@@ -43,9 +81,500 @@ class RiLoggingRequestHandler:
         response_code = RiLoggingRequestHandler.response_status_ok
         if type(response_body) is not dict or type(response_body.get("message")) is not str or response_body.get("message") != "ok":
             response_code = RiLoggingRequestHandler.response_status_bad_request
+        if type(response_body) is dict and response_body.get("message") == RiLoggingRequestHandler.response_message_unavailable:
+            response_code = RiLoggingRequestHandler.response_status_service_unavailable
+        if type(response_body) is dict and response_body.get("message") == RiLoggingRequestHandler.response_message_unauthorized:
+            response_code = RiLoggingRequestHandler.response_status_unauthorized
 
         return response_code
 
+    @staticmethod
+    # opens the storage backend of the configured server, called once on start
+    # the schema of all mapped tables/collections is created up front, so the hot path never has to issue DDL or metadata queries
+    def create_connections():
+        RiLoggingRequestHandler.storage = RiLoggingStorage.create(RiLoggingRequestHandler.configuration.get("connection"))
+        RiLoggingRequestHandler.storage.open()
+        if RiLoggingRequestHandler.storage.reachable is True:
+            RiLoggingRequestHandler.create_schemas()
+
+    @staticmethod
+    # remembers the configuration file for reloading it while serving, called once on start
+    def create_reload(filename: str):
+        RiLoggingConfigurationReload.configure(filename=filename, apply=RiLoggingRequestHandler.apply_configuration)
+
+    @staticmethod
+    # applies a configuration file which was modified since start (e.g. before the worker was forked) and starts the file watcher if it is enabled
+    def start_reload():
+        RiLoggingConfigurationReload.report(RiLoggingConfigurationReload.check())
+        reload = RiLoggingRequestHandler.configuration.get("logging").get("backend").get("reload", {})
+        if type(reload.get("interval")) is int:
+            RiLoggingConfigurationReload.start(interval=reload.get("interval"))
+
+    @staticmethod
+    # executive function for reloading the configuration file, the file is applied even if it wasn't modified
+    def reload_configuration() -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        try:
+            result = RiLoggingConfigurationReload.reload(force=True)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            result = {"reloaded": False, "errors": [RiLoggingError.error_message(status_code=99)], "warnings": []}
+        response_body.update(result)
+        if len(result.get("errors")) > 0:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+
+        return response_body
+
+    @staticmethod
+    # returns the settings of the connection which require new connections if they change, the mapped tables/collections don't
+    def get_connection_settings(configuration: dict) -> str:
+        connection = json.loads(json.dumps(configuration.get("connection")))
+        connection.get("server").get("database").pop("map", None)
+        connection.get("server").get("database").pop("create_collection", None)
+        connection.get("server").get("database").pop("engine", None)
+
+        return json.dumps(connection, sort_keys=True)
+
+    @staticmethod
+    # swaps in a validated configuration while serving, returns the warnings of the settings which are applied after a restart
+    # routing and caches are compiled before anything is swapped, the connections are only opened again if their settings changed
+    def apply_configuration(configuration: dict) -> list:
+        previous = RiLoggingRequestHandler.configuration
+        warnings = []
+        routing = RiLoggingRoutingTable.compile(configuration)
+        scripts = RiLoggingFrontendScript.compile(frontend=configuration.get("logging").get("frontend"), mimetype=RiLoggingRequestHandler.response_mimetype_javascript)
+        frontend_configuration = RiLoggingRequestHandler.compile_frontend_configuration(configuration)
+        connection_changed = RiLoggingRequestHandler.get_connection_settings(previous) != RiLoggingRequestHandler.get_connection_settings(configuration)
+        connected = RiLoggingRequestHandler.storage is not None and RiLoggingRequestHandler.storage.is_connected() is True
+
+        RiLoggingRequestHandler.configuration = configuration
+        RiLoggingRoutingTable.swap(routing)
+        RiLoggingFrontendScript.responses = scripts
+        RiLoggingRequestHandler.frontend_configuration = frontend_configuration
+
+        for backend_key in ["server", "buffer", "spool", "partitions"]:
+            if previous.get("logging").get("backend").get(backend_key) != configuration.get("logging").get("backend").get(backend_key):
+                warnings.append(RiLoggingError.error_message(status_code=31, prefix="Warning", placeholder={"property": "logging.backend." + backend_key}))
+        # the informations and fields of the changes are applied right away, starting and stopping the counts requires a restart
+        changes = [settings.get("logging").get("backend").get("changes", {}) for settings in [previous, configuration]]
+        if changes[0].get("enabled") != changes[1].get("enabled") or changes[0].get("interval") != changes[1].get("interval"):
+            warnings.append(RiLoggingError.error_message(status_code=31, prefix="Warning", placeholder={"property": "logging.backend.changes"}))
+        # the non-blocking connections of the async mode belong to the event loop and are only opened on its startup
+        if connection_changed is True and previous.get("logging").get("backend").get("server").get("mode") == RiLoggingRequestHandler.server_mode_async:
+            warnings.append(RiLoggingError.error_message(status_code=31, prefix="Warning", placeholder={"property": "connection"}))
+        elif connected is True and connection_changed is True:
+            RiLoggingRequestHandler.storage.close()
+            RiLoggingRequestHandler.create_connections()
+        elif connected is True:
+            # the schema of tables/collections which were added to the map
+            RiLoggingRequestHandler.storage.configure(configuration.get("connection"))
+            RiLoggingRequestHandler.create_schemas()
+        if connected is True:
+            RiLoggingRequestHandler.create_access_log()
+        if RiLoggingRollups.is_enabled() is True:
+            RiLoggingRollups.configure(RiLoggingRoutingTable.get_routes())
+        if RiLoggingPartitions.is_enabled() is True:
+            RiLoggingPartitions.configure(RiLoggingRoutingTable.get_routes())
+        if RiLoggingChanges.is_enabled() is True and configuration.get("logging").get("backend").get("changes", {}).get("enabled") is True:
+            RiLoggingChanges.configure(configuration.get("logging").get("backend").get("changes"), RiLoggingRoutingTable.get_routes())
+
+        return warnings
+
+    @staticmethod
+    # starts the write-behind buffer if it is enabled in the configuration, called once on start
+    def create_buffer():
+        buffer = RiLoggingRequestHandler.configuration.get("logging").get("backend").get("buffer", {})
+        if buffer.get("enabled") is True:
+            RiLoggingWriteBuffer.start(writer=RiLoggingRequestHandler.write_logs, size=buffer.get("size"), interval=buffer.get("interval"), batch=buffer.get("batch"))
+
+    @staticmethod
+    # starts the on-disk spool if it is enabled in the configuration, called once on start of every process
+    def create_spool():
+        spool = RiLoggingRequestHandler.configuration.get("logging").get("backend").get("spool", {})
+        if spool.get("enabled") is True:
+            RiLoggingSpool.start(spool=spool, writer=RiLoggingRequestHandler.replay_logs, resolver=RiLoggingRequestHandler.get_route, replayed=RiLoggingRequestHandler.get_replayed)
+
+    @staticmethod
+    # starts counting the changes of the configured informations if it is enabled in the configuration, called once on start of every process
+    def create_changes():
+        changes = RiLoggingRequestHandler.configuration.get("logging").get("backend").get("changes", {})
+        if changes.get("enabled") is True:
+            try:
+                RiLoggingRequestHandler.storage.ensure_changes()
+            except Exception as error:
+                # the aggregate store is created again on the first flush
+                RiLoggingRequestHandler.log_exception(error)
+            RiLoggingChanges.start(changes=changes, routes=RiLoggingRoutingTable.get_routes(), writer=RiLoggingRequestHandler.increment_changes)
+
+    @staticmethod
+    # adds the counted changes to the aggregate store of the storage backend
+    def increment_changes(rows: list):
+        RiLoggingRequestHandler.storage.increment_changes(rows)
+
+    @staticmethod
+    # executive function for returning the changes per project or, if the project is given, per requirement of the project
+    def get_changes(project_id: str, arguments: dict) -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        username = arguments.get("username")
+        if RiLoggingChanges.is_enabled() is False:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+        try:
+            rows = RiLoggingRequestHandler.storage.get_changes(project_id, username)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        response_body.__setitem__("changes", RiLoggingChanges.create_changes(rows, "projectId" if project_id is None else "requirementId"))
+
+        return response_body
+
+    @staticmethod
+    # executive function for counting the changes of all stored logs again, the counts replace the aggregate store
+    # changes which are written while the backfill is running are only counted if the backfill reads them, so it is meant to be run once after enabling the counts
+    def backfill_changes() -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        if RiLoggingChanges.is_enabled() is False:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+        try:
+            rows = RiLoggingChanges.backfill(RiLoggingRoutingTable.get_routes(), RiLoggingRequestHandler.storage.stream, RiLoggingRequestHandler.storage.replace_changes)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        response_body.__setitem__("changes", sum(row[4] for row in rows))
+
+        return response_body
+
+    @staticmethod
+    # starts the accumulator of the rollups if an information is configured with rollup, called once on start of every process
+    def create_rollups():
+        routes = RiLoggingRollups.get_routes(RiLoggingRoutingTable.get_routes())
+        if len(routes) == 0:
+            return
+        for route in routes:
+            try:
+                RiLoggingRequestHandler.storage.ensure_rollups(route)
+            except Exception as error:
+                # the companion tables/collections are created again on the first flush
+                RiLoggingRequestHandler.log_exception(error)
+        RiLoggingRollups.start(routes=routes, writer=RiLoggingRequestHandler.increment_rollups)
+
+    @staticmethod
+    # adds the accumulated counts and registers to the rollups of the route
+    def increment_rollups(route: RiLoggingRoute, counts: list, registers: list):
+        RiLoggingRequestHandler.storage.increment_rollups(route, counts, registers)
+
+    @staticmethod
+    # executive function for reading the rollups of a table/collection of one granularity, filtered by time range and targets
+    # the collection can be left out if only one table/collection is configured
+    def query_rollups(arguments: dict) -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        collection_name = arguments.get("collection")
+        if collection_name is None and len(RiLoggingRollups.sources) == 1:
+            collection_name = list(RiLoggingRollups.sources.keys())[0]
+        route = RiLoggingRoutingTable.get_collection(collection_name)
+        filters = RiLoggingRollups.create_filters(arguments)
+        source = RiLoggingRollups.sources.get(collection_name)
+        if route is None or filters is None or source is None or filters.get("granularity") not in source[0]:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        distinct = source[1] is not None
+        try:
+            counts, registers = RiLoggingRequestHandler.storage.get_rollups(route, filters.get("granularity"), filters.get("time_from"), filters.get("time_to"), filters.get("targets"), distinct)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        response_body.__setitem__("granularity", filters.get("granularity"))
+        response_body.__setitem__("rollups", RiLoggingRollups.create_rollups(counts, registers, distinct))
+
+        return response_body
+
+    @staticmethod
+    # starts the manager of the time partitions and the retention if an entry of the database map is configured with them, called once on start of every process
+    def create_partitions():
+        routes = RiLoggingPartitions.get_routes(RiLoggingRoutingTable.get_routes())
+        if len(routes) == 0:
+            return
+        RiLoggingPartitions.start(partitions=RiLoggingRequestHandler.configuration.get("logging").get("backend").get("partitions", {}), routes=routes, maintainer=RiLoggingRequestHandler.maintain_partitions)
+
+    @staticmethod
+    # creates the upcoming partitions of the route and removes its expired logs, the workers of the server may do it at the same time
+    # so a failed run is only logged and repeated with the next run, the shards of a sharded backend are maintained one by one
+    def maintain_partitions(route: RiLoggingRoute):
+        failure = None
+        for storage in RiLoggingRequestHandler.storage.get_shards():
+            try:
+                RiLoggingPartitions.maintain(storage, route)
+            except Exception as error:
+                RiLoggingRequestHandler.log_exception(error)
+                failure = error
+        if failure is not None:
+            raise failure
+
+    @staticmethod
+    # executive function for removing all logs of a table/collection, which drops/truncates it instead of deleting the logs one by one
+    def remove_collection(collection_name: str) -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        route = RiLoggingRoutingTable.get_collection(collection_name)
+        if route is None:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+        try:
+            removed = RiLoggingRequestHandler.storage.remove(route)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        response_body.__setitem__("removed", removed)
+
+        return response_body
+
+    @staticmethod
+    # executive function for bulk loading the rows of newline-delimited JSON or CSV, the format is taken from the 'format' parameter
+    # or the content type, the rows are loaded in chunks of 'chunk' rows per table/collection and the report of the load is returned
+    def bulk_load(lines, arguments: dict, content_type: str = None) -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        input_format = arguments.get("format")
+        if input_format is None:
+            input_format = RiLoggingBulkLoad.format_csv if type(content_type) is str and content_type.startswith("text/csv") else RiLoggingBulkLoad.format_ndjson
+        try:
+            chunk = int(arguments.get("chunk", RiLoggingBulkLoad.chunk_default))
+        except ValueError:
+            chunk = 0
+        if input_format not in RiLoggingBulkLoad.formats or chunk <= 0:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        report = RiLoggingBulkLoad.load(lines, input_format, RiLoggingRequestHandler.load_logs, chunk)
+        response_body.update(report)
+        if report.get("failed") > 0:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+
+        return response_body
+
+    @staticmethod
+    # loads a chunk of logs of the same route with the bulk path of the storage backend and adds them to the change counts and the rollups
+    def load_logs(route: RiLoggingRoute, documents: list) -> int:
+        try:
+            loaded = RiLoggingRequestHandler.storage.load(route, documents)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            raise
+        RiLoggingRequestHandler.aggregate_logs(route, documents[:loaded])
+
+        return loaded
+
+    @staticmethod
+    # adds the written logs to the change counts and to the rollups
+    def aggregate_logs(route: RiLoggingRoute, documents: list):
+        RiLoggingChanges.count(route, documents)
+        RiLoggingRollups.count(route, documents)
+
+    @staticmethod
+    # returns the route of a table/collection of spooled logs, None if it was removed from the configuration
+    def get_route(collection: str) -> RiLoggingRoute:
+        route = RiLoggingRoutingTable.get_collection(collection)
+        if route is None and RiLoggingAccessLog.is_enabled() is True and RiLoggingAccessLog.route.collection == collection:
+            route = RiLoggingAccessLog.route
+
+        return route
+
+    @staticmethod
+    # configures the ingestion of the NGINX access logs if it is enabled in the configuration, called once on start
+    def create_access_log():
+        access_log = RiLoggingRequestHandler.configuration.get("logging").get("backend").get("access_log")
+        RiLoggingAccessLog.configure(access_log=access_log, writer=RiLoggingRequestHandler.create_logs)
+        if RiLoggingAccessLog.is_enabled() is True:
+            RiLoggingRequestHandler.create_schema(RiLoggingAccessLog.route)
+        if RiLoggingAccessLog.is_enabled() is True and type(access_log.get("interval")) is int:
+            RiLoggingAccessLog.start(interval=access_log.get("interval"))
+
+    @staticmethod
+    # executive function for listing the NGINX access logs with the offset up to which they were imported
+    def get_backend_logs() -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        if RiLoggingAccessLog.is_enabled() is False:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+        try:
+            response_body.__setitem__("files", RiLoggingAccessLog.list_files())
+        except OSError as error:
+            RiLoggingRequestHandler.log_exception(error)
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+
+        return response_body
+
+    @staticmethod
+    # executive function for returning one NGINX access log (filename) with the offset up to which it was imported
+    def get_backend_log(filename: str) -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        files = []
+        if RiLoggingAccessLog.is_enabled() is True:
+            try:
+                files = [file for file in RiLoggingAccessLog.list_files() if file.get("name") == filename]
+            except OSError as error:
+                RiLoggingRequestHandler.log_exception(error)
+        if len(files) == 0:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+        else:
+            response_body.__setitem__("file", files[0])
+
+        return response_body
+
+    @staticmethod
+    # executive function for importing the new lines of one NGINX access log (filename) or of all access logs (None) into the database
+    def import_backend_logs(filename: str = None) -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        imported = None
+        if RiLoggingAccessLog.is_enabled() is True:
+            try:
+                imported = RiLoggingAccessLog.ingest() if filename is None else RiLoggingAccessLog.ingest_filename(filename)
+            except Exception as error:
+                RiLoggingRequestHandler.log_exception(error)
+        if imported is None:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+        else:
+            response_body.__setitem__("imported", imported)
+
+        return response_body
+
+    @staticmethod
+    # returns the counters of the write-behind buffer
+    def get_buffer_statistics() -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        response_body.__setitem__("enabled", RiLoggingWriteBuffer.is_enabled())
+        response_body.__setitem__("statistics", RiLoggingWriteBuffer.statistics())
+        response_body.__setitem__("spool", {"enabled": RiLoggingSpool.is_enabled(), "statistics": RiLoggingSpool.statistics()})
+
+        return response_body
+
+    @staticmethod
+    # registers the gauges of the connection pool and the write-behind buffer
+    def create_metrics():
+        RiLoggingMetrics.register_gauge("rilogging_pool_connections", "Open connections of the MySQL pool by state", lambda: [] if MySQLConnection.pool is None else [
+            ((("state", "open"),), MySQLConnection.pool.size),
+            ((("state", "idle"),), MySQLConnection.pool.idle.qsize())
+        ])
+        RiLoggingMetrics.register_gauge("rilogging_buffer", "State and counters of the write-behind buffer", lambda: [] if RiLoggingWriteBuffer.is_enabled() is False else [
+            ((("value", key),), value) for key, value in sorted(RiLoggingWriteBuffer.statistics().items())
+        ])
+        RiLoggingMetrics.register_gauge("rilogging_changes", "Counters of the change counts which are added to the aggregate store", lambda: [] if RiLoggingChanges.is_enabled() is False else [
+            ((("value", key),), value) for key, value in sorted(RiLoggingChanges.statistics().items())
+        ])
+        RiLoggingMetrics.register_gauge("rilogging_rollups", "Counters of the accumulator of the rollups", lambda: [] if RiLoggingRollups.is_enabled() is False else [
+            ((("value", key),), value) for key, value in sorted(RiLoggingRollups.statistics().items())
+        ])
+        RiLoggingMetrics.register_gauge("rilogging_partitions", "Counters of the manager of the time partitions and the retention", lambda: [] if RiLoggingPartitions.is_enabled() is False else [
+            ((("value", key),), value) for key, value in sorted(RiLoggingPartitions.statistics().items())
+        ])
+        RiLoggingMetrics.register_gauge("rilogging_spool", "Size, age and counters of the on-disk spool", lambda: [] if RiLoggingSpool.is_enabled() is False else [
+            ((("value", key),), value) for key, value in sorted(RiLoggingSpool.statistics().items())
+        ])
+
+    @staticmethod
+    # returns all metrics in the prometheus text format
+    def get_metrics() -> str:
+        return RiLoggingMetrics.render()
+
+    @staticmethod
+    # checks the bearer token of the administrative endpoints, every request is allowed if no token is configured
+    # unless the token is required, the endpoints which remove logs or replace the configuration are refused without a token
+    def is_authorized(authorization: str, required: bool = False) -> bool:
+        token = RiLoggingRequestHandler.configuration.get("logging").get("backend").get("token")
+        if token is None:
+            return required is False
+        if type(authorization) is not str or authorization.startswith("Bearer ") is False:
+            return False
+
+        return hmac.compare_digest(authorization[len("Bearer "):].strip().encode(), token.encode())
+
+    @staticmethod
+    # returns the response body of a request with missing or wrong bearer token
+    def get_response_unauthorized() -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_unauthorized)
+
+        return response_body
+
+    @staticmethod
+    # executive function for exporting a table/collection, returns the response body and the chunks of the export
+    # the chunks are None if the export failed, in this case the response body describes the error
+    def export_collection(collection_name: str, arguments: dict) -> tuple:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        route = RiLoggingRoutingTable.get_collection(collection_name)
+        filters = RiLoggingExport.create_filters(arguments)
+        if route is None or filters is None:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body, None
+
+        try:
+            stream = RiLoggingRequestHandler.storage.stream(route, filters, RiLoggingColumnarExport.batch_default if RiLoggingExport.is_columnar(filters) is True else RiLoggingExport.batch_default)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body, None
+
+        if RiLoggingExport.is_columnar(filters) is True:
+            response_body.__setitem__("mimetype", RiLoggingColumnarExport.mimetype)
+            response_body.__setitem__("filename", route.collection + "." + filters.get("format") + ".tar")
+            return response_body, RiLoggingColumnarExport.encode(stream, route, filters.get("format"), filters.get("compression"), filters.get("row_group"))
+
+        response_body.__setitem__("mimetype", RiLoggingExport.mimetypes.get(filters.get("format")))
+        response_body.__setitem__("filename", route.collection + "." + filters.get("format"))
+
+        return response_body, RiLoggingExport.encode(stream, filters.get("format"))
+
+    @staticmethod
+    # executive function for querying a page of the frontend logs of a table/collection, every field of the information can be filtered by its name
+    # the collection can be left out if only one table/collection is configured
+    def query_frontend_logs(arguments: dict) -> dict:
+        collection_name = arguments.get("collection")
+        if collection_name is None and len(RiLoggingRoutingTable.collections) == 1:
+            collection_name = list(RiLoggingRoutingTable.collections.keys())[0]
+        route = RiLoggingRoutingTable.get_collection(collection_name)
+        field_arguments = {} if route is None else {field_name: field_name for field_name in route.field_names if field_name not in RiLoggingQuery.parameters}
+
+        return RiLoggingRequestHandler.query_logs(route, arguments, field_arguments)
+
+    @staticmethod
+    # executive function for querying a page of the imported NGINX access logs, the target is the request method
+    def query_backend_logs(arguments: dict) -> dict:
+        route = RiLoggingAccessLog.route if RiLoggingAccessLog.is_enabled() is True else None
+        field_arguments = {"remoteAddr": "remote_addr", "remoteUser": "remote_user", "path": "path", "protocol": "protocol", "status": "status", "httpReferer": "http_referer", "httpUserAgent": "http_user_agent"}
+
+        return RiLoggingRequestHandler.query_logs(route, arguments, field_arguments)
+
+    @staticmethod
+    # reads the page of logs of the route and adds the logs and the cursor of the next page to the response
+    def query_logs(route: RiLoggingRoute, arguments: dict, field_arguments: dict) -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        filters = None if route is None else RiLoggingQuery.create_filters(route, arguments, field_arguments)
+        if filters is None:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        try:
+            logs, cursor = RiLoggingQuery.find(RiLoggingRequestHandler.storage, route, filters)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            logs, cursor = None, None
+        if logs is None:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        response_body.__setitem__("logs", logs)
+        response_body.__setitem__("next", cursor)
+
+        return response_body
+
     @staticmethod
     # executive function to generate tables and return the sql strings
     def create_mysql_tables() -> dict:
@@ -54,7 +583,8 @@ class RiLoggingRequestHandler:
         for database_map in RiLoggingRequestHandler.configuration.get("connection").get("server").get("database").get("map"):
             for information in RiLoggingRequestHandler.configuration.get("logging").get("frontend").get("information"):
                 if database_map.get("information") == information.get("id"):
-                    table_sql = RiLoggingMySqlQueryCreator.create_table(database_map.get("collection"), information.get("target_name"), information.get("timestamp_name"), information.get("fields"))
+                    partitions = RiLoggingPartitions.create_partitions(database_map.get("partition")) if database_map.get("partition") is not None else None
+                    table_sql = RiLoggingMySqlQueryCreator.create_table(database_map.get("collection"), information.get("target_name"), information.get("timestamp_name"), information.get("fields"), partitions, RiLoggingRequestHandler.configuration.get("connection").get("server").get("database").get("engine"))
                     response_body.get("tables").append(table_sql)
 
         if len(response_body.get("tables")) == 0 or len(response_body.get("tables")) != len(RiLoggingRequestHandler.configuration.get("logging").get("frontend").get("information")):
@@ -62,77 +592,241 @@ class RiLoggingRequestHandler:
 
         return response_body
 
+    @staticmethod
+    # compiles the routing index from the configuration, called on start and whenever the configuration changes
+    def create_routes():
+        RiLoggingRoutingTable.build(RiLoggingRequestHandler.configuration)
+
+    @staticmethod
+    # builds the minified and compressed tracking script with the inlined frontend configuration, called on start and whenever the configuration changes
+    def create_frontend_script():
+        RiLoggingFrontendScript.build(frontend=RiLoggingRequestHandler.configuration.get("logging").get("frontend"), mimetype=RiLoggingRequestHandler.response_mimetype_javascript)
+
+    @staticmethod
+    # returns the cached tracking script of the logger version or None if the version doesn't exist
+    def get_frontend_script(version: str) -> RiLoggingCachedResponse:
+        return RiLoggingFrontendScript.get(version if version is not None else RiLoggingFrontendScript.version_es5)
+
+    @staticmethod
+    # serializes and compresses the frontend configuration once, called on start and whenever the configuration changes
+    def create_frontend_configuration():
+        RiLoggingRequestHandler.frontend_configuration = RiLoggingRequestHandler.compile_frontend_configuration(RiLoggingRequestHandler.configuration)
+
+    @staticmethod
+    # returns the frontend configuration of the configuration together with its cached response
+    def compile_frontend_configuration(configuration: dict) -> tuple:
+        frontend = configuration.get("logging").get("frontend")
+        cached_response = RiLoggingCachedResponse(body=json.dumps(frontend).encode("utf-8"), mimetype=RiLoggingRequestHandler.response_mimetype_default, cache_control=RiLoggingRequestHandler.frontend_configuration_cache_control)
+
+        return frontend, cached_response
+
+    @staticmethod
+    # returns the cached frontend configuration, which is created again if the configuration was replaced since it was cached
+    def get_frontend_configuration() -> RiLoggingCachedResponse:
+        frontend, cached_response = RiLoggingRequestHandler.frontend_configuration
+        if frontend is not RiLoggingRequestHandler.configuration.get("logging").get("frontend"):
+            RiLoggingRequestHandler.create_frontend_configuration()
+            frontend, cached_response = RiLoggingRequestHandler.frontend_configuration
+
+        return cached_response
+
+    @staticmethod
+    # finds the route (information and database map) of the target which triggered the request
+    def resolve_route(request_json: dict) -> RiLoggingRoute:
+        return RiLoggingRoutingTable.resolve(request_json)
+
     @staticmethod
     # executive function for writing the log to the database
     def create_log(request_json: dict) -> dict:
         save_success = False
-        request_database_map = None
-        request_information = None
         response_body = RiLoggingRequestHandler.get_response_default()
+        started = time.perf_counter()
+        route = RiLoggingRequestHandler.resolve_route(request_json) if type(request_json) is dict else None
+        routed = time.perf_counter()
+        RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, routed - started, RiLoggingMetrics.stage_create_log_route)
 
-        for information in RiLoggingRequestHandler.configuration.get("logging").get("frontend").get("information"):
-            # find information's where target_name is in request
-            if type(request_json.get(information.get("target_name"))) is str:
-                # find the right target based on the name of the target
-                for target in RiLoggingRequestHandler.configuration.get("logging").get("frontend").get("targets"):
-                    # find the target which triggered this request
-                    if request_json.get(information.get("target_name")) == target.get("name") and target.get("information") == information.get("id"):
-                        request_information = information
+        document, errors = (None, None) if route is None else route.converter.convert(request_json)
 
-                        # find the right database table/collection for the received information
-                        for database_map in RiLoggingRequestHandler.configuration.get("connection").get("server").get("database").get("map"):
-                            if target.get("information") == database_map.get("information"):
-                                request_database_map = database_map
+        if route is None:
+            RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_unrouted),))
+        elif errors is not None:
+            RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_invalid),))
+            response_body.__setitem__("errors", errors)
+        else:
+            RiLoggingMetrics.count(RiLoggingMetrics.metric_events, (("target", document.get(route.target_name)), ("information", route.information_id)))
+            # while spooled logs wait for the replay the database is unavailable, new logs are spooled behind them to keep the order
+            if RiLoggingSpool.is_pending() is True and RiLoggingSpool.append(route, [document]) is True:
+                save_success = True
+            # write-behind mode, the log is written by the background flusher, a full buffer is relieved by the spool
+            elif RiLoggingWriteBuffer.is_enabled() is True:
+                if RiLoggingWriteBuffer.put(route, document) is False and RiLoggingSpool.append(route, [document]) is False:
+                    RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_unavailable),))
+                    response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_unavailable)
+                    return response_body
+                save_success = True
+            else:
+                try:
+                    save_success = RiLoggingRequestHandler.storage.write_one(route, document)
+                except Exception as error:
+                    RiLoggingRequestHandler.log_exception(error)
+                if save_success is True:
+                    RiLoggingRequestHandler.aggregate_logs(route, [document])
+                else:
+                    RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_database),))
+                    save_success = RiLoggingSpool.append(route, [document])
+            RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, time.perf_counter() - routed, RiLoggingMetrics.stage_create_log_write)
 
-        if request_database_map is not None and request_information is not None:
-            server_type = RiLoggingRequestHandler.configuration.get("connection").get("server").get("type")
+        if save_success is False:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
 
-            if server_type == RiLoggingRequestHandler.server_type_mysql:
-                save_success = RiLoggingRequestHandler.create_log_mysql(request_database_map, request_information, request_json)
+        return response_body
 
-            if server_type == RiLoggingRequestHandler.server_type_mongodb:
-                save_success = RiLoggingRequestHandler.create_log_mongodb(request_database_map, request_json)
+    @staticmethod
+    # writes the exception into the log of the server, if the server is running
+    def log_exception(error: Exception):
+        if RiLoggingRequestHandler.logging_handler is not None:
+            RiLoggingRequestHandler.logging_handler.logger.exception(error)
 
-        if save_success is False:
+    @staticmethod
+    # splits the body of a batch request, which is ether a JSON array or newline-delimited JSON, into single logs
+    def parse_batch(request_body: str) -> list:
+        requests = []
+        if request_body.lstrip().startswith("["):
+            try:
+                requests = json.loads(request_body)
+            except json.JSONDecodeError:
+                requests = None
+        else:
+            for line in request_body.splitlines():
+                if len(line.strip()) == 0:
+                    continue
+                try:
+                    requests.append(json.loads(line))
+                except json.JSONDecodeError:
+                    requests.append(None)
+
+        return requests
+
+    @staticmethod
+    # routes and converts every log of the batch, returns the status per log, the errors of the invalid logs per index
+    # and the converted logs which still have to be written grouped by table/collection
+    def group_batch(requests: list) -> tuple:
+        statuses = [RiLoggingRequestHandler.response_message_error] * len(requests)
+        invalid = {}
+        groups = {}
+        for index, request_json in enumerate(requests):
+            route = RiLoggingRequestHandler.resolve_route(request_json) if type(request_json) is dict else None
+            if route is None:
+                RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_unrouted),))
+                continue
+            document, errors = route.converter.convert(request_json)
+            if errors is not None:
+                RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_invalid),))
+                invalid.__setitem__(index, errors)
+                continue
+            RiLoggingMetrics.count(RiLoggingMetrics.metric_events, (("target", document.get(route.target_name)), ("information", route.information_id)))
+
+            # write-behind mode, the logs are written by the background flusher, while spooled logs wait for the replay they are spooled as a group
+            if RiLoggingWriteBuffer.is_enabled() is True and RiLoggingSpool.is_pending() is False:
+                if RiLoggingWriteBuffer.put(route, document) is True or RiLoggingSpool.append(route, [document]) is True:
+                    statuses[index] = RiLoggingRequestHandler.response_message_ok
+                else:
+                    RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_unavailable),))
+                    statuses[index] = RiLoggingRequestHandler.response_message_unavailable
+                continue
+
+            group = groups.get(route.collection)
+            if group is None:
+                group = (route, [], [])
+                groups.__setitem__(route.collection, group)
+            group[1].append(index)
+            group[2].append(document)
+
+        return statuses, invalid, groups
+
+    @staticmethod
+    # adds the status of every log to the response of a batch request, together with the errors of the invalid logs
+    def get_response_batch(response_body: dict, statuses: list, invalid: dict) -> dict:
+        events = []
+        for index, status in enumerate(statuses):
+            event = {"index": index, RiLoggingRequestHandler.response_key_message: status}
+            if index in invalid:
+                event.__setitem__("errors", invalid.get(index))
+            events.append(event)
+        response_body.__setitem__("events", events)
+        if RiLoggingRequestHandler.response_message_unavailable in statuses:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_unavailable)
+        elif RiLoggingRequestHandler.response_message_error in statuses:
             response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
 
         return response_body
 
     @staticmethod
-    def create_log_mysql(database_map: dict, information: dict, request: dict) -> bool:
-        success = False
-        query = RiLoggingMySqlQueryCreator.create_insert_query(database_map.get("collection"), information.get("target_name"), information.get("timestamp_name"), information.get("fields"), request)
-        connection = MySQLConnection(
-            username=RiLoggingRequestHandler.configuration.get("connection").get("user").get("name"),
-            password=RiLoggingRequestHandler.configuration.get("connection").get("user").get("password"),
-            host=RiLoggingRequestHandler.configuration.get("connection").get("server").get("host"),
-            port=RiLoggingRequestHandler.configuration.get("connection").get("server").get("port"),
-            database=RiLoggingRequestHandler.configuration.get("connection").get("server").get("database").get("name")
-        )
+    # executive function for writing a batch of logs, the logs are grouped by table/collection and every group is written at once
+    def create_log_batch(request_body: str) -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        requests = RiLoggingRequestHandler.parse_batch(request_body)
+        if type(requests) is not list or len(requests) == 0:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        statuses, invalid, groups = RiLoggingRequestHandler.group_batch(requests)
+        for route, indexes, group_requests in groups.values():
+            if RiLoggingRequestHandler.write_logs(route, group_requests) == len(group_requests):
+                for index in indexes:
+                    statuses[index] = RiLoggingRequestHandler.response_message_ok
+
+        return RiLoggingRequestHandler.get_response_batch(response_body, statuses, invalid)
+
+    @staticmethod
+    # writes multiple logs of the same route with one bulk operation and returns the amount of written logs
+    def create_logs(route: RiLoggingRoute, requests: list) -> int:
+        return RiLoggingRequestHandler.storage.write(route, requests)
+
+    @staticmethod
+    # writes multiple logs of the same route, the logs are spooled if the database is unavailable or spooled logs still wait for the replay
+    # returns the amount of written or spooled logs
+    def write_logs(route: RiLoggingRoute, requests: list) -> int:
+        if RiLoggingSpool.is_pending() is True and RiLoggingSpool.append(route, requests) is True:
+            return len(requests)
         try:
-            if RiLoggingRequestHandler.configuration.get("connection").get("server").get("database").get("create_collection") is True:
-                for database_map in RiLoggingRequestHandler.configuration.get("connection").get("server").get("database").get("map"):
-                    if database_map.get("information") == information.get("id"):
-                        if connection.table_exists(database_map.get("collection")) is False:
-                            table_sql_query = RiLoggingMySqlQueryCreator.create_table(database_map.get("collection"), information.get("target_name"), information.get("timestamp_name"), information.get("fields"))
-                            connection.insert_query(query=table_sql_query, database=RiLoggingRequestHandler.configuration.get("connection").get("server").get("database").get("name"))
-        except Warning:
-            pass
+            written = RiLoggingRequestHandler.create_logs(route, requests)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            written = 0
+        RiLoggingRequestHandler.aggregate_logs(route, requests[:written])
+        if written < len(requests):
+            RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_database),), len(requests) - written)
+        # the written logs are the first ones of a partially written bulk (e.g. all but the logs of an unavailable shard), only the remaining logs are spooled
+        if written < len(requests) and RiLoggingSpool.append(route, requests[written:]) is True:
+            written = len(requests)
 
-        result = connection.insert_query(query=query, database=RiLoggingRequestHandler.configuration.get("connection").get("server").get("database").get("name"))
+        return written
 
-        if result == 1:
-            success = True
+    @staticmethod
+    # writes spooled logs (sequence number, key, log) of the same route and returns the amount of written logs, raises if the backend is unavailable
+    def replay_logs(route: RiLoggingRoute, records: list) -> int:
+        written = RiLoggingRequestHandler.storage.replay(route, records, RiLoggingSpool.identifier)
+        RiLoggingRequestHandler.aggregate_logs(route, [document for sequence, key, document in records[:written]])
 
-        return success
+        return written
 
     @staticmethod
-    def create_log_mongodb(database_map, request) -> bool:
-        connection = MongoDBConnection(
-            host=RiLoggingRequestHandler.configuration.get("connection").get("server").get("host"),
-            port=RiLoggingRequestHandler.configuration.get("connection").get("server").get("port")
-        )
+    # returns the sequence number up to which the spool was replayed into the backend
+    def get_replayed(identifier: str) -> int:
+        return RiLoggingRequestHandler.storage.get_replayed(identifier)
 
-        success = connection.insert(logging_data=request, database_name=RiLoggingRequestHandler.configuration.get("connection").get("server").get("database").get("name"), collection_name=database_map.get("collection"))
+    @staticmethod
+    # creates the schema of all mapped tables/collections, called on start and after a reload
+    def create_schemas():
+        for route in RiLoggingRoutingTable.get_routes():
+            RiLoggingRequestHandler.create_schema(route)
 
-        return success
+    @staticmethod
+    # creates the table/collection of the route together with its secondary indexes
+    def create_schema(route: RiLoggingRoute):
+        try:
+            RiLoggingRequestHandler.storage.ensure_schema(route)
+        except Exception as error:
+            # the schema is created again on the first write, only the queries are slower without the indexes
+            RiLoggingRequestHandler.log_exception(error)
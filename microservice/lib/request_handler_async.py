@@ -0,0 +1,118 @@
+# dependencies
+import asyncio
+import time
+from microservice.lib.request_handler import RiLoggingRequestHandler
+from microservice.lib.metrics import RiLoggingMetrics
+from microservice.lib.routing import RiLoggingRoute
+from microservice.lib.write_buffer import RiLoggingWriteBuffer
+from microservice.lib.spool import RiLoggingSpool
+
+
+# asyncio counterpart of RiLoggingRequestHandler for the ingestion endpoints, shares configuration, routing and formatting
+class RiLoggingAsyncRequestHandler:
+
+    @staticmethod
+    # opens the non-blocking connections of the storage backend, called once on startup of the event loop
+    async def create_connections():
+        await RiLoggingRequestHandler.storage.open_async()
+
+    @staticmethod
+    # closes the non-blocking connections, called once on shutdown of the event loop
+    async def close_connections():
+        await RiLoggingRequestHandler.storage.close_async()
+
+    @staticmethod
+    # executive function for writing the log to the database
+    async def create_log(request_json: dict) -> dict:
+        save_success = False
+        response_body = RiLoggingRequestHandler.get_response_default()
+        started = time.perf_counter()
+        route = RiLoggingRequestHandler.resolve_route(request_json) if type(request_json) is dict else None
+        routed = time.perf_counter()
+        RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, routed - started, RiLoggingMetrics.stage_create_log_route)
+
+        document, errors = (None, None) if route is None else route.converter.convert(request_json)
+
+        if route is None:
+            RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_unrouted),))
+        elif errors is not None:
+            RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_invalid),))
+            response_body.__setitem__("errors", errors)
+        else:
+            RiLoggingMetrics.count(RiLoggingMetrics.metric_events, (("target", document.get(route.target_name)), ("information", route.information_id)))
+            # while spooled logs wait for the replay the database is unavailable, new logs are spooled behind them to keep the order
+            if RiLoggingSpool.is_pending() is True and await RiLoggingAsyncRequestHandler.spool_logs(route, [document]) is True:
+                save_success = True
+            # write-behind mode, the log is written by the background flusher, a full buffer is relieved by the spool
+            elif RiLoggingWriteBuffer.is_enabled() is True:
+                if RiLoggingWriteBuffer.put(route, document) is False and await RiLoggingAsyncRequestHandler.spool_logs(route, [document]) is False:
+                    RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_unavailable),))
+                    response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_unavailable)
+                    return response_body
+                save_success = True
+            else:
+                try:
+                    save_success = await RiLoggingRequestHandler.storage.write_async(route, [document]) == 1
+                except Exception as error:
+                    RiLoggingRequestHandler.log_exception(error)
+                if save_success is True:
+                    RiLoggingRequestHandler.aggregate_logs(route, [document])
+                else:
+                    RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_database),))
+                    save_success = await RiLoggingAsyncRequestHandler.spool_logs(route, [document])
+            RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, time.perf_counter() - routed, RiLoggingMetrics.stage_create_log_write)
+
+        if save_success is False:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+
+        return response_body
+
+    @staticmethod
+    # executive function for writing a batch of logs, the logs are grouped by table/collection and every group is written at once
+    async def create_log_batch(request_body: str) -> dict:
+        response_body = RiLoggingRequestHandler.get_response_default()
+        requests = RiLoggingRequestHandler.parse_batch(request_body)
+        if type(requests) is not list or len(requests) == 0:
+            response_body.__setitem__(RiLoggingRequestHandler.response_key_message, RiLoggingRequestHandler.response_message_error)
+            return response_body
+
+        statuses, invalid, groups = RiLoggingRequestHandler.group_batch(requests)
+        for route, indexes, group_requests in groups.values():
+            if await RiLoggingAsyncRequestHandler.write_logs(route, group_requests) == len(group_requests):
+                for index in indexes:
+                    statuses[index] = RiLoggingRequestHandler.response_message_ok
+
+        return RiLoggingRequestHandler.get_response_batch(response_body, statuses, invalid)
+
+    @staticmethod
+    # writes multiple logs of the same route, the logs are spooled if the database is unavailable or spooled logs still wait for the replay
+    # returns the amount of written or spooled logs
+    async def write_logs(route: RiLoggingRoute, requests: list) -> int:
+        if RiLoggingSpool.is_pending() is True and await RiLoggingAsyncRequestHandler.spool_logs(route, requests) is True:
+            return len(requests)
+        try:
+            written = await RiLoggingAsyncRequestHandler.create_logs(route, requests)
+        except Exception as error:
+            RiLoggingRequestHandler.log_exception(error)
+            written = 0
+        RiLoggingRequestHandler.aggregate_logs(route, requests[:written])
+        if written < len(requests):
+            RiLoggingMetrics.count(RiLoggingMetrics.metric_errors, (("cause", RiLoggingMetrics.cause_database),), len(requests) - written)
+        # the written logs are the first ones of a partially written bulk (e.g. all but the logs of an unavailable shard), only the remaining logs are spooled
+        if written < len(requests) and await RiLoggingAsyncRequestHandler.spool_logs(route, requests[written:]) is True:
+            written = len(requests)
+
+        return written
+
+    @staticmethod
+    # spools the logs in a thread of the executor, so waiting for the sync to the disk doesn't block the event loop
+    async def spool_logs(route: RiLoggingRoute, requests: list) -> bool:
+        if RiLoggingSpool.is_enabled() is False:
+            return False
+
+        return await asyncio.get_running_loop().run_in_executor(None, RiLoggingSpool.append, route, requests)
+
+    @staticmethod
+    # writes multiple logs of the same route with one bulk operation and returns the amount of written logs
+    async def create_logs(route: RiLoggingRoute, requests: list) -> int:
+        return await RiLoggingRequestHandler.storage.write_async(route, requests)
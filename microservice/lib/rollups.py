@@ -0,0 +1,220 @@
+# dependencies
+import atexit
+import hashlib
+import math
+import threading
+from microservice.lib.export import RiLoggingExport
+
+
+# pre-aggregated counts of the logs per target and per minute, hour and day, configured per information with its 'rollup' property
+# the counts are accumulated in memory whenever logs are written and added to the companion tables/collections of the storage backend
+# by a background thread, so aggregate queries read the few rollup rows instead of grouping the raw logs
+# the distinct users are estimated with hyperloglog, whose registers are stored sparsely and merged by their maximum
+# so the flushes of all processes can be added without reading the stored registers first
+class RiLoggingRollups:
+    # enum values for possible granularities of the rollups
+    granularity_minute: str = "minute"
+    granularity_hour: str = "hour"
+    granularity_day: str = "day"
+    granularities: list = ["minute", "hour", "day"]
+    # length of the prefix of a timestamp ("%Y-%m-%d %H:%M:%S") which identifies the bucket of the granularity and the suffix completing it
+    buckets: dict = {
+        "minute": (16, ":00"),
+        "hour": (13, ":00:00"),
+        "day": (10, " 00:00:00")
+    }
+    # bits of the hash which select the register, 1024 registers estimate with a standard error of about 3%
+    precision: int = 10
+    # seconds between two flushes of the accumulator
+    interval: float = 1.0
+    # map of the table/collection to the granularities and the distinct field of its rollups, only informations with rollup are accumulated
+    sources: dict = {}
+    # map of the table/collection to its route and to the pending counts (granularity, bucket, target) -> logs
+    # and the pending registers (granularity, bucket, target, register) -> rank which weren't added to the rollups yet
+    pending: dict = {}
+    pending_lock: threading.Lock = threading.Lock()
+    # function which adds the counts and registers of a route to its rollups
+    writer = None
+    # background thread flushing the accumulator
+    thread: threading.Thread = None
+    # signal for the background thread to flush the accumulator and stop
+    stopping: threading.Event = None
+    # counters describing the state of the accumulator
+    counters: dict = {}
+
+    @classmethod
+    # compiles the sources of the rollups and starts the background flusher
+    def start(cls, routes: list, writer):
+        cls.stop()
+        cls.configure(routes)
+        cls.writer = writer
+        cls.counters = {
+            "accumulated": 0,
+            "flushed": 0,
+            "failed": 0
+        }
+        cls.stopping = threading.Event()
+        cls.thread = threading.Thread(target=cls.run, name="RiLoggingRollups", daemon=True)
+        cls.thread.start()
+        # the rollups are started again by a reload, the exit handler is registered only once
+        atexit.unregister(cls.stop)
+        atexit.register(cls.stop)
+
+    @classmethod
+    # compiles the granularities and the distinct field of every table/collection with rollup, called on start and whenever the configuration changes
+    def configure(cls, routes: list):
+        sources = {}
+        for route in routes:
+            rollup = route.information.get("rollup")
+            if type(rollup) is dict and rollup.get("enabled") is True and route.collection not in sources:
+                sources.__setitem__(route.collection, (rollup.get("granularities", cls.granularities), rollup.get("distinct")))
+        cls.sources = sources
+
+    @staticmethod
+    # returns the routes of the informations which are configured with rollup
+    def get_routes(routes: list) -> list:
+        return [route for route in routes if type(route.information.get("rollup")) is dict and route.information.get("rollup").get("enabled") is True]
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls.thread is not None
+
+    @classmethod
+    # returns the register and the rank (position of the first set bit) of the value in the hyperloglog sketch
+    def get_register(cls, value) -> tuple:
+        hashed = int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big")
+        remaining = hashed & ((1 << (64 - cls.precision)) - 1)
+
+        return hashed >> (64 - cls.precision), (64 - cls.precision) - remaining.bit_length() + 1
+
+    @classmethod
+    # adds the written logs of the route to the accumulator, logs of informations without rollup are ignored right away
+    def count(cls, route, documents: list):
+        source = cls.sources.get(route.collection)
+        if source is None or cls.thread is None or len(documents) == 0:
+            return
+        granularities, distinct = source
+        with cls.pending_lock:
+            pending = cls.pending.get(route.collection)
+            if pending is None:
+                pending = (route, {}, {})
+                cls.pending.__setitem__(route.collection, pending)
+            counts, registers = pending[1], pending[2]
+            for document in documents:
+                timestamp = document.get(route.timestamp_name)
+                if type(timestamp) is not str:
+                    continue
+                # the converter stores a missing distinct field as empty string, which isn't a user of its own
+                register = cls.get_register(document.get(distinct)) if distinct is not None and document.get(distinct) not in [None, ""] else None
+                for granularity in granularities:
+                    length, suffix = cls.buckets.get(granularity)
+                    key = (granularity, timestamp[:length] + suffix, document.get(route.target_name))
+                    counts.__setitem__(key, counts.get(key, 0) + 1)
+                    if register is not None and registers.get(key + (register[0],), 0) < register[1]:
+                        registers.__setitem__(key + (register[0],), register[1])
+            cls.counters.__setitem__("accumulated", cls.counters.get("accumulated") + len(documents))
+
+    @classmethod
+    # returns the counters of the accumulator together with the amount of rollup rows waiting for the flush
+    def statistics(cls) -> dict:
+        with cls.pending_lock:
+            statistics = dict(cls.counters)
+            statistics.__setitem__("pending", sum(len(pending[1]) for pending in cls.pending.values()))
+
+        return statistics
+
+    @classmethod
+    # background loop, flushes the accumulator after every interval
+    def run(cls):
+        while cls.stopping.wait(cls.interval) is False:
+            cls.flush()
+
+    @classmethod
+    # adds the accumulated counts and registers to the rollups, the ones which couldn't be added are kept for the next flush
+    def flush(cls):
+        with cls.pending_lock:
+            pending = cls.pending
+            cls.pending = {}
+        for collection, (route, counts, registers) in pending.items():
+            try:
+                cls.writer(route, [key + (logs,) for key, logs in counts.items()], [key + (rank,) for key, rank in registers.items()])
+            except Exception:
+                cls.restore(collection, route, counts, registers)
+                continue
+            with cls.pending_lock:
+                cls.counters.__setitem__("flushed", cls.counters.get("flushed") + len(counts))
+
+    @classmethod
+    # merges counts and registers which couldn't be flushed back into the accumulator
+    def restore(cls, collection: str, route, counts: dict, registers: dict):
+        with cls.pending_lock:
+            pending = cls.pending.get(collection)
+            if pending is None:
+                pending = (route, {}, {})
+                cls.pending.__setitem__(collection, pending)
+            for key, logs in counts.items():
+                pending[1].__setitem__(key, pending[1].get(key, 0) + logs)
+            for key, rank in registers.items():
+                pending[2].__setitem__(key, max(pending[2].get(key, 0), rank))
+            cls.counters.__setitem__("failed", cls.counters.get("failed") + 1)
+
+    @classmethod
+    # reads the granularity, the time range and the targets of a query of the rollups from the query parameters, returns None if one is invalid
+    def create_filters(cls, arguments: dict) -> dict:
+        filters = {
+            "granularity": arguments.get("granularity", cls.granularity_hour),
+            "time_from": None,
+            "time_to": None,
+            "targets": None
+        }
+        if filters.get("granularity") not in cls.granularities:
+            return None
+        for key, argument in [("time_from", "from"), ("time_to", "to")]:
+            if arguments.get(argument) is not None:
+                filters.__setitem__(key, RiLoggingExport.parse_timestamp(arguments.get(argument)))
+                if filters.get(key) is None:
+                    return None
+        if arguments.get("target") is not None:
+            filters.__setitem__("targets", [target for target in arguments.get("target").split(",") if len(target) > 0])
+
+        return filters
+
+    @classmethod
+    # estimates the amount of distinct values from the registers (register -> rank) of a hyperloglog sketch
+    def estimate(cls, registers: dict) -> int:
+        size = 1 << cls.precision
+        estimate = 0.7213 / (1 + 1.079 / size) * size * size / (size - len(registers) + sum(2.0 ** -rank for rank in registers.values()))
+        # small cardinalities are estimated by the amount of empty registers
+        if estimate <= 2.5 * size and len(registers) < size:
+            estimate = size * math.log(size / (size - len(registers)))
+
+        return int(round(estimate))
+
+    @classmethod
+    # combines the stored counts (bucket, target, logs) and registers (bucket, target, register, rank) of the rollups into the rows of the response
+    def create_rollups(cls, counts: list, registers: list, distinct: bool) -> list:
+        sketches = {}
+        for bucket, target, register, rank in registers:
+            sketch = sketches.setdefault((bucket, target), {})
+            if sketch.get(register, 0) < rank:
+                sketch.__setitem__(register, rank)
+        rollups = []
+        for bucket, target, logs in sorted(counts, key=lambda count: (count[0], count[1])):
+            rollup = {"bucket": bucket, "target": target, "logs": int(logs)}
+            if distinct is True:
+                rollup.__setitem__("users", cls.estimate(sketches.get((bucket, target), {})))
+            rollups.append(rollup)
+
+        return rollups
+
+    @classmethod
+    # stops the background thread and flushes the remaining accumulator
+    def stop(cls):
+        if cls.thread is None:
+            return
+
+        cls.stopping.set()
+        cls.thread.join()
+        cls.thread = None
+        cls.flush()
+        cls.sources = {}
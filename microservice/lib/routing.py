@@ -0,0 +1,107 @@
+# dependencies
+from microservice.lib.event_converter import RiLoggingEventConverter
+
+
+# resolved destination of a log, combining the information and the database map of a target
+class RiLoggingRoute:
+    # creates the route and resolves the parts of the configuration needed for writing
+    def __init__(self, information: dict, database_map: dict):
+        self.information = information
+        self.database_map = database_map
+        self.information_id = information.get("id")
+        self.collection = database_map.get("collection")
+        self.target_name = information.get("target_name")
+        self.timestamp_name = information.get("timestamp_name")
+        self.fields = information.get("fields", [])
+        self.field_names = [field.get("name") for field in self.fields]
+        self.datatypes = [field.get("datatype") if field.get("datatype") is not None else "string" for field in self.fields]
+        self.converter = RiLoggingEventConverter(information)
+
+
+# routing index, which is compiled once from the configuration and maps the target of a log directly to its route
+class RiLoggingRoutingTable:
+    # tuple of the map (target_name field, target value) -> (position of the information, route)
+    # and the distinct target_name fields, replaced as a whole so readers never see a half built index
+    index: tuple = ({}, [])
+    # map of every configured table/collection to the route of the first information stored in it
+    collections: dict = {}
+
+    @classmethod
+    # compiles the routing index from the configuration and swaps it in at once
+    def build(cls, configuration: dict):
+        cls.swap(cls.compile(configuration))
+
+    @classmethod
+    # swaps in the routing index and the collections created by compile
+    def swap(cls, compiled: tuple):
+        cls.index, cls.collections = compiled
+
+    @staticmethod
+    # compiles the routing index and the collections from the configuration without touching the active ones
+    def compile(configuration: dict) -> tuple:
+        informations = configuration.get("logging").get("frontend").get("information")
+        targets = configuration.get("logging").get("frontend").get("targets")
+        database_maps = configuration.get("connection").get("server").get("database").get("map")
+
+        targets_by_information = {}
+        for target in targets:
+            if type(target.get("name")) is str and target.get("information") is not None:
+                targets_by_information.setdefault(target.get("information"), []).append(target)
+        maps_by_information = {}
+        for database_map in database_maps:
+            maps_by_information.__setitem__(database_map.get("information"), database_map)
+
+        resolved = {}
+        target_names = []
+        collections = {}
+        for position, information in enumerate(informations):
+            database_map = maps_by_information.get(information.get("id"))
+            # information without table/collection can't be stored
+            if database_map is None:
+                continue
+            route = RiLoggingRoute(information=information, database_map=database_map)
+            collections.setdefault(route.collection, route)
+            for target in targets_by_information.get(information.get("id"), []):
+                # the last matching information wins
+                resolved.__setitem__((information.get("target_name"), target.get("name")), (position, route))
+            if information.get("target_name") not in target_names:
+                target_names.append(information.get("target_name"))
+
+        return (resolved, target_names), collections
+
+    @classmethod
+    # returns every distinct route of the index
+    def get_routes(cls) -> list:
+        routes = []
+        for position, route in cls.index[0].values():
+            if route not in routes:
+                routes.append(route)
+
+        return routes
+
+    @classmethod
+    # returns the route of a configured table/collection or None if the collection isn't configured
+    def get_collection(cls, collection: str):
+        return cls.collections.get(collection)
+
+    @classmethod
+    # returns the route of the log or None if the log doesn't belong to any configured target
+    def resolve(cls, request_json: dict):
+        routes, target_names = cls.index
+        found = None
+        if len(target_names) == 1:
+            target_value = request_json.get(target_names[0])
+            if type(target_value) is str:
+                found = routes.get((target_names[0], target_value))
+        else:
+            for target_name in target_names:
+                target_value = request_json.get(target_name)
+                if type(target_value) is str:
+                    entry = routes.get((target_name, target_value))
+                    if entry is not None and (found is None or entry[0] > found[0]):
+                        found = entry
+
+        if found is None:
+            return None
+
+        return found[1]
@@ -0,0 +1,105 @@
+# dependencies
+from flask import Flask
+from microservice.lib.request_handler import RiLoggingRequestHandler
+from microservice.lib.messages import RiLoggingError
+from microservice.lib.write_buffer import RiLoggingWriteBuffer
+from microservice.lib.spool import RiLoggingSpool
+from microservice.lib.changes import RiLoggingChanges
+from microservice.lib.rollups import RiLoggingRollups
+from microservice.lib.partitions import RiLoggingPartitions
+from microservice.lib.configuration_reload import RiLoggingConfigurationReload
+
+
+# serves the endpoints ether with the development server of flask or with multiple pre-forked worker processes
+class RiLoggingServer:
+    # enum values for the possible serving modes
+    mode_development: str = "development"
+    mode_prefork: str = "prefork"
+    mode_asgi: str = "asgi"
+    mode_async: str = "async"
+    # defaults of the optional server properties
+    workers_default: int = 1
+    threads_default: int = 1
+    keepalive_default: int = 2
+    # worker class of gunicorn for the asgi mode
+    worker_class_asgi: str = "uvicorn.workers.UvicornWorker"
+
+    @staticmethod
+    # opens everything which must not be shared between processes, is called once in every (worker) process
+    def start_worker():
+        RiLoggingRequestHandler.start_reload()
+        RiLoggingRequestHandler.create_connections()
+        RiLoggingRequestHandler.create_spool()
+        RiLoggingRequestHandler.create_changes()
+        RiLoggingRequestHandler.create_rollups()
+        RiLoggingRequestHandler.create_partitions()
+        RiLoggingRequestHandler.create_buffer()
+        RiLoggingRequestHandler.create_access_log()
+
+    @staticmethod
+    # starts serving the application in the configured mode, blocks until the server is stopped
+    def run(application: Flask, server: dict):
+        mode = server.get("mode", RiLoggingServer.mode_development)
+        if type(server.get("body_limit")) is int:
+            application.config.__setitem__("MAX_CONTENT_LENGTH", server.get("body_limit"))
+
+        if mode == RiLoggingServer.mode_development:
+            RiLoggingServer.start_worker()
+            # gunicorn handles SIGHUP itself by replacing the workers gracefully, which load the modified file on start
+            RiLoggingConfigurationReload.install_signal()
+            application.run(host=server.get("host"), port=int(server.get("port")), threaded=True)
+        else:
+            RiLoggingServer.run_gunicorn(application=application, server=server, mode=mode)
+
+    @staticmethod
+    # runs the pre-fork server, the connection pools are created after the fork in every worker
+    def run_gunicorn(application: Flask, server: dict, mode: str):
+        try:
+            from gunicorn.app.base import BaseApplication
+            if mode == RiLoggingServer.mode_asgi or mode == RiLoggingServer.mode_async:
+                from asgiref.wsgi import WsgiToAsgi
+                import uvicorn.workers
+            if mode == RiLoggingServer.mode_async:
+                from microservice.lib.endpoints_async import RiLoggingAsyncApplication
+        except ImportError:
+            exit(RiLoggingError.error_message(9))
+
+        threads = server.get("threads", RiLoggingServer.threads_default)
+        options = {
+            "bind": server.get("host") + ":" + str(server.get("port")),
+            "workers": server.get("workers", RiLoggingServer.workers_default),
+            "threads": threads,
+            "keepalive": server.get("keepalive", RiLoggingServer.keepalive_default),
+            "post_fork": lambda arbiter, worker: RiLoggingServer.start_worker(),
+            "worker_exit": lambda arbiter, worker: RiLoggingServer.stop_worker()
+        }
+        served = application
+        if mode == RiLoggingServer.mode_asgi:
+            options.__setitem__("worker_class", RiLoggingServer.worker_class_asgi)
+            served = WsgiToAsgi(application)
+        elif mode == RiLoggingServer.mode_async:
+            # the ingestion endpoints run on the event loop with non-blocking drivers, everything else is served by flask
+            options.__setitem__("worker_class", RiLoggingServer.worker_class_asgi)
+            served = RiLoggingAsyncApplication(application, body_limit=server.get("body_limit"))
+        elif threads > 1:
+            options.__setitem__("worker_class", "gthread")
+
+        # embedded gunicorn application, so the already validated configuration is reused by all workers
+        class RiLoggingApplication(BaseApplication):
+            def load_config(self):
+                for key, value in options.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return served
+
+        RiLoggingApplication().run()
+
+    @staticmethod
+    # writes everything which is still buffered before the worker process ends, the spool is synced for the next worker of its slot
+    def stop_worker():
+        RiLoggingWriteBuffer.stop()
+        RiLoggingSpool.stop()
+        RiLoggingChanges.stop()
+        RiLoggingRollups.stop()
+        RiLoggingPartitions.stop()
@@ -0,0 +1,391 @@
+# dependencies
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from bson import ObjectId
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# durable append-only spool of the logs which couldn't be written because the database is down or saturated
+# the logs are appended as newline-delimited JSON to segment files, which are synced to the disk in groups, and a replayer
+# writes them into the database in the order they were spooled once it is reachable again
+# every record carries its sequence number and a unique key, so a replay which is repeated after a crash doesn't duplicate logs
+class RiLoggingSpool:
+    # default size in bytes after which a new segment file is started
+    segment_default: int = 67108864
+    # default milliseconds between two syncs to the disk, every append waits for the sync of its records, 0 syncs every append
+    sync_default: int = 50
+    # default amount of records which are replayed at once
+    batch_default: int = 1000
+    # default seconds between two replay attempts while the database is unreachable
+    interval_default: int = 5
+    # names of the files of a slot
+    segment_prefix: str = "spool-"
+    segment_suffix: str = ".ndjson"
+    checkpoint_name: str = "checkpoint.json"
+    identifier_name: str = "spool.id"
+    lock_name: str = "slot.lock"
+    directory: str = None
+    segment: int = segment_default
+    sync: float = sync_default / 1000.0
+    batch: int = batch_default
+    interval: int = interval_default
+    # slot of this process, every process appends to its own slot, which is locked while the process is running
+    slot: str = None
+    slot_lock = None
+    # persistent identifier of the slot, which the database uses to remember up to which sequence number it was replayed
+    identifier: str = None
+    # appended segment file, its name and size
+    file = None
+    segment_name: str = None
+    segment_size: int = 0
+    # last appended and last synced sequence number
+    sequence: int = 0
+    synced: int = 0
+    # (segment name, offset, sequence number) up to which the records were replayed
+    checkpoint: tuple = (None, 0, 0)
+    # True while records are waiting for the replay, new logs are spooled as well then so the order is kept
+    pending: bool = False
+    # function which writes the records (sequence number, key, document) of one route and returns the amount of written records
+    writer = None
+    # function which returns the route of a table/collection
+    resolver = None
+    # function which returns the sequence number up to which the slot was replayed into the database
+    replayed = None
+    lock: threading.Lock = threading.Lock()
+    condition: threading.Condition = threading.Condition(lock)
+    wakeup: threading.Event = threading.Event()
+    stopping: threading.Event = threading.Event()
+    threads: list = []
+    counters: dict = {"spooled": 0, "replayed": 0, "dropped": 0, "failed": 0}
+
+    @classmethod
+    # claims a free slot of the spool directory and starts the syncer and the replayer, called once in every process
+    def start(cls, spool: dict, writer, resolver, replayed):
+        cls.directory = spool.get("directory")
+        cls.segment = spool.get("segment", RiLoggingSpool.segment_default)
+        cls.sync = spool.get("sync", RiLoggingSpool.sync_default) / 1000.0
+        cls.batch = spool.get("batch", RiLoggingSpool.batch_default)
+        cls.interval = spool.get("interval", RiLoggingSpool.interval_default)
+        cls.writer = writer
+        cls.resolver = resolver
+        cls.replayed = replayed
+        cls.claim_slot()
+        cls.recover()
+        cls.stopping.clear()
+        cls.threads = [
+            threading.Thread(target=cls.run_syncer, name="RiLoggingSpoolSyncer", daemon=True),
+            threading.Thread(target=cls.run_replayer, name="RiLoggingSpoolReplayer", daemon=True)
+        ]
+        for thread in cls.threads:
+            thread.start()
+        atexit.register(cls.stop)
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls.slot is not None
+
+    @classmethod
+    # returns True while spooled records are waiting for the replay
+    def is_pending(cls) -> bool:
+        return cls.pending
+
+    @classmethod
+    # locks the first slot which isn't used by another process, slots of ended processes are taken over with their records
+    def claim_slot(cls):
+        os.makedirs(cls.directory, exist_ok=True)
+        index = 0
+        while True:
+            slot = os.path.join(cls.directory, "slot-" + str(index))
+            os.makedirs(slot, exist_ok=True)
+            slot_lock = open(os.path.join(slot, RiLoggingSpool.lock_name), "a")
+            if fcntl is None:
+                break
+            try:
+                fcntl.flock(slot_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                slot_lock.close()
+                index += 1
+        cls.slot = slot
+        cls.slot_lock = slot_lock
+
+        identifier_path = os.path.join(slot, RiLoggingSpool.identifier_name)
+        if os.path.isfile(identifier_path) is False:
+            cls.write_atomic(identifier_path, uuid.uuid4().hex)
+        with open(identifier_path, "r") as file:
+            cls.identifier = file.read().strip()
+
+    @classmethod
+    # restores the checkpoint and the last sequence number of the slot
+    def recover(cls):
+        try:
+            with open(os.path.join(cls.slot, RiLoggingSpool.checkpoint_name), "r") as file:
+                checkpoint = json.load(file)
+            cls.checkpoint = (checkpoint.get("segment"), checkpoint.get("offset"), checkpoint.get("sequence"))
+        except (OSError, ValueError):
+            cls.checkpoint = (None, 0, 0)
+
+        cls.sequence = cls.checkpoint[2]
+        segments = cls.list_segments()
+        if len(segments) > 0:
+            # the first sequence number is part of the name, the last one is read from the last complete record
+            with open(os.path.join(cls.slot, segments[-1]), "rb") as file:
+                for line in file:
+                    record = cls.parse(line)
+                    if record is not None:
+                        cls.sequence = max(cls.sequence, record.get("q"))
+        cls.synced = cls.sequence
+        cls.pending = cls.get_backlog() > 0
+
+    @classmethod
+    def list_segments(cls) -> list:
+        return sorted(name for name in os.listdir(cls.slot) if name.startswith(RiLoggingSpool.segment_prefix) and name.endswith(RiLoggingSpool.segment_suffix))
+
+    @staticmethod
+    # parses a record of a segment, returns None for a torn record which was only partially written before a crash
+    def parse(line: bytes):
+        if line.endswith(b"\n") is False:
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+
+        return record if type(record) is dict and type(record.get("q")) is int else None
+
+    @staticmethod
+    # replaces the file at once, so it is never read half written
+    def write_atomic(path: str, content: str):
+        with open(path + ".tmp", "w") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    # appends the documents of the route and waits until they are synced to the disk, returns False if they couldn't be spooled
+    def append(cls, route, documents: list) -> bool:
+        if cls.is_enabled() is False or len(documents) == 0:
+            return False
+        try:
+            with cls.condition:
+                if cls.file is None or cls.segment_size >= cls.segment:
+                    cls.roll()
+                lines = []
+                appended = time.time()
+                for document in documents:
+                    document = dict(document)
+                    # a failed insert into mongodb may already have assigned the _id, which is kept so a replay can't duplicate the log
+                    key = document.pop("_id", None)
+                    cls.sequence += 1
+                    lines.append(json.dumps({"q": cls.sequence, "t": appended, "c": route.collection, "k": str(key if key is not None else ObjectId()), "d": document}, separators=(",", ":")))
+                data = ("\n".join(lines) + "\n").encode("utf-8")
+                cls.file.write(data)
+                cls.file.flush()
+                cls.segment_size += len(data)
+                cls.pending = True
+                target = cls.sequence
+                if cls.sync <= 0:
+                    os.fsync(cls.file.fileno())
+                    cls.synced = target
+                while cls.synced < target:
+                    cls.condition.wait(timeout=cls.sync * 4)
+        except OSError:
+            cls.count("failed", len(documents))
+            return False
+
+        cls.count("spooled", len(documents))
+        cls.wakeup.set()
+        return True
+
+    @classmethod
+    # starts a new segment, the previous one is synced and closed, must be called with the lock held
+    def roll(cls):
+        if cls.file is not None:
+            cls.file.flush()
+            os.fsync(cls.file.fileno())
+            cls.file.close()
+            cls.synced = cls.sequence
+        cls.segment_name = RiLoggingSpool.segment_prefix + "%020d" % (cls.sequence + 1) + RiLoggingSpool.segment_suffix
+        cls.file = open(os.path.join(cls.slot, cls.segment_name), "ab")
+        cls.segment_size = cls.file.tell()
+        # the new directory entry has to be durable as well
+        if hasattr(os, "O_DIRECTORY"):
+            directory = os.open(cls.slot, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    @classmethod
+    # syncs the appended records in groups, every waiting append is released after the sync of its records
+    def run_syncer(cls):
+        while cls.stopping.is_set() is False:
+            time.sleep(max(cls.sync, 0.001))
+            with cls.condition:
+                if cls.file is None or cls.synced >= cls.sequence:
+                    continue
+                try:
+                    os.fsync(cls.file.fileno())
+                except OSError:
+                    continue
+                cls.synced = cls.sequence
+                cls.condition.notify_all()
+
+    @classmethod
+    # replays the spooled records whenever records were appended, repeats after the interval while the database is unreachable
+    def run_replayer(cls):
+        while cls.stopping.is_set() is False:
+            cls.wakeup.wait(timeout=cls.interval)
+            cls.wakeup.clear()
+            if cls.pending is False:
+                continue
+            try:
+                while cls.stopping.is_set() is False and cls.replay() is True:
+                    pass
+            except Exception:
+                # the database is still unavailable, the records stay in the spool
+                cls.stopping.wait(timeout=cls.interval)
+                cls.wakeup.set()
+
+    @classmethod
+    # replays the next batch of records, returns True if more records are waiting, raises if the database is unavailable
+    def replay(cls) -> bool:
+        segments = cls.list_segments()
+        segment_name, offset, sequence = cls.checkpoint
+        if segment_name not in segments:
+            segment_name, offset = (segments[0], 0) if len(segments) > 0 else (None, 0)
+        if segment_name is None:
+            return cls.complete(segment_name, offset)
+
+        records = []
+        end = offset
+        with open(os.path.join(cls.slot, segment_name), "rb") as file:
+            file.seek(offset)
+            while len(records) < cls.batch:
+                line = file.readline()
+                if len(line) == 0 or line.endswith(b"\n") is False:
+                    break
+                end += len(line)
+                record = cls.parse(line)
+                if record is not None:
+                    records.append(record)
+
+        # records which the database already stored are skipped, they were replayed before the checkpoint was saved
+        replayed = max(cls.replayed(cls.identifier), sequence)
+        records = [record for record in records if record.get("q") > replayed]
+        start = 0
+        while start < len(records):
+            stop = start
+            while stop < len(records) and records[stop].get("c") == records[start].get("c"):
+                stop += 1
+            route = cls.resolver(records[start].get("c"))
+            if route is None:
+                # the table/collection was removed from the configuration
+                cls.count("dropped", stop - start)
+            else:
+                if cls.writer(route, [(record.get("q"), record.get("k"), record.get("d")) for record in records[start:stop]]) != stop - start:
+                    raise IOError("The spooled logs couldn't be written into " + records[start].get("c"))
+                cls.count("replayed", stop - start)
+            start = stop
+
+        if len(records) > 0:
+            sequence = records[-1].get("q")
+        cls.save_checkpoint((segment_name, end, sequence))
+        if end > offset:
+            return True
+
+        # the segment is replayed completely, it is removed unless records are still appended to it
+        if segment_name != cls.segment_name:
+            os.remove(os.path.join(cls.slot, segment_name))
+            cls.save_checkpoint((None, 0, sequence))
+            return True
+
+        return cls.complete(segment_name, end)
+
+    @classmethod
+    # ends the replay if nothing was appended in the meantime, new logs are written into the database directly again
+    def complete(cls, segment_name: str, offset: int) -> bool:
+        with cls.condition:
+            if segment_name is not None and segment_name == cls.segment_name and offset < cls.segment_size:
+                return True
+            cls.pending = False
+
+        return False
+
+    @classmethod
+    def save_checkpoint(cls, checkpoint: tuple):
+        if checkpoint == cls.checkpoint:
+            return
+        cls.write_atomic(os.path.join(cls.slot, RiLoggingSpool.checkpoint_name), json.dumps({"segment": checkpoint[0], "offset": checkpoint[1], "sequence": checkpoint[2]}))
+        cls.checkpoint = checkpoint
+
+    @classmethod
+    # returns the amount of records which are waiting for the replay
+    def get_backlog(cls) -> int:
+        return max(cls.sequence - cls.checkpoint[2], 0)
+
+    @classmethod
+    # returns the seconds since the oldest waiting record was spooled
+    def get_age(cls) -> float:
+        if cls.pending is False:
+            return 0.0
+        segments = cls.list_segments()
+        segment_name, offset, sequence = cls.checkpoint
+        if segment_name not in segments:
+            segment_name, offset = (segments[0], 0) if len(segments) > 0 else (None, 0)
+        if segment_name is None:
+            return 0.0
+        with open(os.path.join(cls.slot, segment_name), "rb") as file:
+            file.seek(offset)
+            record = cls.parse(file.readline())
+
+        return max(time.time() - record.get("t"), 0.0) if record is not None else 0.0
+
+    @classmethod
+    def count(cls, counter: str, value: int = 1):
+        with cls.lock:
+            cls.counters.__setitem__(counter, cls.counters.get(counter) + value)
+
+    @classmethod
+    # returns the counters together with the size and the age of the spool
+    def statistics(cls) -> dict:
+        statistics = dict(cls.counters)
+        if cls.is_enabled() is True:
+            segments = cls.list_segments()
+            statistics.__setitem__("segments", len(segments))
+            statistics.__setitem__("bytes", sum(os.path.getsize(os.path.join(cls.slot, name)) for name in segments))
+            statistics.__setitem__("backlog", cls.get_backlog())
+            statistics.__setitem__("age_seconds", round(cls.get_age(), 3))
+
+        return statistics
+
+    @classmethod
+    # stops the threads and syncs and closes the segment, the waiting records are replayed by the next process of the slot
+    def stop(cls):
+        if cls.is_enabled() is False:
+            return
+        cls.stopping.set()
+        cls.wakeup.set()
+        for thread in cls.threads:
+            thread.join()
+        cls.threads = []
+        with cls.condition:
+            if cls.file is not None:
+                cls.file.flush()
+                os.fsync(cls.file.fileno())
+                cls.file.close()
+                cls.file = None
+                cls.segment_name = None
+                cls.segment_size = 0
+            cls.synced = cls.sequence
+            cls.condition.notify_all()
+        cls.slot_lock.close()
+        cls.slot = None
@@ -0,0 +1,188 @@
+# dependencies
+import asyncio
+import importlib
+
+
+# interface of the storage backends, which write, query and export the logs of the tables/collections
+# one backend is created from the connection dictionary of the configuration, the type of the server selects the backend
+# further backends are plugged in with register() before the microservice is started
+# with 'shards' in the connection dictionary the logs are spread over several servers of the type by RiLoggingStorageSharded
+class RiLoggingStorage:
+    # map of the server types to the backend classes, given as class or as "module.Class" which is imported on first use
+    backends: dict = {
+        "mysql": "microservice.lib.storage_mysql.RiLoggingStorageMySQL",
+        "mongodb": "microservice.lib.storage_mongodb.RiLoggingStorageMongoDB",
+        "file": "microservice.lib.storage_file.RiLoggingStorageFile"
+    }
+    # name of the unique key of a log, which ends the keyset (timestamp, id) of the paginated queries
+    id_name: str = "id"
+
+    @classmethod
+    # registers a backend class for the server type, replaces the backend of the type if it exists already
+    def register(cls, server_type: str, backend):
+        cls.backends.__setitem__(server_type, backend)
+
+    @classmethod
+    # returns the backend class of the server type or None if the type isn't registered
+    def get_backend(cls, server_type: str):
+        backend = cls.backends.get(server_type)
+        if type(backend) is str:
+            module_name, class_name = backend.rsplit(".", 1)
+            backend = getattr(importlib.import_module(module_name), class_name)
+            cls.backends.__setitem__(server_type, backend)
+
+        return backend
+
+    @classmethod
+    # creates the backend of the configured server type, the backend is opened separately
+    def create(cls, connection: dict):
+        if connection.get("shards") is not None:
+            from microservice.lib.storage_sharded import RiLoggingStorageSharded
+            return RiLoggingStorageSharded(connection)
+
+        return cls.get_backend(connection.get("server").get("type"))(connection)
+
+    # keeps the connection dictionary of the configuration, nothing is opened yet
+    def __init__(self, connection: dict, shard: int = None):
+        self.connection = connection
+        # False if the server couldn't be reached when the backend was opened
+        self.reachable = False
+        # index of the shard if the backend is one of the servers of RiLoggingStorageSharded
+        self.shard = shard
+
+    # returns the connector of the backend, the further shards get a connector of their own with separate connections
+    # the backend of a single server and the first shard use the shared connector of the type
+    def create_connector(self, connector):
+        if self.shard is None or self.shard == 0:
+            return connector
+
+        return connector.isolate("Shard" + str(self.shard))
+
+    # replaces the settings which can change while serving without opening the backend again, like the map of the tables/collections
+    def configure(self, connection: dict):
+        self.connection = connection
+
+    def get_database_name(self) -> str:
+        return self.connection.get("server").get("database").get("name")
+
+    def is_create_collection(self) -> bool:
+        return self.connection.get("server").get("database").get("create_collection") is True
+
+    # opens the backend, a server which can't be reached must not raise, the backend connects on demand once it is
+    def open(self):
+        self.reachable = True
+
+    # returns True while the backend is open
+    def is_connected(self) -> bool:
+        return False
+
+    # creates the table/collection of the route together with its secondary indexes, if the configuration allows it
+    def ensure_schema(self, route):
+        pass
+
+    # writes multiple logs of the same route with one bulk operation and returns the amount of written logs
+    def write(self, route, documents: list) -> int:
+        raise NotImplementedError()
+
+    # writes a single log and returns whether it was written
+    def write_one(self, route, document: dict) -> bool:
+        return self.write(route, [document]) == 1
+
+    # writes a large amount of logs of the same route with the fastest bulk path of the backend and returns the amount of written logs
+    # meant for bulk loads of RiLoggingBulkLoad, which aren't spooled if they fail
+    def load(self, route, documents: list) -> int:
+        return self.write(route, documents)
+
+    # writes spooled logs (sequence number, key, log) of the same route and returns the amount of written logs, raises if the backend is unavailable
+    # a repeated replay of the same logs must not duplicate them, the key is unique per log and the sequence number grows within the spool
+    def replay(self, route, records: list, identifier: str) -> int:
+        raise NotImplementedError()
+
+    # returns the sequence number up to which the spool was replayed, 0 if the backend detects replayed logs by their key
+    def get_replayed(self, identifier: str) -> int:
+        return 0
+
+    # returns up to limit logs of the route matching the filters of RiLoggingQuery, ordered by the keyset (timestamp, id)
+    # returns None if the cursor of the filters doesn't belong to the backend
+    def find(self, route, filters: dict, limit: int) -> list:
+        raise NotImplementedError()
+
+    # returns the index of the shard the log was read from, which is part of the cursor of the next page, None if the backend isn't sharded
+    def get_shard(self, log: dict) -> int:
+        return None
+
+    # returns a generator of batches of the logs of the route matching the filters of RiLoggingExport, errors of the query are raised right away
+    def stream(self, route, filters: dict, batch: int):
+        raise NotImplementedError()
+
+    # creates the aggregate store of the change counts of RiLoggingChanges
+    def ensure_changes(self):
+        pass
+
+    # adds the counted changes (project, requirement, user, change type, changes) to the aggregate store
+    def increment_changes(self, rows: list):
+        raise NotImplementedError()
+
+    # replaces the whole aggregate store with the counted changes (project, requirement, user, change type, changes)
+    def replace_changes(self, rows: list):
+        raise NotImplementedError()
+
+    # returns the changes (id, change type, changes) summed up per project or, if the project is given, per requirement of the project
+    # only the changes of the user are summed up if the user is given
+    def get_changes(self, project: str, user: str) -> list:
+        raise NotImplementedError()
+
+    # creates the companion tables/collections of the rollups of the route of RiLoggingRollups
+    def ensure_rollups(self, route):
+        pass
+
+    # adds the accumulated counts (granularity, bucket, target, logs) to the rollups of the route
+    # and merges the registers (granularity, bucket, target, register, rank) of the distinct users by their maximum
+    def increment_rollups(self, route, counts: list, registers: list):
+        raise NotImplementedError()
+
+    # returns the counts (bucket, target, logs) and, if distinct is True, the registers (bucket, target, register, rank)
+    # of the rollups of the route of one granularity within the time range [time_from, time_to) and of the given targets
+    def get_rollups(self, route, granularity: str, time_from: str, time_to: str, targets: list, distinct: bool) -> tuple:
+        raise NotImplementedError()
+
+    # returns the time partitions (name, upper bound) of the route in their order, the upper bound of the catch-all partition is None
+    # returns an empty list if the table/collection isn't partitioned
+    def get_partitions(self, route) -> list:
+        return []
+
+    # adds the partitions (name, upper bound) of RiLoggingPartitions in front of the catch-all partition of the route
+    def add_partitions(self, route, partitions: list):
+        raise NotImplementedError()
+
+    # drops the partitions of the route together with their logs
+    def drop_partitions(self, route, names: list):
+        raise NotImplementedError()
+
+    # removes the logs of the route which are older than the timestamp and returns the amount of removed logs, None if it isn't known
+    def remove_expired(self, route, timestamp: str) -> int:
+        raise NotImplementedError()
+
+    # removes all logs of the route without removing the table/collection and returns the amount of removed logs, None if it isn't known
+    def remove(self, route) -> int:
+        raise NotImplementedError()
+
+    # returns the backends of the servers, which are maintained one by one like the partitions, the backend itself if it isn't sharded
+    def get_shards(self) -> list:
+        return [self]
+
+    # closes the backend and everything it opened
+    def close(self):
+        pass
+
+    # opens the non-blocking connections of the async mode, called once on startup of the event loop
+    async def open_async(self):
+        pass
+
+    # writes the logs in the async mode, backends without non-blocking driver write in a thread of the executor
+    async def write_async(self, route, documents: list) -> int:
+        return await asyncio.get_running_loop().run_in_executor(None, self.write, route, documents)
+
+    # closes the non-blocking connections, called once on shutdown of the event loop
+    async def close_async(self):
+        pass
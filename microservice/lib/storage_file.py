@@ -0,0 +1,397 @@
+# dependencies
+import datetime
+import fcntl
+import gzip
+import heapq
+import json
+import os
+import threading
+import time
+from bson import ObjectId
+from microservice.lib.storage import RiLoggingStorage
+from microservice.lib.export_columnar import RiLoggingColumnarExport
+
+
+# segment file which the logs of one table/collection are appended to until it is rotated
+class RiLoggingFileSegment:
+    # opens a new segment file in the directory of the table/collection
+    def __init__(self, path: str, compression: str):
+        self.path = path
+        self.file = open(path, "ab")
+        self.writer = gzip.GzipFile(fileobj=self.file, mode="ab", compresslevel=RiLoggingStorageFile.compresslevel, mtime=0) if compression == RiLoggingStorageFile.compression_gzip else self.file
+        self.opened = time.time()
+        self.size = 0
+
+    # appends the lines and flushes them, so they are readable right away and survive a crash of the process
+    def write(self, data: bytes):
+        self.writer.write(data)
+        self.writer.flush()
+        self.size += len(data)
+
+    def close(self):
+        if self.writer is not self.file:
+            self.writer.close()
+        self.file.close()
+
+
+# storage backend writing the logs into rotated segment files per table/collection, without any database server
+# the segments are compressed newline-delimited JSON, which is appended to and flushed on every write, or parquet files
+# which are written once the buffered rows of a table/collection reach the size of a segment or the segment gets too old
+# a background thread writes the buffered rows which weren't written since the rotation time, so idle tables/collections reach the disk as well
+# queries and exports scan the segments of the table/collection, meant for ingesting at disk speed and for benchmarking
+class RiLoggingStorageFile(RiLoggingStorage):
+    id_name: str = "_id"
+    # enum values for possible formats of the segments
+    format_ndjson: str = "ndjson"
+    format_parquet: str = "parquet"
+    # enum values for possible compressions per format, the first one is the default
+    compressions: dict = {
+        "ndjson": ["gzip", "none"],
+        "parquet": ["zstd", "snappy", "gzip", "none"]
+    }
+    compression_gzip: str = "gzip"
+    # gzip level of the ndjson segments, the fastest level keeps the writes at disk speed
+    compresslevel: int = 1
+    # default bytes of uncompressed ndjson after which a segment is rotated
+    segment_default: int = 67108864
+    # default rows of a parquet segment
+    rows_default: int = 65536
+    # default seconds after which a segment is rotated even if it isn't full
+    rotate_default: int = 3600
+    # maximum seconds between two checks of the background thread for buffered parquet rows older than the rotation time
+    flush_interval: int = 60
+    # format of the timestamps written by the frontend logger
+    timestamp_format: str = "%Y-%m-%d %H:%M:%S"
+    # name of the file which keeps up to which sequence number the spools were replayed
+    replayed_name: str = "spool-replayed.json"
+    # name of the file which keeps the change counts as list of (project, requirement, user, change type, changes)
+    changes_name: str = "changes.json"
+    # suffixes of the files which keep the rollups of a table/collection, the counts and the registers of the distinct users
+    rollup_suffix: str = "-rollup.json"
+    rollup_distinct_suffix: str = "-rollup-distinct.json"
+
+    def __init__(self, connection: dict, shard: int = None):
+        super().__init__(connection, shard)
+        options = connection.get("server").get("file", {})
+        self.directory = os.path.join(connection.get("server").get("directory"), self.get_database_name())
+        self.format = options.get("format", RiLoggingStorageFile.format_ndjson)
+        self.compression = options.get("compression", RiLoggingStorageFile.compressions.get(self.format)[0])
+        self.segment = options.get("segment", RiLoggingStorageFile.segment_default)
+        self.rows = options.get("rows", RiLoggingStorageFile.rows_default)
+        self.rotate = options.get("rotate", RiLoggingStorageFile.rotate_default)
+        # map of the table/collection to its open ndjson segment or to its buffered parquet rows (route, opened, rows)
+        self.segments = {}
+        self.buffers = {}
+        self.counter = 0
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stopping = None
+
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.reachable = True
+        if self.format == RiLoggingStorageFile.format_parquet and self.thread is None:
+            self.stopping = threading.Event()
+            self.thread = threading.Thread(target=self.run, name="RiLoggingStorageFile", daemon=True)
+            self.thread.start()
+
+    # background loop, writes the buffered parquet rows of the tables/collections which weren't written since the rotation time
+    def run(self):
+        while self.stopping.wait(min(self.rotate, RiLoggingStorageFile.flush_interval)) is False:
+            with self.lock:
+                for collection, (route, opened, documents) in list(self.buffers.items()):
+                    if time.time() - opened >= self.rotate:
+                        self.flush_parquet(collection)
+
+    def is_connected(self) -> bool:
+        return os.path.isdir(self.directory)
+
+    def ensure_schema(self, route):
+        if self.is_create_collection() is True:
+            os.makedirs(os.path.join(self.directory, route.collection), exist_ok=True)
+
+    # returns the path of a new segment, the name starts with the time, so the segments of all processes sort by their start
+    def create_path(self, collection: str) -> str:
+        self.counter += 1
+        name = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d-%H%M%S") + "-" + str(os.getpid()) + "-" + "%06d" % self.counter
+        extension = ".parquet" if self.format == RiLoggingStorageFile.format_parquet else ".ndjson.gz" if self.compression == RiLoggingStorageFile.compression_gzip else ".ndjson"
+        os.makedirs(os.path.join(self.directory, collection), exist_ok=True)
+
+        return os.path.join(self.directory, collection, name + extension)
+
+    # returns the segments of the table/collection in the order they were started
+    def list_segments(self, collection: str) -> list:
+        directory = os.path.join(self.directory, collection)
+        if os.path.isdir(directory) is False:
+            return []
+
+        return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(".ndjson") or name.endswith(".ndjson.gz") or name.endswith(".parquet")]
+
+    def write(self, route, documents: list) -> int:
+        if len(documents) == 0:
+            return 0
+        # every log gets a unique, time ordered id like in mongodb, which ends the keyset of the queries
+        documents = [dict(document, _id=str(document.get("_id") or ObjectId())) for document in documents]
+        with self.lock:
+            if self.format == RiLoggingStorageFile.format_parquet:
+                self.write_parquet(route, documents)
+            else:
+                self.write_ndjson(route, documents)
+
+        return len(documents)
+
+    def write_ndjson(self, route, documents: list):
+        data = "".join(json.dumps(document, separators=(",", ":")) + "\n" for document in documents).encode("utf-8")
+        segment = self.segments.get(route.collection)
+        # a segment which was removed by the retention or by another process is replaced as well
+        if segment is not None and (segment.size >= self.segment or time.time() - segment.opened >= self.rotate or os.path.exists(segment.path) is False):
+            segment.close()
+            segment = None
+        if segment is None:
+            segment = RiLoggingFileSegment(self.create_path(route.collection), self.compression)
+            self.segments.__setitem__(route.collection, segment)
+        segment.write(data)
+
+    def write_parquet(self, route, documents: list):
+        buffer = self.buffers.get(route.collection)
+        if buffer is None:
+            buffer = (route, time.time(), [])
+            self.buffers.__setitem__(route.collection, buffer)
+        buffer[2].extend(documents)
+        if len(buffer[2]) >= self.rows or time.time() - buffer[1] >= self.rotate:
+            self.flush_parquet(route.collection)
+
+    # writes the buffered rows of the table/collection as one parquet segment
+    def flush_parquet(self, collection: str):
+        import pyarrow
+        import pyarrow.parquet
+        route, opened, documents = self.buffers.pop(collection)
+        if len(documents) == 0:
+            return
+        schema = RiLoggingColumnarExport.create_schema(route).append(pyarrow.field("_id", pyarrow.string()))
+        converters = RiLoggingColumnarExport.create_converters(route) + [("_id", str)]
+        columns = [pyarrow.array([convert(document.get(name)) for document in documents], type=field.type) for (name, convert), field in zip(converters, schema)]
+        path = self.create_path(collection)
+        # written under another name first, so a query never reads a half written segment
+        pyarrow.parquet.write_table(pyarrow.Table.from_arrays(columns, schema=schema), path + ".tmp", compression=None if self.compression == "none" else self.compression)
+        os.replace(path + ".tmp", path)
+
+    # spooled logs keep their key as _id, the sequence number is saved after the logs are written
+    # so a crash in between can repeat at most the replayed batch, buffered parquet rows are written before
+    def replay(self, route, records: list, identifier: str) -> int:
+        written = self.write(route, [dict(document, _id=key) for sequence, key, document in records])
+        with self.lock:
+            if route.collection in self.buffers:
+                self.flush_parquet(route.collection)
+            replayed = self.read_replayed()
+            replayed.__setitem__(identifier, records[-1][0])
+            with open(os.path.join(self.directory, RiLoggingStorageFile.replayed_name + ".tmp"), "w") as file:
+                json.dump(replayed, file)
+            os.replace(os.path.join(self.directory, RiLoggingStorageFile.replayed_name + ".tmp"), os.path.join(self.directory, RiLoggingStorageFile.replayed_name))
+
+        return written
+
+    def read_replayed(self) -> dict:
+        try:
+            with open(os.path.join(self.directory, RiLoggingStorageFile.replayed_name), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def get_replayed(self, identifier: str) -> int:
+        with self.lock:
+            return self.read_replayed().get(identifier, 0)
+
+    # reads and rewrites the rows of the file while holding a lock on it, the workers of the server share the file
+    # the rows are given to the update as map of their key (all values but the last) to their last value
+    def update_rows(self, name: str, update):
+        with self.lock, open(os.path.join(self.directory, name + ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            rows = {tuple(row[:-1]): row[-1] for row in self.read_rows(name)}
+            update(rows)
+            with open(os.path.join(self.directory, name + ".tmp"), "w") as file:
+                json.dump([list(key) + [value] for key, value in rows.items()], file)
+            os.replace(os.path.join(self.directory, name + ".tmp"), os.path.join(self.directory, name))
+
+    def read_rows(self, name: str) -> list:
+        try:
+            with open(os.path.join(self.directory, name), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return []
+
+    def increment_changes(self, rows: list):
+        def increment(counts: dict):
+            for row in rows:
+                counts.__setitem__(tuple(row[:4]), counts.get(tuple(row[:4]), 0) + row[4])
+
+        self.update_rows(RiLoggingStorageFile.changes_name, increment)
+
+    def replace_changes(self, rows: list):
+        def replace(counts: dict):
+            counts.clear()
+            counts.update({tuple(row[:4]): row[4] for row in rows})
+
+        self.update_rows(RiLoggingStorageFile.changes_name, replace)
+
+    def get_changes(self, project: str, user: str) -> list:
+        sums = {}
+        for row_project, requirement, row_user, change_type, changes in self.read_rows(RiLoggingStorageFile.changes_name):
+            if (project is not None and row_project != project) or (user is not None and row_user != user):
+                continue
+            key = (row_project if project is None else requirement, change_type)
+            sums.__setitem__(key, sums.get(key, 0) + changes)
+
+        return [key + (changes,) for key, changes in sums.items()]
+
+    # the counts and the registers of the rollups are kept in two files next to the segments of the table/collection
+    def increment_rollups(self, route, counts: list, registers: list):
+        def increment(rows: dict):
+            for row in counts:
+                rows.__setitem__(tuple(row[:3]), rows.get(tuple(row[:3]), 0) + row[3])
+
+        def merge(rows: dict):
+            for row in registers:
+                rows.__setitem__(tuple(row[:4]), max(rows.get(tuple(row[:4]), 0), row[4]))
+
+        self.update_rows(route.collection + RiLoggingStorageFile.rollup_suffix, increment)
+        if len(registers) > 0:
+            self.update_rows(route.collection + RiLoggingStorageFile.rollup_distinct_suffix, merge)
+
+    def get_rollups(self, route, granularity: str, time_from: str, time_to: str, targets: list, distinct: bool) -> tuple:
+        def is_matching(row: list) -> bool:
+            return row[0] == granularity and (time_from is None or row[1] >= time_from) and (time_to is None or row[1] < time_to) and (targets is None or len(targets) == 0 or row[2] in targets)
+
+        counts = [tuple(row[1:]) for row in self.read_rows(route.collection + RiLoggingStorageFile.rollup_suffix) if is_matching(row) is True]
+        registers = []
+        if distinct is True:
+            registers = [tuple(row[1:]) for row in self.read_rows(route.collection + RiLoggingStorageFile.rollup_distinct_suffix) if is_matching(row) is True]
+
+        return counts, registers
+
+    # the segments are the partitions of the file backend, segments which weren't written since the timestamp are removed without reading them
+    # so the amount of removed logs isn't known
+    def remove_expired(self, route, timestamp: str) -> int:
+        cutoff = datetime.datetime.strptime(timestamp, RiLoggingStorageFile.timestamp_format).replace(tzinfo=datetime.timezone.utc).timestamp()
+        with self.lock:
+            for path in self.list_segments(route.collection):
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                except OSError:
+                    # removed by another process in the meantime
+                    pass
+
+        return None
+
+    # closes the open segment and drops the buffered rows of the table/collection before its segments are removed
+    def remove(self, route) -> int:
+        with self.lock:
+            segment = self.segments.pop(route.collection, None)
+            if segment is not None:
+                segment.close()
+            self.buffers.pop(route.collection, None)
+            for path in self.list_segments(route.collection):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        return None
+
+    # reads the logs of all segments of the table/collection, the open segment is read up to its last flushed line
+    def read(self, route):
+        for path in self.list_segments(route.collection):
+            if path.endswith(".parquet"):
+                yield from self.read_parquet(route, path)
+            else:
+                yield from self.read_ndjson(path)
+        buffer = self.buffers.get(route.collection)
+        if buffer is not None:
+            yield from list(buffer[2])
+
+    def read_ndjson(self, path: str):
+        file = gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+        try:
+            for line in file:
+                # the last line of a segment which is still written can be incomplete
+                if line.endswith(b"\n") is True:
+                    yield json.loads(line)
+        except EOFError:
+            # the gzip stream of a segment which is still written has no end yet
+            pass
+        finally:
+            file.close()
+
+    def read_parquet(self, route, path: str):
+        import pyarrow.parquet
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches():
+            for row in batch.to_pylist():
+                timestamp = row.get(route.timestamp_name)
+                if type(timestamp) is datetime.datetime:
+                    row.__setitem__(route.timestamp_name, timestamp.strftime(RiLoggingStorageFile.timestamp_format))
+                yield row
+
+    @staticmethod
+    # checks whether the log matches the time range, the targets and the field values of the filters
+    def is_matching(route, log: dict, filters: dict) -> bool:
+        timestamp = log.get(route.timestamp_name)
+        if filters.get("time_from") is not None and (timestamp is None or timestamp < filters.get("time_from")):
+            return False
+        if filters.get("time_to") is not None and (timestamp is None or timestamp >= filters.get("time_to")):
+            return False
+        if filters.get("targets") is not None and len(filters.get("targets")) > 0 and log.get(route.target_name) not in filters.get("targets"):
+            return False
+        for field_name, value in filters.get("fields", {}).items():
+            if log.get(field_name) != value:
+                return False
+
+        return True
+
+    # scans the segments and keeps only the limit first logs in the order of the keyset
+    def find(self, route, filters: dict, limit: int) -> list:
+        after = filters.get("after")
+        descending = filters.get("descending") is True
+
+        def matching():
+            for log in self.read(route):
+                if RiLoggingStorageFile.is_matching(route, log, filters) is False:
+                    continue
+                keyset = (log.get(route.timestamp_name), log.get("_id"))
+                if after is not None and (keyset <= tuple(after) if descending is False else keyset >= tuple(after)):
+                    continue
+                yield log
+
+        keyset = lambda log: (log.get(route.timestamp_name), log.get("_id"))
+        if descending is True:
+            return heapq.nlargest(limit, matching(), key=keyset)
+
+        return heapq.nsmallest(limit, matching(), key=keyset)
+
+    # streams the logs in the order of the segments
+    def stream(self, route, filters: dict, batch: int):
+        def stream_logs():
+            logs = []
+            for log in self.read(route):
+                if RiLoggingStorageFile.is_matching(route, log, filters) is True:
+                    logs.append(log)
+                    if len(logs) >= batch:
+                        yield logs
+                        logs = []
+            if len(logs) > 0:
+                yield logs
+
+        return stream_logs()
+
+    # stops the background thread, closes the open segments and writes the buffered parquet rows
+    def close(self):
+        if self.thread is not None:
+            self.stopping.set()
+            self.thread.join()
+            self.thread = None
+        with self.lock:
+            for segment in self.segments.values():
+                segment.close()
+            self.segments = {}
+            for collection in list(self.buffers.keys()):
+                self.flush_parquet(collection)
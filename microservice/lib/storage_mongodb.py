@@ -0,0 +1,207 @@
+# dependencies
+import time
+from bson import ObjectId
+from bson.errors import InvalidId
+from microservice.lib.storage import RiLoggingStorage
+from microservice.lib.metrics import RiLoggingMetrics
+from microservice.lib.mysql_query_generator import RiLoggingMySqlQueryCreator
+from microservice.connectors.MongoDB import MongoDBConnection
+
+
+# storage backend writing the logs into the collections of a mongodb database through the shared client
+class RiLoggingStorageMongoDB(RiLoggingStorage):
+    id_name: str = "_id"
+    # collection of the change counts per project, requirement, user and change type
+    changes_collection: str = "rilogging_changes"
+    changes_keys: list = ["project_id", "requirement_id", "username", "change_type"]
+
+    def __init__(self, connection: dict, shard: int = None):
+        super().__init__(connection, shard)
+        self.connector = self.create_connector(MongoDBConnection)
+        # the async connector is created when the event loop starts
+        self.connector_async = None
+
+    # creates the shared client, mongodb creates the collections itself on the first insert
+    def open(self):
+        server = self.connection.get("server")
+        pool = server.get("pool", {})
+        self.connector(
+            host=server.get("host"),
+            port=server.get("port"),
+            pool_min=pool.get("min"),
+            pool_max=pool.get("max")
+        )
+        self.reachable = self.connector.reachable
+
+    def is_connected(self) -> bool:
+        return self.connector.connection is not None
+
+    # creates the indexes of the collection, the logs are still written without them, only the queries get slower
+    def ensure_schema(self, route):
+        if self.is_create_collection() is False:
+            return
+        self.connector.create_indexes(self.get_database_name(), route.collection, RiLoggingStorageMongoDB.get_indexes(route))
+
+    @staticmethod
+    # returns the indexes of the collection matching the secondary indexes of the mysql tables
+    def get_indexes(route) -> list:
+        return [
+            (index_name, [("_id" if column == "id" else column, 1) for column in index_columns])
+            for index_name, index_columns in RiLoggingMySqlQueryCreator.get_indexes(route.target_name, route.timestamp_name)
+        ]
+
+    def write_one(self, route, document: dict) -> bool:
+        started = time.perf_counter()
+        success = self.connector.insert(logging_data=document, database_name=self.get_database_name(), collection_name=route.collection)
+        RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, time.perf_counter() - started, RiLoggingMetrics.stage_create_log_mongodb_insert)
+
+        return success is True
+
+    def write(self, route, documents: list) -> int:
+        return self.connector.insert_many(logging_data=documents, database_name=self.get_database_name(), collection_name=route.collection)
+
+    # the key of the spooled log becomes its _id, logs which were replayed before are skipped as duplicates
+    def replay(self, route, records: list, identifier: str) -> int:
+        documents = [dict(document, _id=ObjectId(key)) for sequence, key, document in records]
+
+        return self.connector.insert_many_idempotent(logging_data=documents, database_name=self.get_database_name(), collection_name=route.collection)
+
+    def find(self, route, filters: dict, limit: int) -> list:
+        return self.connector.find(self.get_database_name(), route.collection, RiLoggingStorageMongoDB.create_query(route, filters), RiLoggingStorageMongoDB.create_sort(route, filters), limit)
+
+    def stream(self, route, filters: dict, batch: int):
+        return self.connector.stream(self.get_database_name(), route.collection, RiLoggingStorageMongoDB.create_query(route, filters), batch)
+
+    @staticmethod
+    # creates the filter document of mongodb, the timestamps are stored as strings in the format of the frontend logger
+    def create_query(route, filters: dict) -> dict:
+        query = dict(filters.get("fields", {}))
+        if filters.get("time_from") is not None or filters.get("time_to") is not None:
+            query.__setitem__(route.timestamp_name, {})
+            if filters.get("time_from") is not None:
+                query.get(route.timestamp_name).__setitem__("$gte", filters.get("time_from"))
+            if filters.get("time_to") is not None:
+                query.get(route.timestamp_name).__setitem__("$lt", filters.get("time_to"))
+        if filters.get("targets") is not None and len(filters.get("targets")) > 0:
+            query.__setitem__(route.target_name, {"$in": filters.get("targets")})
+        if filters.get("after") is not None:
+            timestamp, log_id = filters.get("after")
+            try:
+                log_id = ObjectId(log_id)
+            except (InvalidId, TypeError):
+                # keeps the page empty instead of failing, the cursor wasn't created by this collection
+                log_id = None
+            comparison = "$lt" if filters.get("descending") is True else "$gt"
+            query.__setitem__("$or", [
+                {route.timestamp_name: {comparison: timestamp}},
+                {route.timestamp_name: timestamp, "_id": {comparison: log_id}}
+            ])
+
+        return query
+
+    @staticmethod
+    def create_sort(route, filters: dict) -> list:
+        direction = -1 if filters.get("descending") is True else 1
+
+        return [(route.timestamp_name, direction), ("_id", direction)]
+
+    # the unique index serves the sums per project and per requirement of a project
+    def ensure_changes(self):
+        self.connector.create_indexes(self.get_database_name(), RiLoggingStorageMongoDB.changes_collection, [("index_changes", [(key, 1) for key in RiLoggingStorageMongoDB.changes_keys])], unique=True)
+
+    def increment_changes(self, rows: list):
+        updates = [(dict(zip(RiLoggingStorageMongoDB.changes_keys, row[:4])), {"$inc": {"change_count": row[4]}}) for row in rows]
+        self.connector.upsert_many(updates=updates, database_name=self.get_database_name(), collection_name=RiLoggingStorageMongoDB.changes_collection)
+
+    # mongodb has no transaction on a standalone server, the sums can be read half replaced while the backfill is running
+    def replace_changes(self, rows: list):
+        self.connector.delete_many(query={}, database_name=self.get_database_name(), collection_name=RiLoggingStorageMongoDB.changes_collection)
+        self.increment_changes(rows)
+
+    def get_changes(self, project: str, user: str) -> list:
+        query = {}
+        if project is not None:
+            query.__setitem__("project_id", project)
+        if user is not None:
+            query.__setitem__("username", user)
+        id_name = "$project_id" if project is None else "$requirement_id"
+        pipeline = [
+            {"$match": query},
+            {"$group": {"_id": {"id": id_name, "change_type": "$change_type"}, "change_count": {"$sum": "$change_count"}}}
+        ]
+
+        return [(row.get("_id").get("id"), row.get("_id").get("change_type"), row.get("change_count")) for row in self.connector.aggregate(self.get_database_name(), RiLoggingStorageMongoDB.changes_collection, pipeline)]
+
+    @staticmethod
+    # returns the names of the companion collections of the rollups (counts, registers of the distinct users) of a collection
+    def get_rollup_collections(collection: str) -> tuple:
+        return collection + "_rollup", collection + "_rollup_distinct"
+
+    # the unique indexes serve the time range queries of one granularity
+    def ensure_rollups(self, route):
+        collection_rollup, collection_distinct = RiLoggingStorageMongoDB.get_rollup_collections(route.collection)
+        self.connector.create_indexes(self.get_database_name(), collection_rollup, [("index_rollup", [("granularity", 1), ("bucket", 1), ("target", 1)])], unique=True)
+        self.connector.create_indexes(self.get_database_name(), collection_distinct, [("index_rollup_distinct", [("granularity", 1), ("bucket", 1), ("target", 1), ("register", 1)])], unique=True)
+
+    # the counts are increased and the registers are merged by their maximum with upserts, so the flushes of all processes add up
+    def increment_rollups(self, route, counts: list, registers: list):
+        collection_rollup, collection_distinct = RiLoggingStorageMongoDB.get_rollup_collections(route.collection)
+        updates = [({"granularity": granularity, "bucket": bucket, "target": target}, {"$inc": {"logs": logs}}) for granularity, bucket, target, logs in counts]
+        self.connector.upsert_many(updates=updates, database_name=self.get_database_name(), collection_name=collection_rollup)
+        updates = [({"granularity": granularity, "bucket": bucket, "target": target, "register": register}, {"$max": {"rank": rank}}) for granularity, bucket, target, register, rank in registers]
+        self.connector.upsert_many(updates=updates, database_name=self.get_database_name(), collection_name=collection_distinct)
+
+    def get_rollups(self, route, granularity: str, time_from: str, time_to: str, targets: list, distinct: bool) -> tuple:
+        collection_rollup, collection_distinct = RiLoggingStorageMongoDB.get_rollup_collections(route.collection)
+        query = {"granularity": granularity}
+        if time_from is not None or time_to is not None:
+            query.__setitem__("bucket", {})
+            if time_from is not None:
+                query.get("bucket").__setitem__("$gte", time_from)
+            if time_to is not None:
+                query.get("bucket").__setitem__("$lt", time_to)
+        if targets is not None and len(targets) > 0:
+            query.__setitem__("target", {"$in": targets})
+        counts = [(row.get("bucket"), row.get("target"), row.get("logs")) for row in self.connector.find(self.get_database_name(), collection_rollup, query, None, 0)]
+        registers = []
+        if distinct is True:
+            registers = [(row.get("bucket"), row.get("target"), row.get("register"), row.get("rank")) for row in self.connector.find(self.get_database_name(), collection_distinct, query, None, 0)]
+
+        return counts, registers
+
+    # a ttl index requires dates, but the timestamps are stored as strings, so the expired logs are deleted with the timestamp index
+    def remove_expired(self, route, timestamp: str) -> int:
+        return self.connector.delete_many(query={route.timestamp_name: {"$lt": timestamp}}, database_name=self.get_database_name(), collection_name=route.collection)
+
+    # dropping the collection frees its storage at once instead of deleting the logs one by one, the indexes are created again
+    def remove(self, route) -> int:
+        removed = self.connector.drop(database_name=self.get_database_name(), collection_name=route.collection)
+        self.ensure_schema(route)
+
+        return removed
+
+    def close(self):
+        self.connector.close()
+
+    # the async connector is imported on demand, its driver is only required in the async mode
+    async def open_async(self):
+        from microservice.connectors.MongoDBAsync import MongoDBAsyncConnection
+        self.connector_async = self.create_connector(MongoDBAsyncConnection)
+        server = self.connection.get("server")
+        pool = server.get("pool", {})
+        await self.connector_async.create_connection(
+            host=server.get("host"),
+            port=server.get("port"),
+            pool_min=pool.get("min"),
+            pool_max=pool.get("max")
+        )
+
+    async def write_async(self, route, documents: list) -> int:
+        if len(documents) == 1:
+            return 1 if await self.connector_async.insert(logging_data=documents[0], database_name=self.get_database_name(), collection_name=route.collection) is True else 0
+
+        return await self.connector_async.insert_many(logging_data=documents, database_name=self.get_database_name(), collection_name=route.collection)
+
+    async def close_async(self):
+        if self.connector_async is not None:
+            self.connector_async.close()
@@ -0,0 +1,284 @@
+# dependencies
+import datetime
+import os
+import tempfile
+import time
+from microservice.lib.storage import RiLoggingStorage
+from microservice.lib.metrics import RiLoggingMetrics
+from microservice.lib.partitions import RiLoggingPartitions
+from microservice.lib.mysql_query_generator import RiLoggingMySqlQueryCreator
+from microservice.connectors.MySQL import MySQLConnection
+
+
+# storage backend writing the logs into the tables of a MySQL database through the shared connection pool
+class RiLoggingStorageMySQL(RiLoggingStorage):
+    id_name: str = "id"
+
+    def __init__(self, connection: dict, shard: int = None):
+        super().__init__(connection, shard)
+        self.connector = self.create_connector(MySQLConnection)
+        # the async connector is created when the event loop starts
+        self.connector_async = None
+
+    # opens the shared pool of connections and creates the mapped tables if the server is reachable
+    def open(self):
+        server = self.connection.get("server")
+        pool = server.get("pool", {})
+        self.connector(
+            username=self.connection.get("user").get("name"),
+            password=self.connection.get("user").get("password"),
+            host=server.get("host"),
+            port=server.get("port"),
+            database=server.get("database").get("name"),
+            pool_min=pool.get("min"),
+            pool_max=pool.get("max")
+        )
+        self.reachable = self.connector.reachable
+
+    def is_connected(self) -> bool:
+        return self.connector.pool is not None
+
+    # creates the table of the route if it isn't known to exist yet and the configuration allows it
+    def ensure_schema(self, route):
+        if route.collection in self.connector.known_tables:
+            return
+        try:
+            if self.is_create_collection() is True:
+                table_sql_query = RiLoggingMySqlQueryCreator.create_table(route.collection, route.target_name, route.timestamp_name, route.fields, RiLoggingStorageMySQL.get_initial_partitions(route), self.get_engine())
+                self.connector.insert_query(query=table_sql_query)
+                self.create_indexes(route)
+                self.connector.known_tables.add(route.collection)
+        except Warning:
+            self.connector.known_tables.add(route.collection)
+
+    # returns the configured storage engine of new tables
+    def get_engine(self) -> str:
+        return self.connection.get("server").get("database").get("engine", RiLoggingMySqlQueryCreator.engine_default)
+
+    @staticmethod
+    # returns the partitions of a new table of the route, None if the entry of the database map isn't configured with partition
+    def get_initial_partitions(route) -> list:
+        if route.database_map.get("partition") is None:
+            return None
+
+        return RiLoggingPartitions.create_partitions(route.database_map.get("partition"))
+
+    # adds the secondary indexes to a table which was created before the indexes were part of the generated schema
+    def create_indexes(self, route):
+        existing = set(row.get("Key_name") for row in self.connector.fetch_all(RiLoggingMySqlQueryCreator.show_indexes(route.collection)))
+        for index_name, index_columns in RiLoggingMySqlQueryCreator.get_indexes(route.target_name, route.timestamp_name):
+            if index_name not in existing:
+                self.connector.insert_query(query=RiLoggingMySqlQueryCreator.create_index(route.collection, index_name, index_columns))
+
+    # executes the write, if the table was dropped in the meantime it is created again and the write is repeated once
+    def write_table(self, route, write):
+        self.ensure_schema(route)
+        try:
+            return write()
+        except Exception as error:
+            if self.connector.is_table_missing(error) is False or self.is_create_collection() is False:
+                raise
+        self.connector.known_tables.discard(route.collection)
+        self.ensure_schema(route)
+
+        return write()
+
+    def write_one(self, route, document: dict) -> bool:
+        started = time.perf_counter()
+        statement = RiLoggingMySqlQueryCreator.get_insert_statement(route.collection, route.target_name, route.timestamp_name, route.fields)
+        parameters = RiLoggingMySqlQueryCreator.create_insert_parameters(statement, document)
+        created = time.perf_counter()
+        RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, created - started, RiLoggingMetrics.stage_create_log_mysql_query)
+        result = self.write_table(route, lambda: self.connector.execute(query=statement[0], parameters=parameters))
+        RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, time.perf_counter() - created, RiLoggingMetrics.stage_create_log_mysql_execute)
+
+        return result == 1
+
+    def write(self, route, documents: list) -> int:
+        statement = RiLoggingMySqlQueryCreator.get_insert_statement(route.collection, route.target_name, route.timestamp_name, route.fields)
+        parameters_list = [RiLoggingMySqlQueryCreator.create_insert_parameters(statement, document) for document in documents]
+        result = self.write_table(route, lambda: self.connector.execute_many(query=statement[0], parameters_list=parameters_list))
+
+        return result if type(result) is int else 0
+
+    # the logs are written into a temporary tab separated file, which the server reads with LOAD DATA LOCAL INFILE at once
+    # instead of parsing an INSERT per row, the server has to allow it with local_infile
+    def load(self, route, documents: list) -> int:
+        statement = RiLoggingMySqlQueryCreator.get_insert_statement(route.collection, route.target_name, route.timestamp_name, route.fields)
+        descriptor, path = tempfile.mkstemp(prefix=route.collection + "-", suffix=".tsv")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8", newline="") as file:
+                for document in documents:
+                    file.write(RiLoggingMySqlQueryCreator.create_file_line(RiLoggingMySqlQueryCreator.create_insert_parameters(statement, document)))
+            result = self.write_table(route, lambda: self.connector.load_file(query=RiLoggingMySqlQueryCreator.load_file(route.collection, statement[1]), path=path))
+        finally:
+            os.remove(path)
+
+        return result if type(result) is int else 0
+
+    # stores the sequence number of the spool in the same transaction as the rows
+    def replay(self, route, records: list, identifier: str) -> int:
+        statement = RiLoggingMySqlQueryCreator.get_insert_statement(route.collection, route.target_name, route.timestamp_name, route.fields)
+        parameters_list = [RiLoggingMySqlQueryCreator.create_insert_parameters(statement, document) for sequence, key, document in records]
+        result = self.write_table(route, lambda: self.connector.execute_replay(query=statement[0], parameters_list=parameters_list, sequence_query=RiLoggingMySqlQueryCreator.set_spool_sequence(), sequence_parameters=(identifier, records[-1][0])))
+
+        return len(records) if type(result) is int else 0
+
+    def get_replayed(self, identifier: str) -> int:
+        try:
+            self.connector.insert_query(query=RiLoggingMySqlQueryCreator.create_spool_table())
+        except Warning:
+            pass
+        rows = self.connector.fetch_all(RiLoggingMySqlQueryCreator.get_spool_sequence(), (identifier,))
+
+        return rows[0].get("sequence_number") if len(rows) > 0 else 0
+
+    def find(self, route, filters: dict, limit: int) -> list:
+        after = filters.get("after")
+        if after is not None and type(after[1]) is not int:
+            return None
+        query, parameters = RiLoggingMySqlQueryCreator.create_select_query(route.collection, route.target_name, route.timestamp_name, filters.get("time_from"), filters.get("time_to"), filters.get("targets"), filters.get("fields"), after, filters.get("descending"), limit)
+
+        return self.connector.fetch_all(query, parameters)
+
+    def stream(self, route, filters: dict, batch: int):
+        query, parameters = RiLoggingMySqlQueryCreator.create_select_query(route.collection, route.target_name, route.timestamp_name, filters.get("time_from"), filters.get("time_to"), filters.get("targets"))
+
+        return self.connector.stream(query, parameters, batch)
+
+    def ensure_changes(self):
+        try:
+            self.connector.insert_query(query=RiLoggingMySqlQueryCreator.create_changes_table())
+        except Warning:
+            pass
+
+    # the table is created on demand if the server wasn't reachable on start
+    def increment_changes(self, rows: list):
+        try:
+            self.connector.execute_many(query=RiLoggingMySqlQueryCreator.increment_changes(), parameters_list=rows)
+        except Exception as error:
+            if self.connector.is_table_missing(error) is False:
+                raise
+            self.ensure_changes()
+            self.connector.execute_many(query=RiLoggingMySqlQueryCreator.increment_changes(), parameters_list=rows)
+
+    # the rows are deleted and inserted in one transaction, so the sums are never read half replaced
+    def replace_changes(self, rows: list):
+        self.connector.execute_transaction([(RiLoggingMySqlQueryCreator.delete_changes(), None), (RiLoggingMySqlQueryCreator.increment_changes(), rows)])
+
+    def get_changes(self, project: str, user: str) -> list:
+        query, parameters = RiLoggingMySqlQueryCreator.select_changes(project, user)
+
+        return [(row.get("id"), row.get("change_type"), row.get("change_count")) for row in self.connector.fetch_all(query, parameters)]
+
+    def ensure_rollups(self, route):
+        for table_sql_query in RiLoggingMySqlQueryCreator.create_rollup_tables(route.collection):
+            try:
+                self.connector.insert_query(query=table_sql_query)
+            except Warning:
+                pass
+
+    # the counts and the registers are added in one transaction, so a failed flush can be repeated without counting twice
+    def increment_rollups(self, route, counts: list, registers: list):
+        queries = [(RiLoggingMySqlQueryCreator.increment_rollup(route.collection), counts), (RiLoggingMySqlQueryCreator.merge_rollup_distinct(route.collection), registers)]
+        try:
+            self.connector.execute_transaction(queries)
+        except Exception as error:
+            if self.connector.is_table_missing(error) is False:
+                raise
+            self.ensure_rollups(route)
+            self.connector.execute_transaction(queries)
+
+    def get_rollups(self, route, granularity: str, time_from: str, time_to: str, targets: list, distinct: bool) -> tuple:
+        table_rollup, table_distinct = RiLoggingMySqlQueryCreator.get_rollup_tables(route.collection)
+        query, parameters = RiLoggingMySqlQueryCreator.select_rollup(table_rollup, "bucket, target, logs", granularity, time_from, time_to, targets)
+        counts = [(RiLoggingStorageMySQL.format_bucket(row.get("bucket")), row.get("target"), row.get("logs")) for row in self.connector.fetch_all(query, parameters)]
+        registers = []
+        if distinct is True:
+            query, parameters = RiLoggingMySqlQueryCreator.select_rollup(table_distinct, "bucket, target, register_index, register_rank", granularity, time_from, time_to, targets)
+            registers = [(RiLoggingStorageMySQL.format_bucket(row.get("bucket")), row.get("target"), row.get("register_index"), row.get("register_rank")) for row in self.connector.fetch_all(query, parameters)]
+
+        return counts, registers
+
+    @staticmethod
+    # the buckets are returned in the format of the timestamps of the logs
+    def format_bucket(bucket) -> str:
+        return bucket.strftime("%Y-%m-%d %H:%M:%S") if type(bucket) is datetime.datetime else str(bucket)
+
+    # tables which were created before the partition was configured aren't partitioned, their expired rows are deleted instead
+    def get_partitions(self, route) -> list:
+        rows = self.connector.fetch_all(RiLoggingMySqlQueryCreator.select_partitions(), (route.collection,))
+
+        return [(row.get("name"), None if row.get("description") == "MAXVALUE" else row.get("description").strip("'")) for row in rows]
+
+    def add_partitions(self, route, partitions: list):
+        self.connector.insert_query(query=RiLoggingMySqlQueryCreator.add_partitions(route.collection, partitions))
+
+    def drop_partitions(self, route, names: list):
+        self.connector.insert_query(query=RiLoggingMySqlQueryCreator.drop_partitions(route.collection, names))
+
+    # the rows are deleted in chunks until no expired row is left
+    def remove_expired(self, route, timestamp: str) -> int:
+        query = RiLoggingMySqlQueryCreator.delete_expired(route.collection, route.timestamp_name, RiLoggingMySqlQueryCreator.delete_limit)
+        removed = 0
+        deleted = RiLoggingMySqlQueryCreator.delete_limit
+        while deleted == RiLoggingMySqlQueryCreator.delete_limit:
+            deleted = self.connector.execute(query=query, parameters=(timestamp,)) or 0
+            removed += deleted
+
+        return removed
+
+    # the rows are counted before the table is truncated, rows which are written in between are removed without being counted
+    def remove(self, route) -> int:
+        rows = self.connector.fetch_all(RiLoggingMySqlQueryCreator.count_rows(route.collection))
+        self.connector.insert_query(query=RiLoggingMySqlQueryCreator.truncate_table(route.collection))
+
+        return rows[0].get("count") if len(rows) > 0 else 0
+
+    def close(self):
+        self.connector.close()
+
+    # the async connector is imported on demand, its driver is only required in the async mode
+    async def open_async(self):
+        from microservice.connectors.MySQLAsync import MySQLAsyncConnection
+        self.connector_async = self.create_connector(MySQLAsyncConnection)
+        server = self.connection.get("server")
+        pool = server.get("pool", {})
+        await self.connector_async.create_pool(
+            username=self.connection.get("user").get("name"),
+            password=self.connection.get("user").get("password"),
+            host=server.get("host"),
+            port=server.get("port"),
+            database=server.get("database").get("name"),
+            pool_min=pool.get("min"),
+            pool_max=pool.get("max")
+        )
+
+    # creates the table of the route on the non-blocking connections if it isn't known to exist yet and the configuration allows it
+    async def ensure_schema_async(self, route):
+        if route.collection in self.connector_async.known_tables or self.is_create_collection() is False:
+            return
+        table_sql_query = RiLoggingMySqlQueryCreator.create_table(route.collection, route.target_name, route.timestamp_name, route.fields, RiLoggingStorageMySQL.get_initial_partitions(route), self.get_engine())
+        await self.connector_async.execute(query=table_sql_query)
+        self.connector_async.known_tables.add(route.collection)
+
+    async def write_async(self, route, documents: list) -> int:
+        statement = RiLoggingMySqlQueryCreator.get_insert_statement(route.collection, route.target_name, route.timestamp_name, route.fields)
+        parameters_list = [RiLoggingMySqlQueryCreator.create_insert_parameters(statement, document) for document in documents]
+
+        await self.ensure_schema_async(route)
+        try:
+            result = await self.connector_async.execute_many(query=statement[0], parameters_list=parameters_list)
+        except Exception as error:
+            # the table was dropped in the meantime, it is created again and the write is repeated once
+            if self.connector.is_table_missing(error) is False or self.is_create_collection() is False:
+                raise
+            self.connector_async.known_tables.discard(route.collection)
+            await self.ensure_schema_async(route)
+            result = await self.connector_async.execute_many(query=statement[0], parameters_list=parameters_list)
+
+        return result if type(result) is int else 0
+
+    async def close_async(self):
+        if self.connector_async is not None:
+            await self.connector_async.close()
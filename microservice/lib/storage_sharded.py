@@ -0,0 +1,297 @@
+# dependencies
+import asyncio
+import bisect
+import concurrent.futures
+import hashlib
+import heapq
+import itertools
+from microservice.lib.storage import RiLoggingStorage
+
+
+# log read from one of the shards, remembers the index of its shard for the cursor of the next page
+class RiLoggingShardedLog(dict):
+    def __init__(self, log: dict, shard: int):
+        super().__init__(log)
+        self.shard = shard
+
+
+# storage backend spreading the logs over several servers of the same type, configured with 'shards' in the connection dictionary
+# the configured server is the first shard, every entry of 'servers' overrides its properties (e.g. host and port) for a further shard
+# the logs are assigned to the shards by consistent hashing of the shard key, so adding a server only moves the logs of its share of the ring
+# every shard has its own backend with its own pool of connections, the writes of the shards and the queries are sent to them in parallel
+# the change counts and the rollups are aggregates of all shards, they are kept on the first shard
+class RiLoggingStorageSharded(RiLoggingStorage):
+    # default amount of points of every server on the ring, more points spread the keys more evenly
+    replicas_default: int = 64
+
+    def __init__(self, connection: dict, shard: int = None):
+        super().__init__(connection, shard)
+        shards = connection.get("shards")
+        self.key = shards.get("key")
+        self.shards = [RiLoggingStorage.get_backend(server_connection.get("server").get("type"))(server_connection, index) for index, server_connection in enumerate(RiLoggingStorageSharded.get_connections(connection))]
+        self.id_name = self.shards[0].id_name
+        self.points, self.indexes = RiLoggingStorageSharded.create_ring([RiLoggingStorageSharded.get_name(shard.connection.get("server")) for shard in self.shards], shards.get("replicas", RiLoggingStorageSharded.replicas_default))
+        # threads sending the operations of the shards in parallel, created when the backend is opened
+        self.executor = None
+
+    @staticmethod
+    # returns the connection dictionaries of the shards, the properties of every entry of 'servers' replace the ones of the configured server
+    def get_connections(connection: dict) -> list:
+        connections = []
+        for server in [{}] + connection.get("shards").get("servers"):
+            server_connection = dict(connection, server=dict(connection.get("server"), **server))
+            server_connection.pop("shards")
+            connections.append(server_connection)
+
+        return connections
+
+    @staticmethod
+    # returns the name of the server on the ring, so the logs keep their shard if the servers are reordered
+    def get_name(server: dict) -> str:
+        return "/".join(str(server.get(key)) for key in ["host", "port", "directory"] if server.get(key) is not None)
+
+    @staticmethod
+    def get_hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+    @staticmethod
+    # returns the sorted points of the ring and the index of the shard of every point
+    def create_ring(names: list, replicas: int) -> tuple:
+        points = sorted((RiLoggingStorageSharded.get_hash(name + "#" + str(replica)), index) for index, name in enumerate(names) for replica in range(replicas))
+
+        return [point for point, index in points], [index for point, index in points]
+
+    # returns the index of the shard of the log, the first point of the ring behind the hash of the shard key
+    # logs without the shard key are spread by their timestamp, the converter stores a missing key as the default of its datatype ("" or 0)
+    def get_index(self, route, document: dict) -> int:
+        value = document.get(self.key)
+        if value is None or value == "" or value == 0:
+            value = document.get(route.timestamp_name)
+        position = bisect.bisect(self.points, RiLoggingStorageSharded.get_hash(str(value)))
+
+        return self.indexes[position % len(self.points)]
+
+    # returns the logs grouped by the index of their shard, the items are given as (log, item) to group other records of the logs
+    def split(self, route, items: list) -> dict:
+        groups = {}
+        for document, item in items:
+            groups.setdefault(self.get_index(route, document), []).append(item)
+
+        return groups
+
+    # calls the functions (function, arguments) of the shards in parallel and returns their (result, error) in the same order
+    def call_shards(self, calls: list) -> list:
+        if len(calls) == 1 or self.executor is None:
+            return [RiLoggingStorageSharded.call(function, arguments) for function, arguments in calls]
+
+        return [future.result() for future in [self.executor.submit(RiLoggingStorageSharded.call, function, arguments) for function, arguments in calls]]
+
+    # calls the functions (function, arguments) of the shards in parallel and returns their results, the first error is raised after all calls returned
+    def fan_out(self, calls: list) -> list:
+        results = self.call_shards(calls)
+        for result, error in results:
+            if error is not None:
+                raise error
+
+        return [result for result, error in results]
+
+    @staticmethod
+    # returns the result of the function and the error it raised
+    def call(function, arguments: tuple) -> tuple:
+        try:
+            return function(*arguments), None
+        except Exception as error:
+            return None, error
+
+    def configure(self, connection: dict):
+        self.connection = connection
+        for shard, server_connection in zip(self.shards, RiLoggingStorageSharded.get_connections(connection)):
+            shard.configure(server_connection)
+
+    def open(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix="RiLoggingShard")
+        for shard in self.shards:
+            shard.open()
+        self.reachable = all(shard.reachable is True for shard in self.shards)
+
+    def is_connected(self) -> bool:
+        return all(shard.is_connected() is True for shard in self.shards)
+
+    def ensure_schema(self, route):
+        self.fan_out([(shard.ensure_schema, (route,)) for shard in self.shards])
+
+    def write_one(self, route, document: dict) -> bool:
+        return self.shards[self.get_index(route, document)].write_one(route, document)
+
+    def write(self, route, documents: list) -> int:
+        return self.write_shards(route, documents, lambda shard, shard_documents: shard.write(route, shard_documents))
+
+    def load(self, route, documents: list) -> int:
+        return self.write_shards(route, documents, lambda shard, shard_documents: shard.load(route, shard_documents))
+
+    # writes the logs of every shard with one bulk operation of the shard and returns the amount of written logs
+    # the written logs are moved to the front of the list, the callers take the first logs as the written ones
+    # a partially written bulk isn't raised, the callers spool only the logs behind the written ones, so the written logs aren't duplicated
+    def write_shards(self, route, documents: list, write) -> int:
+        groups = self.split(route, [(document, document) for document in documents])
+        indexes = list(groups.keys())
+        if len(indexes) == 1:
+            return write(self.shards[indexes[0]], documents)
+
+        results = self.call_shards([(write, (self.shards[index], groups.get(index))) for index in indexes])
+
+        return self.reorder(documents, [groups.get(index) for index in indexes], results)
+
+    @staticmethod
+    # moves the written logs of the shards to the front of the list and returns their amount, raises the first error if no log was written
+    def reorder(documents: list, groups: list, results: list) -> int:
+        written = []
+        failed = []
+        for group, (result, error) in zip(groups, results):
+            count = result if type(result) is int else 0
+            written.extend(group[:count])
+            failed.extend(group[count:])
+        errors = [error for result, error in results if error is not None]
+        if len(written) == 0 and len(errors) > 0:
+            raise errors[0]
+        documents[:] = written + failed
+
+        return len(written)
+
+    # every shard remembers its own sequence number of the spool, the records a shard stored already are skipped
+    def replay(self, route, records: list, identifier: str) -> int:
+        groups = self.split(route, [(record[2], record) for record in records])
+
+        return sum(self.fan_out([(self.replay_shard, (self.shards[index], route, shard_records, identifier)) for index, shard_records in groups.items()]))
+
+    @staticmethod
+    # replays the records of one shard and returns the amount of written or skipped records
+    def replay_shard(shard, route, records: list, identifier: str) -> int:
+        replayed = shard.get_replayed(identifier)
+        pending = [record for record in records if record[0] > replayed]
+        if len(pending) == 0:
+            return len(records)
+
+        return len(records) - len(pending) + shard.replay(route, pending, identifier)
+
+    # the spool is replayed from the shard which is the furthest behind
+    def get_replayed(self, identifier: str) -> int:
+        return min(self.fan_out([(shard.get_replayed, (identifier,)) for shard in self.shards]))
+
+    # reads the page of every shard and merges them by the keyset (timestamp, id, shard)
+    def find(self, route, filters: dict, limit: int) -> list:
+        pages = self.fan_out([(shard.find, (route, RiLoggingStorageSharded.get_filters(filters, index), limit)) for index, shard in enumerate(self.shards)])
+        if any(logs is None for logs in pages):
+            return None
+
+        logs = heapq.merge(*[[RiLoggingShardedLog(log, index) for log in logs] for index, logs in enumerate(pages)], key=lambda log: (log.get(route.timestamp_name), log.get(self.id_name), log.shard), reverse=filters.get("descending") is True)
+
+        return list(itertools.islice(logs, limit))
+
+    @staticmethod
+    # returns the filters of the shard, the shards behind the shard of the cursor also return the logs with the keyset of the cursor
+    # as the ids of mysql are only unique within a shard, the ids of mongodb are unique across the shards
+    def get_filters(filters: dict, index: int) -> dict:
+        after = filters.get("after")
+        shard = filters.get("after_shard")
+        if after is None or shard is None or type(after[1]) is not int:
+            return filters
+        if filters.get("descending") is True and index < shard:
+            return dict(filters, after=(after[0], after[1] + 1))
+        if filters.get("descending") is not True and index > shard:
+            return dict(filters, after=(after[0], after[1] - 1))
+
+        return filters
+
+    def get_shard(self, log: dict) -> int:
+        return log.shard if type(log) is RiLoggingShardedLog else None
+
+    # the queries of all shards are sent right away, so their errors are raised right away as well
+    def stream(self, route, filters: dict, batch: int):
+        results = self.call_shards([(shard.stream, (route, filters, batch)) for shard in self.shards])
+        for result, error in results:
+            if error is not None:
+                # the streams of the other shards hold their connections until they are closed
+                for stream, stream_error in results:
+                    if stream is not None:
+                        stream.close()
+                raise error
+
+        return RiLoggingStorageSharded.merge_streams([stream for stream, error in results])
+
+    @staticmethod
+    # returns a generator of the batches of the streams taking turns, so no stream of the shards waits for the others until it times out
+    def merge_streams(streams: list):
+        try:
+            pending = list(streams)
+            while len(pending) > 0:
+                for stream in list(pending):
+                    rows = next(stream, None)
+                    if rows is None:
+                        pending.remove(stream)
+                    elif len(rows) > 0:
+                        yield rows
+        finally:
+            for stream in streams:
+                stream.close()
+
+    def ensure_changes(self):
+        self.shards[0].ensure_changes()
+
+    def increment_changes(self, rows: list):
+        self.shards[0].increment_changes(rows)
+
+    def replace_changes(self, rows: list):
+        self.shards[0].replace_changes(rows)
+
+    def get_changes(self, project: str, user: str) -> list:
+        return self.shards[0].get_changes(project, user)
+
+    def ensure_rollups(self, route):
+        self.shards[0].ensure_rollups(route)
+
+    def increment_rollups(self, route, counts: list, registers: list):
+        self.shards[0].increment_rollups(route, counts, registers)
+
+    def get_rollups(self, route, granularity: str, time_from: str, time_to: str, targets: list, distinct: bool) -> tuple:
+        return self.shards[0].get_rollups(route, granularity, time_from, time_to, targets, distinct)
+
+    def remove_expired(self, route, timestamp: str) -> int:
+        return RiLoggingStorageSharded.sum_removed(self.fan_out([(shard.remove_expired, (route, timestamp)) for shard in self.shards]))
+
+    def remove(self, route) -> int:
+        return RiLoggingStorageSharded.sum_removed(self.fan_out([(shard.remove, (route,)) for shard in self.shards]))
+
+    @staticmethod
+    # returns the amount of removed logs of all shards, None if it isn't known for a shard
+    def sum_removed(removed: list) -> int:
+        return None if None in removed else sum(removed)
+
+    # the partitions are maintained shard by shard, the servers create and drop them on their own
+    def get_shards(self) -> list:
+        return self.shards
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    async def open_async(self):
+        for shard in self.shards:
+            await shard.open_async()
+
+    async def write_async(self, route, documents: list) -> int:
+        groups = self.split(route, [(document, document) for document in documents])
+        indexes = list(groups.keys())
+        if len(indexes) == 1:
+            return await self.shards[indexes[0]].write_async(route, documents)
+
+        results = await asyncio.gather(*[self.shards[index].write_async(route, groups.get(index)) for index in indexes], return_exceptions=True)
+
+        return RiLoggingStorageSharded.reorder(documents, [groups.get(index) for index in indexes], [(None, result) if isinstance(result, Exception) else (result, None) for result in results])
+
+    async def close_async(self):
+        for shard in self.shards:
+            await shard.close_async()
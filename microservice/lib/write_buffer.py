@@ -0,0 +1,168 @@
+# dependencies
+import atexit
+import logging
+import queue
+import threading
+import time
+from microservice.lib.metrics import RiLoggingMetrics
+
+
+# bounded in-memory queue of received logs, which are written to the database in batches by a background thread
+class RiLoggingWriteBuffer:
+    # default amount of logs which can wait in the queue
+    size_default: int = 10000
+    # default milliseconds between two flushes
+    interval_default: int = 100
+    # default maximum amount of logs which are written in one flush
+    batch_default: int = 500
+    # amount of further attempts to write the logs of a group which failed, the logs are counted as failed after them
+    retries: int = 2
+    # queue of (route, request) tuples waiting to be written
+    pending: queue.Queue = None
+    # function which writes a list of requests for one route and returns the amount of written rows
+    writer = None
+    # background thread draining the queue
+    thread: threading.Thread = None
+    # signal for the background thread to drain the queue and stop
+    stopping: threading.Event = None
+    interval: float = 0.1
+    batch: int = 500
+    # counters describing the state of the buffer
+    counters: dict = {}
+    counters_lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    # creates the queue and starts the background flusher
+    def start(cls, writer, size: int = None, interval: int = None, batch: int = None):
+        cls.stop()
+        cls.writer = writer
+        cls.pending = queue.Queue(maxsize=size if size is not None else cls.size_default)
+        cls.interval = (interval if interval is not None else cls.interval_default) / 1000.0
+        cls.batch = max(batch if batch is not None else cls.batch_default, 1)
+        cls.counters = {
+            "enqueued": 0,
+            "rejected": 0,
+            "written": 0,
+            "failed": 0,
+            "retried": 0,
+            "flushes": 0,
+            "flush_seconds_total": 0.0,
+            "flush_seconds_last": 0.0
+        }
+        cls.stopping = threading.Event()
+        cls.thread = threading.Thread(target=cls.run, name="RiLoggingWriteBuffer", daemon=True)
+        cls.thread.start()
+        # the buffer is started again by a reload, the exit handler is registered only once
+        atexit.unregister(cls.stop)
+        atexit.register(cls.stop)
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls.thread is not None
+
+    @classmethod
+    # adds the log to the queue, returns False if the queue is full and the request should be rejected
+    def put(cls, route, request: dict) -> bool:
+        try:
+            cls.pending.put_nowait((route, request))
+        except queue.Full:
+            cls.count("rejected")
+            return False
+
+        cls.count("enqueued")
+        return True
+
+    @classmethod
+    def count(cls, counter: str, value=1):
+        with cls.counters_lock:
+            cls.counters.__setitem__(counter, cls.counters.get(counter) + value)
+
+    @classmethod
+    # returns the counters together with the current depth of the queue
+    def statistics(cls) -> dict:
+        with cls.counters_lock:
+            statistics = dict(cls.counters)
+        statistics.__setitem__("depth", cls.pending.qsize() if cls.pending is not None else 0)
+        statistics.__setitem__("capacity", cls.pending.maxsize if cls.pending is not None else 0)
+
+        return statistics
+
+    @classmethod
+    # background loop, flushes after the interval elapsed or as soon as a full batch is waiting
+    def run(cls):
+        while cls.stopping.is_set() is False:
+            entries = cls.collect(deadline=time.monotonic() + cls.interval)
+            if len(entries) > 0:
+                cls.flush(entries)
+
+    @classmethod
+    # takes up to one batch of entries out of the queue, waiting at most until the deadline
+    def collect(cls, deadline: float = None) -> list:
+        entries = []
+        while len(entries) < cls.batch:
+            try:
+                if deadline is None:
+                    entries.append(cls.pending.get_nowait())
+                else:
+                    entries.append(cls.pending.get(timeout=max(deadline - time.monotonic(), 0.0)))
+            except queue.Empty:
+                break
+
+        return entries
+
+    @classmethod
+    # groups the entries by their table/collection and writes every group with one bulk operation
+    def flush(cls, entries: list):
+        groups = {}
+        for route, request in entries:
+            group = groups.get(route.collection)
+            if group is None:
+                group = (route, [])
+                groups.__setitem__(route.collection, group)
+            group[1].append(request)
+
+        started = time.perf_counter()
+        for route, requests in groups.values():
+            written = cls.write(route, requests)
+            cls.count("written", written)
+            cls.count("failed", len(requests) - written)
+        duration = time.perf_counter() - started
+        RiLoggingMetrics.observe(RiLoggingMetrics.metric_stage, duration, RiLoggingMetrics.stage_buffer_flush)
+
+        cls.count("flushes")
+        cls.count("flush_seconds_total", duration)
+        with cls.counters_lock:
+            cls.counters.__setitem__("flush_seconds_last", duration)
+
+    @classmethod
+    # writes the requests of one group, the requests which weren't written are retried after the interval, returns the amount of written requests
+    # the writer returns the written requests first, so only the remaining ones are written again
+    def write(cls, route, requests: list) -> int:
+        written = 0
+        for attempt in range(cls.retries + 1):
+            if attempt > 0:
+                cls.count("retried", len(requests) - written)
+                time.sleep(cls.interval)
+            try:
+                written += cls.writer(route, requests[written:])
+            except Exception:
+                logging.getLogger(__name__).exception("The buffered logs couldn't be written into " + route.collection)
+            if written >= len(requests):
+                break
+
+        return written
+
+    @classmethod
+    # stops the background thread and writes everything which is still waiting in the queue
+    def stop(cls):
+        if cls.thread is None:
+            return
+
+        cls.stopping.set()
+        cls.thread.join()
+        cls.thread = None
+        while True:
+            entries = cls.collect()
+            if len(entries) == 0:
+                break
+            cls.flush(entries)
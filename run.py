@@ -43,6 +43,6 @@ if __name__ == '__main__':
 
     # execute the script since everything is okey or abort
     if status_code == 0:
-        rilogging.start(configuration)
+        rilogging.start(configuration, filename=sys.argv[1])
     else:
         print(RiLoggingError.error_message(status_code=status_code))
@@ -0,0 +1,31 @@
+# dependencies
+import os
+import sys
+import pytest
+
+# the tests import the microservice from the root folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from microservice.lib.routing import RiLoggingRoute
+
+
+@pytest.fixture
+# route of the logs of the tests, stored in the table/collection 'logs'
+def route():
+    information = {
+        "id": 0,
+        "target_name": "target",
+        "timestamp_name": "timestamp",
+        "fields": [
+            {"name": "user", "datatype": "string"},
+            {"name": "n", "datatype": "integer"}
+        ]
+    }
+
+    return RiLoggingRoute(information=information, database_map={"information": 0, "collection": "logs"})
+
+
+@pytest.fixture
+# connection dictionary of the file backend in a temporary directory
+def file_connection(tmp_path) -> dict:
+    return {"server": {"type": "file", "directory": str(tmp_path / "storage"), "database": {"name": "test", "create_collection": True}}}
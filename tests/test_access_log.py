@@ -0,0 +1,37 @@
+# dependencies
+import pytest
+from microservice.lib.access_log import RiLoggingAccessLog
+
+
+@pytest.fixture
+# access log directory with one file of five lines, ingested in batches of two lines into the list of the written records
+def access_log(tmp_path):
+    lines = ['10.0.0.%d - - [01/Jan/2024:00:00:0%d +0000] "GET /path HTTP/1.1" 200 5 "-" "agent"\n' % (n, n) for n in range(5)]
+    (tmp_path / "access.log").write_text("".join(lines))
+    written = []
+    RiLoggingAccessLog.configure(access_log={"directory": str(tmp_path), "batch": 2}, writer=lambda route, records: written.extend(records) or len(records))
+    yield written
+    RiLoggingAccessLog.directory = None
+
+
+def test_ingest(access_log):
+    assert RiLoggingAccessLog.ingest() == 5
+    assert [record.get("remote_addr") for record in access_log] == ["10.0.0.%d" % n for n in range(5)]
+    assert RiLoggingAccessLog.list_files()[0].get("offset") == RiLoggingAccessLog.list_files()[0].get("size")
+    # the lines behind the checkpoint aren't ingested again
+    assert RiLoggingAccessLog.ingest() == 0
+
+
+def test_ingest_incomplete_write(access_log):
+    writer = RiLoggingAccessLog.writer
+    # the second batch is written only partially
+    RiLoggingAccessLog.writer = lambda route, records: writer(route, records) if len(access_log) == 0 else 1
+    with pytest.raises(IOError):
+        RiLoggingAccessLog.ingest()
+    # the checkpoint stays behind the first batch, so the second batch is read again
+    offset = RiLoggingAccessLog.list_files()[0].get("offset")
+    assert 0 < offset < RiLoggingAccessLog.list_files()[0].get("size")
+
+    RiLoggingAccessLog.writer = writer
+    assert RiLoggingAccessLog.ingest() == 3
+    assert [record.get("remote_addr") for record in access_log] == ["10.0.0.%d" % n for n in range(5)]
@@ -0,0 +1,8 @@
+# dependencies
+import os
+import sys
+import pytest
+
+# runs all tests of the folder, see README.md
+if __name__ == "__main__":
+    sys.exit(pytest.main([os.path.dirname(os.path.abspath(__file__))] + sys.argv[1:]))
@@ -0,0 +1,36 @@
+# dependencies
+import json
+import pytest
+from microservice.lib.bulk_load import RiLoggingBulkLoad
+from microservice.lib.routing import RiLoggingRoutingTable
+
+
+@pytest.fixture(autouse=True)
+# routes the logs of the target 'target' to the route
+def routing(monkeypatch, route):
+    monkeypatch.setattr(RiLoggingRoutingTable, "index", ({("target", "target"): (0, route)}, ["target"]))
+
+
+# returns the ndjson lines of the logs of the numbers
+def create_lines(numbers) -> list:
+    return [json.dumps({"target": "target", "timestamp": "2024-01-01 00:00:00", "user": "user", "n": n}) + "\n" for n in numbers]
+
+
+def test_load_reports_failed_chunk(caplog):
+    loaded = []
+
+    # the second chunk can't be loaded
+    def loader(route, documents: list) -> int:
+        if len(loaded) > 0:
+            raise ConnectionError("down")
+        loaded.extend(documents)
+        return len(documents)
+
+    lines = create_lines(range(3)) + ["{\n"]
+    report = RiLoggingBulkLoad.load(lines, RiLoggingBulkLoad.format_ndjson, loader, chunk=2)
+    assert [document.get("n") for document in loaded] == [0, 1]
+    assert (report.get("rows"), report.get("loaded"), report.get("unrouted"), report.get("failed")) == (4, 2, 1, 1)
+    assert report.get("collections") == {"logs": 2}
+    assert report.get("errors") == [{"collection": "logs", "errors": ["ConnectionError: down"]}]
+    # the cause is logged
+    assert "down" in caplog.text
@@ -0,0 +1,72 @@
+# dependencies
+import gzip
+import pytest
+from microservice.lib import cached_response
+from microservice.lib.cached_response import RiLoggingCachedResponse
+
+
+@pytest.fixture
+# cached response of a small javascript body
+def response() -> RiLoggingCachedResponse:
+    return RiLoggingCachedResponse(body=b"console.log('ri-logging');", mimetype="application/javascript", cache_control="public, max-age=300")
+
+
+@pytest.mark.parametrize("accept_encoding, encoding", [
+    (None, "identity"),
+    ("", "identity"),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("BR;q=0.5, gzip", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", "identity"),
+    ("*", "br"),
+    ("*;q=0", "identity"),
+    ("br;q=abc, gzip", "gzip"),
+    ("deflate", "identity")
+])
+def test_negotiate(response, accept_encoding, encoding):
+    assert response.negotiate(accept_encoding) == encoding
+
+
+def test_negotiate_without_brotli(monkeypatch):
+    monkeypatch.setattr(cached_response, "brotli", None)
+    response = RiLoggingCachedResponse(body=b"{}", mimetype="application/json", cache_control="no-cache")
+    assert response.negotiate("br") == "identity"
+    assert response.negotiate("br, gzip") == "gzip"
+
+
+def test_is_not_modified(response):
+    etags = response.etags
+    # every coding has its own strong ETag
+    assert len(set(etags.values())) == len(response.bodies)
+    assert response.is_not_modified(etags.get("gzip")) is True
+    assert response.is_not_modified("\"other\", " + etags.get("identity")) is True
+    assert response.is_not_modified("W/" + etags.get("br")) is True
+    assert response.is_not_modified("*") is True
+    assert response.is_not_modified("\"other\"") is False
+    assert response.is_not_modified(etags.get("gzip").strip("\"")) is False
+    assert response.is_not_modified(None) is False
+
+
+def test_get(response):
+    status, body, headers = response.get(None, "gzip")
+    assert status == RiLoggingCachedResponse.status_ok
+    assert gzip.decompress(body) == response.bodies.get("identity")
+    assert headers == {"ETag": response.etags.get("gzip"), "Cache-Control": "public, max-age=300", "Vary": "Accept-Encoding", "Content-Encoding": "gzip"}
+
+    status, body, headers = response.get(None, None)
+    assert (status, body) == (RiLoggingCachedResponse.status_ok, response.bodies.get("identity"))
+    assert "Content-Encoding" not in headers
+
+
+def test_get_not_modified(response):
+    etag = response.get(None, "gzip")[2].get("ETag")
+    # the cached copy is valid, the response has no body but the ETag of the negotiated coding
+    status, body, headers = response.get(etag, "gzip")
+    assert (status, body) == (RiLoggingCachedResponse.status_not_modified, b"")
+    assert headers.get("ETag") == etag
+    assert "Content-Encoding" not in headers
+
+    # a body which changed gets new ETags
+    changed = RiLoggingCachedResponse(body=b"console.log('changed');", mimetype="application/javascript", cache_control="public, max-age=300")
+    assert changed.get(etag, "gzip")[0] == RiLoggingCachedResponse.status_ok
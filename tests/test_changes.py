@@ -0,0 +1,48 @@
+# dependencies
+import pytest
+from microservice.lib.changes import RiLoggingChanges
+
+
+@pytest.fixture
+# starts the change counts of the route with the user as project and the n as requirement, the flushed counters are collected
+def changes(route):
+    flushed = []
+    RiLoggingChanges.start({"information": [route.information_id], "project": "user", "requirement": "n", "interval": 60000}, [route], flushed.extend)
+    yield flushed
+    RiLoggingChanges.stop()
+
+
+# returns a change of the title for the project and requirement
+def create_log(project, requirement) -> dict:
+    return {"target": "title", "timestamp": "2024-01-01 00:00:00", "user": project, "n": requirement}
+
+
+def test_get_key_missing_values(changes):
+    fields = ("user", "n", None, "target")
+    assert RiLoggingChanges.get_key(fields, create_log("project", 1)) == ("project", "1", "", "title")
+    # the converter stores the missing project as empty string
+    assert RiLoggingChanges.get_key(fields, create_log("", 1)) is None
+    assert RiLoggingChanges.get_key(fields, create_log("project", "")) is None
+    assert RiLoggingChanges.get_key(fields, create_log(None, 1)) is None
+    assert RiLoggingChanges.get_key(fields, dict(create_log("project", 1), target="other")) is None
+
+
+def test_backfill_pauses_counting(changes, route):
+    RiLoggingChanges.count(route, [create_log("project", 1)])
+    replaced = []
+
+    # a log is written while the backfill streams the stored logs, which contain it already
+    def stream(route, filters: dict, batch: int):
+        RiLoggingChanges.count(route, [create_log("project", 2)])
+        yield [create_log("project", 1), create_log("project", 2)]
+
+    rows = RiLoggingChanges.backfill([route], stream, replaced.extend)
+    assert sorted(rows) == [("project", "1", "", "title", 1), ("project", "2", "", "title", 1)]
+    assert replaced == rows
+    # neither the counters before the backfill nor the ones of the logs written meanwhile are flushed on top of the store
+    RiLoggingChanges.flush()
+    assert changes == []
+
+    RiLoggingChanges.count(route, [create_log("project", 3)])
+    RiLoggingChanges.flush()
+    assert changes == [("project", "3", "", "title", 1)]
@@ -0,0 +1,36 @@
+# dependencies
+import logging
+import os
+import pytest
+from microservice.lib.configuration_reload import RiLoggingConfigurationReload
+
+
+@pytest.fixture
+# configuration file which is watched, the configurations swapped in are collected instead of applied
+def configuration_file(tmp_path):
+    path = tmp_path / "configuration.json"
+    path.write_text("{}")
+    applied = []
+    RiLoggingConfigurationReload.configure(filename=str(path), apply=lambda configuration: applied.append(configuration) or [])
+    yield path
+    RiLoggingConfigurationReload.filename = None
+
+
+def test_check_reports_errors(configuration_file, caplog):
+    configuration_file.write_text("{")
+    os.utime(str(configuration_file), ns=(0, 0))
+    with caplog.at_level(logging.WARNING):
+        RiLoggingConfigurationReload.report(RiLoggingConfigurationReload.check())
+    assert [record.levelno for record in caplog.records] == [logging.ERROR]
+    assert caplog.records[0].getMessage().startswith("Error 4 : ")
+
+    # the file wasn't modified again, so nothing is reloaded and reported
+    caplog.clear()
+    RiLoggingConfigurationReload.report(RiLoggingConfigurationReload.check())
+    assert caplog.records == []
+
+
+def test_report_warnings(caplog):
+    with caplog.at_level(logging.WARNING):
+        RiLoggingConfigurationReload.report({"reloaded": True, "errors": [], "warnings": ["Warning 31 : restart"]})
+    assert [(record.levelno, record.getMessage()) for record in caplog.records] == [(logging.WARNING, "Warning 31 : restart")]
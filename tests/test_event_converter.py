@@ -0,0 +1,84 @@
+# dependencies
+import pytest
+from microservice.lib.event_converter import RiLoggingEventConverter
+
+
+@pytest.fixture
+# converter of an information with a field of every datatype
+def converter():
+    information = {
+        "target_name": "target",
+        "timestamp_name": "timestamp",
+        "fields": [
+            {"name": "text", "datatype": "string"},
+            {"name": "count", "datatype": "integer"},
+            {"name": "share", "datatype": "float"}
+        ]
+    }
+
+    return RiLoggingEventConverter(information)
+
+
+# converts the log with the target and the timestamp and returns the errors by field or the document
+def convert(converter, **fields):
+    document, errors = converter.convert(dict({"target": "target", "timestamp": "2024-01-01 10:00:00"}, **fields))
+    if errors is not None:
+        return {error.get("field"): error.get("error") for error in errors}
+
+    return document
+
+
+def test_missing_fields(converter):
+    # missing fields are stored as the default of their datatype
+    assert convert(converter) == {"target": "target", "timestamp": "2024-01-01 10:00:00", "text": "", "count": 0, "share": 0.0}
+    assert convert(converter, count="", share="") == convert(converter)
+    # the target and the timestamp are required
+    assert convert(converter, timestamp=None) == {"timestamp": RiLoggingEventConverter.error_missing}
+    assert convert(converter, target=None) == {"target": RiLoggingEventConverter.error_datatype}
+
+
+def test_integer_range(converter):
+    assert convert(converter, count=RiLoggingEventConverter.integer_max).get("count") == 2147483647
+    assert convert(converter, count=str(RiLoggingEventConverter.integer_min)).get("count") == -2147483648
+    assert convert(converter, count=RiLoggingEventConverter.integer_max + 1) == {"count": RiLoggingEventConverter.error_range}
+    assert convert(converter, count=RiLoggingEventConverter.integer_min - 1) == {"count": RiLoggingEventConverter.error_range}
+    # floats are only accepted without fraction
+    assert convert(converter, count=3.0).get("count") == 3
+    assert convert(converter, count=3.5) == {"count": RiLoggingEventConverter.error_datatype}
+    assert convert(converter, count="three") == {"count": RiLoggingEventConverter.error_datatype}
+
+
+def test_float_precision(converter):
+    # the values are rounded to the decimals of the column
+    assert convert(converter, share=0.123456).get("share") == 0.1235
+    assert convert(converter, share="2.5").get("share") == 2.5
+    assert convert(converter, share=7).get("share") == 7.0
+    assert convert(converter, share=1e8) == {"share": RiLoggingEventConverter.error_range}
+    assert convert(converter, share=float("nan")) == {"share": RiLoggingEventConverter.error_range}
+    assert convert(converter, share=float("inf")) == {"share": RiLoggingEventConverter.error_range}
+
+
+def test_string_truncation(converter):
+    assert convert(converter, text="x" * 300).get("text") == "x" * 255
+    assert convert(converter, target="t" * 300).get("target") == "t" * 255
+    assert convert(converter, text=12).get("text") == "12"
+    assert convert(converter, text={"nested": True}) == {"text": RiLoggingEventConverter.error_datatype}
+
+
+def test_bool_rejected(converter):
+    assert convert(converter, count=True) == {"count": RiLoggingEventConverter.error_datatype}
+    assert convert(converter, share=False) == {"share": RiLoggingEventConverter.error_datatype}
+    assert convert(converter, text=True) == {"text": RiLoggingEventConverter.error_datatype}
+
+
+def test_convert_timestamp():
+    # the format of the frontend logger is kept
+    assert RiLoggingEventConverter.convert_timestamp("2024-01-01 10:00:00") == ("2024-01-01 10:00:00", None)
+    # ISO 8601 timestamps are normalized into UTC
+    assert RiLoggingEventConverter.convert_timestamp("2024-01-01T10:00:00Z") == ("2024-01-01 10:00:00", None)
+    assert RiLoggingEventConverter.convert_timestamp("2024-01-01T10:00:00+02:00") == ("2024-01-01 08:00:00", None)
+    assert RiLoggingEventConverter.convert_timestamp("2024-01-01T01:00:00-01:30") == ("2024-01-01 02:30:00", None)
+    assert RiLoggingEventConverter.convert_timestamp("2024-01-01T10:00:00.750") == ("2024-01-01 10:00:00", None)
+    assert RiLoggingEventConverter.convert_timestamp("2024-01-01") == ("2024-01-01 00:00:00", None)
+    assert RiLoggingEventConverter.convert_timestamp("yesterday") == (None, RiLoggingEventConverter.error_format)
+    assert RiLoggingEventConverter.convert_timestamp(1704103200) == (None, RiLoggingEventConverter.error_datatype)
@@ -0,0 +1,30 @@
+# dependencies
+from microservice.lib.export import RiLoggingExport
+
+
+def test_parse_timestamp_date():
+    assert RiLoggingExport.parse_timestamp("2024-01-01") == "2024-01-01 00:00:00"
+
+
+def test_parse_timestamp_stored_format():
+    assert RiLoggingExport.parse_timestamp("2024-01-01 10:00:00") == "2024-01-01 10:00:00"
+
+
+def test_parse_timestamp_utc():
+    assert RiLoggingExport.parse_timestamp("2024-01-01T10:00:00Z") == "2024-01-01 10:00:00"
+
+
+def test_parse_timestamp_offset():
+    # stored in UTC like the timestamp of a log with the same offset
+    assert RiLoggingExport.parse_timestamp("2024-01-01T10:00:00+02:00") == "2024-01-01 08:00:00"
+    assert RiLoggingExport.parse_timestamp("2024-01-01T01:00:00+02:00") == "2023-12-31 23:00:00"
+
+
+def test_parse_timestamp_invalid():
+    assert RiLoggingExport.parse_timestamp("yesterday") is None
+
+
+def test_create_filters_offset():
+    filters = RiLoggingExport.create_filters({"from": "2024-01-01T10:00:00-01:00", "to": "2024-01-02"})
+    assert filters.get("time_from") == "2024-01-01 11:00:00"
+    assert filters.get("time_to") == "2024-01-02 00:00:00"
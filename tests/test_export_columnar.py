@@ -0,0 +1,55 @@
+# dependencies
+import io
+import tarfile
+import pyarrow.ipc
+import pyarrow.parquet
+import pytest
+from microservice.lib.export_columnar import RiLoggingColumnarExport
+
+
+# returns a stream of the batches of the logs like the storage backends
+def create_stream(logs: list, batch: int):
+    for index in range(0, len(logs), batch):
+        yield logs[index:index + batch]
+
+
+# returns the logs of the numbers, spread over two days, the timestamp of the last one can't be read
+def create_logs(numbers: int) -> list:
+    logs = [{"target": "target", "timestamp": "2024-01-0%d 10:00:00" % (1 + n % 2), "user": "user", "n": n} for n in range(numbers)]
+    logs[-1].__setitem__("timestamp", "invalid")
+
+    return logs
+
+
+@pytest.mark.parametrize("export_format", [RiLoggingColumnarExport.format_parquet, RiLoggingColumnarExport.format_arrow])
+def test_encode(route, export_format):
+    data = b"".join(RiLoggingColumnarExport.encode(create_stream(create_logs(11), 3), route, export_format, "zstd", 2))
+
+    numbers = {}
+    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+        for member in archive.getmembers():
+            file = archive.extractfile(member)
+            table = pyarrow.parquet.read_table(file) if export_format == RiLoggingColumnarExport.format_parquet else pyarrow.ipc.open_file(io.BytesIO(file.read())).read_all()
+            day = member.name.split("/")[1]
+            numbers.setdefault(day, []).extend(table.column("n").to_pylist())
+            assert table.num_rows <= 2
+    assert sorted(numbers.keys()) == ["day=2024-01-01", "day=2024-01-02", "day=" + RiLoggingColumnarExport.partition_default]
+    assert numbers.get("day=2024-01-01") == [0, 2, 4, 6, 8]
+    assert numbers.get("day=2024-01-02") == [1, 3, 5, 7, 9]
+    assert numbers.get("day=" + RiLoggingColumnarExport.partition_default) == [10]
+    assert len(data) % tarfile.RECORDSIZE == 0
+
+
+def test_encode_streams_written_files(route):
+    read = []
+
+    def stream():
+        for logs in create_stream(create_logs(10), 2):
+            read.append(len(logs))
+            yield logs
+
+    chunks = RiLoggingColumnarExport.encode(stream(), route, RiLoggingColumnarExport.format_parquet, "none", 2)
+    # the first file is streamed before all logs are read
+    next(chunks)
+    assert sum(read) < 10
+    chunks.close()
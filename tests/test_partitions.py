@@ -0,0 +1,60 @@
+# dependencies
+import datetime
+import pytest
+from microservice.lib.partitions import RiLoggingPartitions
+
+
+@pytest.fixture(autouse=True)
+# creates two partitions ahead of the current interval
+def ahead(monkeypatch):
+    monkeypatch.setattr(RiLoggingPartitions, "ahead", 2)
+
+
+def test_get_next_december():
+    assert RiLoggingPartitions.get_next("month", datetime.datetime(2024, 11, 1)) == datetime.datetime(2024, 12, 1)
+    assert RiLoggingPartitions.get_next("month", datetime.datetime(2024, 12, 1)) == datetime.datetime(2025, 1, 1)
+    assert RiLoggingPartitions.get_next("day", datetime.datetime(2024, 12, 31)) == datetime.datetime(2025, 1, 1)
+    assert RiLoggingPartitions.get_next("day", datetime.datetime(2024, 2, 28)) == datetime.datetime(2024, 2, 29)
+
+
+def test_create_partitions_month():
+    partitions = RiLoggingPartitions.create_partitions("month", datetime.datetime(2024, 11, 15, 12, 30))
+    assert partitions == [
+        ("p202411", "2024-12-01 00:00:00"),
+        ("p202412", "2025-01-01 00:00:00"),
+        ("p202501", "2025-02-01 00:00:00")
+    ]
+
+
+def test_create_partitions_day():
+    partitions = RiLoggingPartitions.create_partitions("day", datetime.datetime(2024, 12, 30, 23, 59, 59))
+    assert partitions == [
+        ("p20241230", "2024-12-31 00:00:00"),
+        ("p20241231", "2025-01-01 00:00:00"),
+        ("p20250101", "2025-01-02 00:00:00")
+    ]
+
+
+def test_get_upcoming():
+    existing = [("p202411", "2024-12-01 00:00:00"), ("p202412", "2025-01-01 00:00:00"), ("pmax", None)]
+    # the partitions behind the last existing bound up to the ones ahead of the moment
+    assert RiLoggingPartitions.get_upcoming("month", existing, datetime.datetime(2024, 12, 1)) == [
+        ("p202501", "2025-02-01 00:00:00"),
+        ("p202502", "2025-03-01 00:00:00")
+    ]
+    assert RiLoggingPartitions.get_upcoming("month", existing, datetime.datetime(2024, 10, 31)) == []
+
+
+def test_get_upcoming_without_bounds():
+    moment = datetime.datetime(2024, 12, 31)
+    assert RiLoggingPartitions.get_upcoming("day", [("pmax", None)], moment) == RiLoggingPartitions.create_partitions("day", moment)
+
+
+def test_get_expired_on_bound():
+    existing = [("p20241230", "2024-12-31 00:00:00"), ("p20241231", "2025-01-01 00:00:00"), ("p20250101", "2025-01-02 00:00:00"), ("pmax", None)]
+    cutoff = RiLoggingPartitions.get_cutoff(7, datetime.datetime(2025, 1, 8))
+    assert cutoff == "2025-01-01 00:00:00"
+    # the partition whose upper bound is the cutoff holds only expired logs, the catch-all is never dropped
+    assert RiLoggingPartitions.get_expired(existing, cutoff) == ["p20241230", "p20241231"]
+    assert RiLoggingPartitions.get_expired(existing, "2024-12-31 23:59:59") == ["p20241230"]
+    assert RiLoggingPartitions.get_expired(existing, "2024-12-30 23:59:59") == []
@@ -0,0 +1,72 @@
+# dependencies
+import base64
+import json
+import pytest
+from microservice.lib.query import RiLoggingQuery
+
+
+# encodes the json value like a cursor, for cursors which the query never returns
+def encode(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("keyset", [
+    ("2024-01-01 00:00:00", 5, None),
+    ("2024-01-01 00:00:00", "65a0f0000000000000000000", None),
+    ("2024-01-01 00:00:00", 5, 0),
+    ("2024-01-01 00:00:00", 5, 2)
+])
+def test_cursor_round_trip(keyset):
+    cursor = RiLoggingQuery.encode_cursor(*keyset)
+    # the cursor is url safe without padding
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert RiLoggingQuery.decode_cursor(cursor) == keyset
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    encode({"timestamp": "2024-01-01 00:00:00"}),
+    encode(["2024-01-01 00:00:00"]),
+    encode(["2024-01-01 00:00:00", 5, 1, 1]),
+    encode([5, 5]),
+    encode(["2024-01-01 00:00:00", 5.5]),
+    encode(["2024-01-01 00:00:00", 5, -1]),
+    encode(["2024-01-01 00:00:00", 5, "1"])
+])
+def test_decode_invalid_cursor(cursor):
+    assert RiLoggingQuery.decode_cursor(cursor) is None
+
+
+def test_create_filters(route):
+    cursor = RiLoggingQuery.encode_cursor("2024-01-01 00:00:00", 5, 1)
+    arguments = {"from": "2024-01-01", "to": "2024-01-02T02:00:00+02:00", "target": "a,,b", "limit": "10", "after": cursor, "order": "desc", "n": "3", "other": "x"}
+    filters = RiLoggingQuery.create_filters(route, arguments, {"n": "n", "other": "other"})
+    assert filters == {
+        "time_from": "2024-01-01 00:00:00",
+        "time_to": "2024-01-02 00:00:00",
+        "targets": ["a", "b"],
+        # fields which aren't configured aren't filtered
+        "fields": {"n": 3},
+        "after": ("2024-01-01 00:00:00", 5),
+        "after_shard": 1,
+        "descending": True,
+        "limit": 10
+    }
+
+
+def test_create_filters_defaults(route):
+    filters = RiLoggingQuery.create_filters(route, {}, {"n": "n"})
+    assert (filters.get("limit"), filters.get("descending"), filters.get("after"), filters.get("fields")) == (RiLoggingQuery.limit_default, False, None, {})
+
+
+@pytest.mark.parametrize("arguments", [
+    {"order": "random"},
+    {"from": "yesterday"},
+    {"limit": "0"},
+    {"limit": str(RiLoggingQuery.limit_max + 1)},
+    {"limit": "ten"},
+    {"after": "not a cursor"},
+    {"n": "three"}
+])
+def test_create_filters_invalid(route, arguments):
+    assert RiLoggingQuery.create_filters(route, arguments, {"n": "n"}) is None
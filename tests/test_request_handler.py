@@ -0,0 +1,54 @@
+# dependencies
+import pytest
+from microservice.lib.request_handler import RiLoggingRequestHandler
+from microservice.lib.spool import RiLoggingSpool
+
+
+@pytest.fixture
+# replaces the configuration of the request handler by one with the backend dictionary
+def backend(monkeypatch):
+    def configure(backend: dict):
+        monkeypatch.setattr(RiLoggingRequestHandler, "configuration", {"logging": {"backend": backend}})
+
+    return configure
+
+
+def test_is_authorized_without_token(backend):
+    backend({})
+    assert RiLoggingRequestHandler.is_authorized(None) is True
+    # the endpoints which remove logs or replace the configuration are refused without a configured token
+    assert RiLoggingRequestHandler.is_authorized(None, required=True) is False
+    assert RiLoggingRequestHandler.is_authorized("Bearer anything", required=True) is False
+
+
+def test_is_authorized_with_token(backend):
+    backend({"token": "secret"})
+    assert RiLoggingRequestHandler.is_authorized(None) is False
+    assert RiLoggingRequestHandler.is_authorized("Bearer wrong", required=True) is False
+    assert RiLoggingRequestHandler.is_authorized("Bearer secret") is True
+    assert RiLoggingRequestHandler.is_authorized("Bearer secret", required=True) is True
+
+
+def test_write_logs_spools_unwritten_logs(monkeypatch, route):
+    # the backend writes the first two logs, e.g. the logs of the shards which are available
+    monkeypatch.setattr(RiLoggingRequestHandler, "create_logs", lambda route, requests: 2)
+    spooled = []
+    monkeypatch.setattr(RiLoggingSpool, "pending", False)
+    monkeypatch.setattr(RiLoggingSpool, "append", lambda route, documents: spooled.extend(documents) is None)
+    logs = [{"n": n} for n in range(5)]
+    assert RiLoggingRequestHandler.write_logs(route, logs) == 5
+    assert spooled == logs[2:]
+
+
+def test_write_logs_spools_failed_logs(monkeypatch, route):
+    def fail(route, requests):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(RiLoggingRequestHandler, "create_logs", fail)
+    monkeypatch.setattr(RiLoggingRequestHandler, "log_exception", lambda error: None)
+    spooled = []
+    monkeypatch.setattr(RiLoggingSpool, "pending", False)
+    monkeypatch.setattr(RiLoggingSpool, "append", lambda route, documents: spooled.extend(documents) is None)
+    logs = [{"n": n} for n in range(3)]
+    assert RiLoggingRequestHandler.write_logs(route, logs) == 3
+    assert spooled == logs
@@ -0,0 +1,25 @@
+# dependencies
+import pytest
+from microservice.lib.rollups import RiLoggingRollups
+
+
+@pytest.fixture
+# starts the hourly rollups of the route with the user as distinct field, the flushed counts and registers are collected
+def rollups(route):
+    route.information.__setitem__("rollup", {"enabled": True, "granularities": ["hour"], "distinct": "user"})
+    flushed = []
+    RiLoggingRollups.start([route], lambda route, counts, registers: flushed.append((sorted(counts), sorted(registers))))
+    yield flushed
+    RiLoggingRollups.stop()
+
+
+def test_count_skips_empty_distinct(rollups, route):
+    logs = [{"target": "target", "timestamp": "2024-01-01 10:%02d:00" % n, "user": user, "n": n} for n, user in enumerate(["user-1", "", "user-1", None])]
+    RiLoggingRollups.count(route, logs)
+    RiLoggingRollups.flush()
+
+    counts, registers = rollups[0]
+    assert counts == [("hour", "2024-01-01 10:00:00", "target", 4)]
+    # the logs without user are counted, but only the user is added to the sketch
+    assert registers == [("hour", "2024-01-01 10:00:00", "target") + RiLoggingRollups.get_register("user-1")]
+    assert RiLoggingRollups.estimate({register: rank for granularity, bucket, target, register, rank in registers}) == 1
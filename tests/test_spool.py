@@ -0,0 +1,174 @@
+# dependencies
+import os
+import pytest
+from microservice.lib.spool import RiLoggingSpool
+from microservice.lib.storage_file import RiLoggingStorageFile
+
+
+@pytest.fixture
+# file backend which the spool is replayed into
+def storage(file_connection):
+    storage = RiLoggingStorageFile(file_connection)
+    storage.open()
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+# claims a slot of the spool in a temporary directory without starting the syncer and the replayer, so the tests replay step by step
+# every append is synced right away, the writer of the spool can be replaced by the tests
+def spool(tmp_path, route, storage):
+    def claim(segment: int = RiLoggingSpool.segment_default, batch: int = RiLoggingSpool.batch_default):
+        RiLoggingSpool.directory = str(tmp_path / "spool")
+        RiLoggingSpool.segment = segment
+        RiLoggingSpool.sync = 0
+        RiLoggingSpool.batch = batch
+        RiLoggingSpool.writer = create_writer(storage)
+        RiLoggingSpool.resolver = lambda collection: route if collection == route.collection else None
+        RiLoggingSpool.replayed = storage.get_replayed
+        RiLoggingSpool.claim_slot()
+        RiLoggingSpool.recover()
+
+        return RiLoggingSpool
+
+    yield claim
+    RiLoggingSpool.stop()
+    RiLoggingSpool.stopping.clear()
+    RiLoggingSpool.wakeup.clear()
+
+
+# returns the writer of the spool into the backend
+def create_writer(storage):
+    return lambda route, records: storage.replay(route, records, RiLoggingSpool.identifier)
+
+
+# returns the logs of the numbers
+def create_logs(numbers) -> list:
+    return [{"target": "target", "timestamp": "2024-01-01 00:00:00", "user": "user", "n": n} for n in numbers]
+
+
+# replays until no records are waiting anymore
+def drain(spool):
+    while spool.replay() is True:
+        pass
+
+
+def test_replay_after_failed_write(spool, route, storage):
+    spool = spool(batch=2)
+    for numbers in [range(0, 3), range(3, 5), range(5, 6)]:
+        assert spool.append(route, create_logs(numbers)) is True
+    assert spool.is_pending() is True
+
+    def fail(route, records: list) -> int:
+        raise ConnectionError("down")
+
+    spool.writer = fail
+    with pytest.raises(ConnectionError):
+        spool.replay()
+    assert spool.checkpoint[2] == 0
+    assert spool.get_backlog() == 6
+    assert spool.is_pending() is True
+
+    spool.writer = create_writer(storage)
+    drain(spool)
+    assert [log.get("n") for log in storage.read(route)] == list(range(6))
+    assert spool.is_pending() is False
+    assert spool.get_backlog() == 0
+
+
+def test_replay_incomplete_write(spool, route, storage):
+    spool = spool()
+    spool.append(route, create_logs(range(3)))
+    spool.writer = lambda route, records: storage.replay(route, records[:1], spool.identifier)
+    # the records which were written are skipped by the next replay
+    with pytest.raises(IOError):
+        spool.replay()
+    assert spool.checkpoint[2] == 0
+
+    spool.writer = create_writer(storage)
+    drain(spool)
+    assert [log.get("n") for log in storage.read(route)] == [0, 1, 2]
+
+
+def test_replay_skips_replayed_records(spool, route, storage):
+    spool = spool(batch=2)
+    spool.append(route, create_logs(range(5)))
+    spool.replay()
+    assert storage.get_replayed(spool.identifier) == 2
+
+    # the checkpoint is lost, as if the process crashed after the write but before the checkpoint was saved
+    spool.stop()
+    os.remove(os.path.join(str(spool.directory), "slot-0", RiLoggingSpool.checkpoint_name))
+    spool.claim_slot()
+    spool.recover()
+    assert spool.checkpoint == (None, 0, 0)
+
+    sequences = []
+
+    def write(route, records: list) -> int:
+        sequences.extend(sequence for sequence, key, document in records)
+        return storage.replay(route, records, spool.identifier)
+
+    spool.writer = write
+    drain(spool)
+    assert sequences == [3, 4, 5]
+    logs = list(storage.read(route))
+    assert [log.get("n") for log in logs] == [0, 1, 2, 3, 4]
+    assert len(set(log.get("_id") for log in logs)) == 5
+
+
+def test_restart_recovers_checkpoint_and_sequence(spool, route):
+    spool = spool(batch=2)
+    spool.append(route, create_logs(range(5)))
+    spool.replay()
+    identifier = spool.identifier
+    checkpoint = spool.checkpoint
+    assert checkpoint[2] == 2
+
+    spool.stop()
+    spool.claim_slot()
+    spool.recover()
+    assert spool.identifier == identifier
+    assert spool.checkpoint == checkpoint
+    assert spool.sequence == 5
+    assert spool.get_backlog() == 3
+    assert spool.is_pending() is True
+
+    # the sequence numbers continue after the restart
+    spool.append(route, create_logs([5]))
+    assert spool.sequence == 6
+    drain(spool)
+    assert spool.is_pending() is False
+
+
+def test_pending_until_last_segment_drained(spool, route, storage):
+    # every append starts a new segment
+    spool = spool(segment=1)
+    for n in range(3):
+        spool.append(route, create_logs([n]))
+    assert len(spool.list_segments()) == 3
+
+    steps = []
+    while spool.replay() is True:
+        steps.append(len(spool.list_segments()))
+        assert spool.is_pending() is True
+    # the replayed segments are removed, the segment which is still appended to is kept
+    assert steps[-1] == 1
+    assert spool.list_segments() == [spool.segment_name]
+    assert spool.is_pending() is False
+    assert [log.get("n") for log in storage.read(route)] == [0, 1, 2]
+
+
+def test_pending_while_appended_during_replay(spool, route, storage):
+    spool = spool()
+    spool.append(route, create_logs([0]))
+    assert spool.replay() is True
+    offset = spool.checkpoint[1]
+
+    # the log is appended after the replay reached the end of the segment, before it completed
+    spool.append(route, create_logs([1]))
+    assert spool.complete(spool.segment_name, offset) is True
+    assert spool.is_pending() is True
+    drain(spool)
+    assert spool.is_pending() is False
+    assert [log.get("n") for log in storage.read(route)] == [0, 1]
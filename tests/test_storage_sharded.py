@@ -0,0 +1,152 @@
+# dependencies
+import pytest
+from microservice.lib.query import RiLoggingQuery
+from microservice.lib.storage import RiLoggingStorage
+from microservice.lib.storage_sharded import RiLoggingStorageSharded
+
+
+# in-memory backend numbering the logs of every shard from 1 like the auto increment ids of mysql, so the ids repeat across the shards
+class RiLoggingStorageStub(RiLoggingStorage):
+    id_name: str = "id"
+
+    def open(self):
+        self.logs = []
+        self.failing = False
+        self.reachable = True
+
+    def write(self, route, documents: list) -> int:
+        if self.failing is True:
+            raise ConnectionError("down")
+        for document in documents:
+            self.logs.append(dict(document, id=len(self.logs) + 1))
+
+        return len(documents)
+
+    def find(self, route, filters: dict, limit: int) -> list:
+        keyset = lambda log: (log.get(route.timestamp_name), log.get("id"))
+        descending = filters.get("descending") is True
+        logs = sorted(self.logs, key=keyset, reverse=descending)
+        if filters.get("after") is not None:
+            after = tuple(filters.get("after"))
+            logs = [log for log in logs if (keyset(log) < after if descending is True else keyset(log) > after)]
+
+        return logs[:limit]
+
+
+@pytest.fixture
+# sharded backend of three in-memory servers
+def stub_storage():
+    RiLoggingStorage.register("stub", RiLoggingStorageStub)
+    connection = {
+        "server": {"type": "stub", "host": "shard-0", "database": {"name": "test"}},
+        "shards": {"key": "user", "servers": [{"host": "shard-1"}, {"host": "shard-2"}]}
+    }
+    storage = RiLoggingStorage.create(connection)
+    storage.open()
+    yield storage
+    storage.close()
+    RiLoggingStorage.backends.pop("stub")
+
+
+@pytest.fixture
+# sharded backend of two file backends in separate directories
+def file_storage(tmp_path, file_connection):
+    connection = dict(file_connection, shards={"key": "user", "servers": [{"directory": str(tmp_path / "storage-1")}]})
+    storage = RiLoggingStorage.create(connection)
+    storage.open()
+    yield storage
+    storage.close()
+
+
+# returns the logs of the users, which all have one of the timestamps
+def create_logs(users: int, timestamps: int) -> list:
+    return [{"target": "target", "timestamp": "2024-01-01 00:00:%02d" % (n % timestamps), "user": "user-" + str(n), "n": n} for n in range(users)]
+
+
+# pages through all logs by the cursors of the pages and returns the numbers of the logs in the order of the pages
+def read_pages(storage, route, limit: int, order: str) -> list:
+    numbers = []
+    arguments = {"limit": str(limit), "order": order}
+    while True:
+        logs, cursor = RiLoggingQuery.find(storage, route, RiLoggingQuery.create_filters(route, arguments, {}))
+        numbers.extend(log.get("n") for log in logs)
+        if cursor is None:
+            return numbers
+        # the cursor of a sharded backend ends with the shard of the last log
+        assert RiLoggingQuery.decode_cursor(cursor)[2] is not None
+        arguments.__setitem__("after", cursor)
+
+
+@pytest.mark.parametrize("order", [RiLoggingQuery.order_ascending, RiLoggingQuery.order_descending])
+@pytest.mark.parametrize("limit", [1, 2, 5, 7])
+def test_paging_repeated_ids(stub_storage, route, order, limit):
+    stub_storage.write(route, create_logs(40, 1))
+    # every shard got some of the logs, so their ids repeat across the shards
+    assert all(len(shard.logs) > 0 for shard in stub_storage.shards)
+
+    # the logs are merged by their keyset (timestamp, id, shard)
+    keysets = sorted(((log.get("timestamp"), log.get("id"), index), log.get("n")) for index, shard in enumerate(stub_storage.shards) for log in shard.logs)
+    expected = [n for keyset, n in (reversed(keysets) if order == RiLoggingQuery.order_descending else keysets)]
+    assert read_pages(stub_storage, route, limit, order) == expected
+
+
+@pytest.mark.parametrize("order", [RiLoggingQuery.order_ascending, RiLoggingQuery.order_descending])
+def test_paging_equal_timestamps(file_storage, route, order):
+    file_storage.write(route, create_logs(30, 3))
+    assert all(len(list(shard.read(route))) > 0 for shard in file_storage.shards)
+
+    keysets = sorted(((log.get("timestamp"), log.get("_id")), log.get("n")) for shard in file_storage.shards for log in shard.read(route))
+    expected = [n for keyset, n in (reversed(keysets) if order == RiLoggingQuery.order_descending else keysets)]
+    assert read_pages(file_storage, route, 4, order) == expected
+
+
+def test_get_filters():
+    ascending = {"after": ("2024-01-01 00:00:00", 5), "after_shard": 1, "descending": False}
+    # the shards behind the shard of the cursor return the logs with the id of the cursor as well
+    assert RiLoggingStorageSharded.get_filters(ascending, 0).get("after") == ("2024-01-01 00:00:00", 5)
+    assert RiLoggingStorageSharded.get_filters(ascending, 1).get("after") == ("2024-01-01 00:00:00", 5)
+    assert RiLoggingStorageSharded.get_filters(ascending, 2).get("after") == ("2024-01-01 00:00:00", 4)
+    descending = dict(ascending, descending=True)
+    assert RiLoggingStorageSharded.get_filters(descending, 0).get("after") == ("2024-01-01 00:00:00", 6)
+    assert RiLoggingStorageSharded.get_filters(descending, 1).get("after") == ("2024-01-01 00:00:00", 5)
+    assert RiLoggingStorageSharded.get_filters(descending, 2).get("after") == ("2024-01-01 00:00:00", 5)
+    # the ids of mongodb and of the file backend are unique across the shards
+    unique = dict(ascending, after=("2024-01-01 00:00:00", "65a0f0000000000000000000"))
+    assert RiLoggingStorageSharded.get_filters(unique, 2) is unique
+
+
+def test_logs_without_key(stub_storage, route):
+    # the converter stores the missing key as empty string, the logs are spread by their timestamp
+    logs = [{"target": "target", "timestamp": "2024-01-01 00:%02d:%02d" % (n // 60, n % 60), "user": "", "n": n} for n in range(300)]
+    stub_storage.write(route, logs)
+    assert all(len(shard.logs) > 0 for shard in stub_storage.shards)
+
+
+def test_write_partial_failure(stub_storage, route):
+    stub_storage.shards[1].failing = True
+    documents = create_logs(30, 1)
+    written = stub_storage.write(route, documents)
+
+    # the written logs are moved to the front, the logs of the failing shard to the end
+    indexes = [stub_storage.get_index(route, document) for document in documents]
+    assert written == indexes.count(0) + indexes.count(2)
+    assert 0 < written < 30
+    assert all(index != 1 for index in indexes[:written])
+    assert all(index == 1 for index in indexes[written:])
+    assert sorted(document.get("n") for document in documents) == list(range(30))
+
+    # a bulk which no shard wrote is raised
+    with pytest.raises(ConnectionError):
+        stub_storage.write(route, documents[written:])
+
+
+def test_reorder():
+    documents = ["a0", "b0", "a1", "c0", "b1", "a2"]
+    groups = [["a0", "a1", "a2"], ["b0", "b1"], ["c0"]]
+    # the first shard wrote only the first log of its bulk
+    written = RiLoggingStorageSharded.reorder(documents, groups, [(1, None), (None, ConnectionError("down")), (1, None)])
+    assert written == 2
+    assert documents == ["a0", "c0", "a1", "a2", "b0", "b1"]
+
+    with pytest.raises(ConnectionError):
+        RiLoggingStorageSharded.reorder(documents, groups, [(0, None), (None, ConnectionError("down")), (None, ConnectionError("down"))])
@@ -0,0 +1,54 @@
+# dependencies
+import pytest
+from microservice.lib.write_buffer import RiLoggingWriteBuffer
+
+
+@pytest.fixture
+# starts the buffer with a writer which fails the first attempts and writes only the given amount of requests of the other attempts
+def buffer():
+    written = []
+
+    def start(failures: int, limit: int = None):
+        attempts = []
+
+        def write(route, requests: list) -> int:
+            attempts.append(len(requests))
+            if len(attempts) <= failures:
+                raise ConnectionError("down")
+            written.extend(requests[:limit])
+            return len(requests[:limit])
+
+        RiLoggingWriteBuffer.start(writer=write, interval=50)
+        return attempts
+
+    yield start, written
+    RiLoggingWriteBuffer.stop()
+
+
+def test_flush_retries_failed_group(buffer, route, caplog):
+    start, written = buffer
+    attempts = start(failures=1)
+    for n in range(3):
+        RiLoggingWriteBuffer.put(route, {"n": n})
+    RiLoggingWriteBuffer.stop()
+
+    assert attempts == [3, 3]
+    assert [request.get("n") for request in written] == [0, 1, 2]
+    # the failed attempt is logged
+    assert "down" in caplog.text
+    statistics = RiLoggingWriteBuffer.statistics()
+    assert (statistics.get("written"), statistics.get("failed"), statistics.get("retried")) == (3, 0, 3)
+
+
+def test_flush_retries_bounded(buffer, route):
+    start, written = buffer
+    # every attempt writes only one of the remaining requests
+    attempts = start(failures=0, limit=1)
+    for n in range(5):
+        RiLoggingWriteBuffer.put(route, {"n": n})
+    RiLoggingWriteBuffer.stop()
+
+    assert attempts == [5, 4, 3]
+    assert [request.get("n") for request in written] == [0, 1, 2]
+    statistics = RiLoggingWriteBuffer.statistics()
+    assert (statistics.get("written"), statistics.get("failed"), statistics.get("retried")) == (3, 2, 7)